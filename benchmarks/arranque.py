@@ -0,0 +1,102 @@
+"""
+Tiempo de arranque hasta la ventana de login.
+
+Importa gui/Login.py en un proceso nuevo con -X importtime, muestra los
+módulos que más tardan y falla si el login arrastra módulos que solo hacen
+falta después de iniciar sesión (main.py, temas, calendario, PyQt5 o el
+conector de MySQL). Con --ventana además crea la ventana de login y mide el
+tiempo hasta que se dibuja (en CI necesita un display, p. ej. xvfb-run).
+
+Sale con código 1 si se supera --max-ms o aparece un módulo prohibido, para
+poder usarlo como paso de CI.
+
+Uso:
+    python benchmarks/arranque.py
+    xvfb-run python benchmarks/arranque.py --ventana --max-ms 400
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Módulos que el login no debe importar
+DIFERIDOS = ('main', 'ttkthemes', 'tkcalendar', 'PyQt5', 'mysql.connector',
+             'database.connection', 'models.event', 'models.participante')
+
+VENTANA = """
+import time
+inicio = time.perf_counter()
+import sys
+sys.path.insert(0, {raiz!r})
+from gui.Login import EventoLogin
+app = EventoLogin()
+app.update()
+print(f"{{(time.perf_counter() - inicio) * 1000:.1f}}")
+app.destroy()
+"""
+
+
+def tiempos_importacion():
+    """[(modulo, propio_us, acumulado_us)] de importar gui.Login"""
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import gui.Login'],
+        cwd=RAIZ, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+
+    tiempos = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, modulo = linea[len('import time:'):].split('|')
+        tiempos.append((modulo.strip(), int(propio), int(acumulado)))
+    return tiempos
+
+
+def tiempo_ventana():
+    """Milisegundos desde el inicio del intérprete hasta dibujar el login"""
+    proceso = subprocess.run([sys.executable, '-c', VENTANA.format(raiz=RAIZ)],
+                             cwd=RAIZ, capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+    return float(proceso.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque hasta la ventana de login")
+    parser.add_argument('--top', type=int, default=10, help="módulos más lentos a mostrar")
+    parser.add_argument('--ventana', action='store_true', help="medir también hasta dibujar la ventana")
+    parser.add_argument('--max-ms', type=float, help="falla si el arranque supera este tiempo")
+    args = parser.parse_args()
+
+    tiempos = tiempos_importacion()
+    total_ms = next(acumulado for modulo, _, acumulado in tiempos if modulo == 'gui.Login') / 1000
+    print(f"Importar gui.Login: {total_ms:.1f} ms ({len(tiempos)} módulos)")
+    for modulo, propio, acumulado in sorted(tiempos, key=lambda t: t[1], reverse=True)[:args.top]:
+        print(f"  {propio / 1000:8.1f} ms propio {acumulado / 1000:8.1f} ms acumulado  {modulo}")
+
+    fallas = []
+    cargados = {modulo for modulo, _, _ in tiempos}
+    prohibidos = sorted(m for m in cargados if m.split('.')[0] in DIFERIDOS or m in DIFERIDOS)
+    if prohibidos:
+        fallas.append(f"el login importa módulos diferidos: {', '.join(prohibidos)}")
+
+    medido = total_ms
+    if args.ventana:
+        try:
+            medido = tiempo_ventana()
+            print(f"Hasta dibujar el login: {medido:.1f} ms")
+        except RuntimeError as e:
+            fallas.append(f"no se pudo abrir la ventana: {e}")
+    if args.max_ms is not None and medido > args.max_ms:
+        fallas.append(f"{medido:.1f} ms supera el máximo de {args.max_ms:.0f} ms")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == "__main__":
+    main()
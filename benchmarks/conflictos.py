@@ -0,0 +1,87 @@
+"""
+Velocidad de la detección de cruces de horario.
+
+Compara, sobre eventos sintéticos de una misma agenda, la verificación
+ingenua (recorrer todos los eventos por cada consulta) con IndiceIntervalos,
+y la auditoría por pares contra el barrido de solapamientos(). Verifica que
+ambos métodos encuentren exactamente los mismos cruces.
+
+Uso:
+    python benchmarks/conflictos.py --eventos 20000 --consultas 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.indice_intervalos import IndiceIntervalos, solapamientos
+
+
+def generar(cantidad, semilla=1):
+    """Eventos (id, inicio, fin) de 30 minutos a 8 horas repartidos en un año"""
+    azar = random.Random(semilla)
+    base = datetime(2025, 1, 1)
+    eventos = []
+    for id_evento in range(1, cantidad + 1):
+        inicio = base + timedelta(minutes=30 * azar.randrange(365 * 48))
+        eventos.append((id_evento, inicio, inicio + timedelta(minutes=30 * azar.randint(1, 16))))
+    return eventos
+
+
+def solapados_ingenuo(eventos, inicio, fin):
+    return [id_evento for id_evento, a, b in eventos if a < fin and inicio < b]
+
+
+def pares_ingenuo(eventos):
+    pares = set()
+    for i, (id_a, inicio_a, fin_a) in enumerate(eventos):
+        for id_b, inicio_b, fin_b in eventos[i + 1:]:
+            if inicio_a < fin_b and inicio_b < fin_a:
+                pares.add(frozenset((id_a, id_b)))
+    return pares
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la detección de cruces ingenua con el índice de intervalos")
+    parser.add_argument('--eventos', type=int, default=20000)
+    parser.add_argument('--consultas', type=int, default=5000)
+    parser.add_argument('--auditoria', type=int, default=3000, help="eventos para comparar la auditoría por pares")
+    args = parser.parse_args()
+
+    eventos = generar(args.eventos)
+    consultas = [(inicio, fin) for _, inicio, fin in generar(args.consultas, semilla=2)]
+
+    indice, construccion = medir(IndiceIntervalos, eventos)
+    ingenuo, t_ingenuo = medir(lambda: [solapados_ingenuo(eventos, *c) for c in consultas])
+    indexado, t_indice = medir(lambda: [indice.solapados(*c) for c in consultas])
+    print(f"{args.consultas} consultas sobre {args.eventos} eventos:")
+    print(f"  recorrido completo: {t_ingenuo * 1000:9.1f} ms")
+    print(f"  índice:             {t_indice * 1000:9.1f} ms  (construcción {construccion * 1000:.1f} ms)"
+          f"  {t_ingenuo / t_indice:.0f}x")
+
+    muestra = eventos[:args.auditoria]
+    por_pares, t_pares = medir(pares_ingenuo, muestra)
+    barrido, t_barrido = medir(
+        lambda: {frozenset(par) for par in solapamientos(sorted(muestra, key=lambda e: e[1]))})
+    print(f"Auditoría de {len(muestra)} eventos ({len(barrido)} cruces):")
+    print(f"  todos los pares: {t_pares * 1000:9.1f} ms")
+    print(f"  barrido:         {t_barrido * 1000:9.1f} ms  {t_pares / t_barrido:.0f}x")
+
+    iguales = (all(sorted(a) == sorted(b) for a, b in zip(ingenuo, indexado))
+               and por_pares == barrido)
+    print("Resultados idénticos" if iguales else "ERROR: los resultados difieren")
+    sys.exit(0 if iguales else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Prueba de estrés de InscripcionQueries.inscribir con varias mesas de
+registro simultáneas.
+
+Crea eventos de prueba con cupo limitado y más participantes que cupos, y
+lanza hilos que intentan inscribirlos (cada participante dos veces, para
+provocar duplicados); los que no alcanzan cupo quedan en lista de espera.
+Después cancela en paralelo --cancelaciones inscripciones confirmadas por
+evento, cuyos cupos deben pasar a los primeros en espera. Tras cada fase
+verifica que ningún evento supere su cupo ni deje cupos libres con gente
+esperando, que no haya inscripciones repetidas ni posiciones de espera
+repetidas, que los contadores coincidan con las filas y que la promoción
+respete el orden de la lista; al final borra los datos de prueba.
+
+Uso:
+    python benchmarks/estres_inscripciones.py --hilos 8 --eventos 4 --cupo 20 --participantes 60 --cancelaciones 10
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.connection import db
+from database.queries import EventoQueries, ParticipanteQueries, InscripcionQueries
+
+
+def preparar(num_eventos, cupo, num_participantes):
+    marca = uuid.uuid4().hex[:8]
+    inicio = datetime.now() + timedelta(days=30)
+    eventos = [
+        EventoQueries.crear(f"Estrés {marca} #{i}", "", inicio, inicio + timedelta(hours=2),
+                            "Sala de pruebas", cupo, "Prueba")
+        for i in range(num_eventos)
+    ]
+    participantes = [
+        ParticipanteQueries.crear("Estres", f"Prueba{i}", f"estres.{marca}.{i}@example.com", "")
+        for i in range(num_participantes)
+    ]
+    if None in eventos or None in participantes:
+        raise RuntimeError("No se pudieron crear los datos de prueba")
+    return eventos, participantes
+
+
+def verificar(eventos, cupo):
+    errores = []
+    for id_evento in eventos:
+        filas = db.execute_query("""
+            SELECT id_participante, COUNT(*) AS n FROM inscripciones
+            WHERE id_evento = %s AND estado = 'confirmado'
+            GROUP BY id_participante
+        """, (id_evento,)) or []
+        confirmadas = sum(fila['n'] for fila in filas)
+        repetidas = [fila['id_participante'] for fila in filas if fila['n'] > 1]
+        contador = EventoQueries.obtener_por_id(id_evento)['inscritos']
+        espera = InscripcionQueries.obtener_lista_espera(id_evento) or []
+        posiciones = [fila['posicion_espera'] for fila in espera]
+
+        if confirmadas > cupo:
+            errores.append(f"evento {id_evento}: {confirmadas} confirmadas con cupo {cupo}")
+        if espera and confirmadas < cupo:
+            errores.append(f"evento {id_evento}: {cupo - confirmadas} cupos libres con {len(espera)} en espera")
+        if repetidas:
+            errores.append(f"evento {id_evento}: participantes repetidos {repetidas}")
+        if len(set(posiciones)) != len(posiciones):
+            errores.append(f"evento {id_evento}: posiciones de espera repetidas")
+        if contador != confirmadas:
+            errores.append(f"evento {id_evento}: contador {contador} != {confirmadas} filas")
+    return errores
+
+
+def cancelar(eventos, cancelaciones, hilos):
+    """
+    Cancela en paralelo las primeras inscripciones confirmadas de cada
+    evento y verifica que los promovidos sean los primeros de la lista
+    """
+    antes = {id_evento: [fila['id_participante'] for fila in InscripcionQueries.obtener_lista_espera(id_evento)]
+             for id_evento in eventos}
+    canceladas = [
+        (id_evento, fila['id_participante'])
+        for id_evento in eventos
+        for fila in (db.execute_query("""
+            SELECT id_participante FROM inscripciones
+            WHERE id_evento = %s AND estado = 'confirmado'
+            ORDER BY id_inscripcion LIMIT %s
+        """, (id_evento, cancelaciones)) or [])
+    ]
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        resultados = list(executor.map(lambda par: InscripcionQueries.cancelar_inscripcion(*par), canceladas))
+    duracion = time.perf_counter() - inicio
+    print(f"{len(canceladas)} cancelaciones en {duracion:.2f}s")
+
+    errores = []
+    if resultados.count(1) != len(canceladas):
+        errores.append(f"{len(canceladas) - resultados.count(1)} cancelaciones fallaron")
+    for id_evento in eventos:
+        promovidos = min(cancelaciones, len(antes[id_evento]))
+        despues = [fila['id_participante'] for fila in InscripcionQueries.obtener_lista_espera(id_evento)]
+        if despues != antes[id_evento][promovidos:]:
+            errores.append(f"evento {id_evento}: la promoción no respetó el orden de la lista de espera")
+    return errores
+
+
+def limpiar(eventos, participantes):
+    for id_evento in eventos:
+        EventoQueries.eliminar(id_evento)
+    for id_participante in participantes:
+        ParticipanteQueries.eliminar(id_participante)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estrés de inscripciones concurrentes")
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--eventos', type=int, default=4)
+    parser.add_argument('--cupo', type=int, default=20)
+    parser.add_argument('--participantes', type=int, default=60)
+    parser.add_argument('--cancelaciones', type=int, default=10, help="cancelaciones por evento")
+    args = parser.parse_args(argv)
+
+    # Un hilo por conexión: con menos conexiones que hilos la prueba mediría el pool
+    db.pool_size = max(db.pool_size, args.hilos)
+
+    eventos, participantes = preparar(args.eventos, args.cupo, args.participantes)
+    try:
+        # Cada (evento, participante) se intenta dos veces, intercalado entre eventos
+        intentos = [(e, p) for p in participantes for e in eventos] * 2
+
+        resultados = Counter()
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.hilos) as executor:
+            for resultado in executor.map(lambda par: InscripcionQueries.inscribir(*par), intentos):
+                resultados[resultado[0] if resultado else 'error'] += 1
+        duracion = time.perf_counter() - inicio
+
+        print(f"{len(intentos)} intentos en {duracion:.2f}s "
+              f"({len(intentos) / duracion:.0f}/s con {args.hilos} hilos)")
+        for resultado, cantidad in sorted(resultados.items()):
+            print(f"  {resultado}: {cantidad}")
+
+        esperadas = args.eventos * min(args.cupo, args.participantes)
+        errores = verificar(eventos, args.cupo)
+        if resultados[InscripcionQueries.INSCRITO] != esperadas:
+            errores.append(f"{resultados[InscripcionQueries.INSCRITO]} inscritos, se esperaban {esperadas}")
+        en_espera = args.eventos * args.participantes - esperadas
+        if resultados[InscripcionQueries.EN_ESPERA] != en_espera:
+            errores.append(f"{resultados[InscripcionQueries.EN_ESPERA]} en espera, se esperaban {en_espera}")
+        if resultados['error']:
+            errores.append(f"{resultados['error']} intentos terminaron con error")
+
+        if args.cancelaciones and not errores:
+            errores += cancelar(eventos, args.cancelaciones, args.hilos)
+            errores += verificar(eventos, args.cupo)
+    finally:
+        limpiar(eventos, participantes)
+
+    for error in errores:
+        print(f"ERROR: {error}")
+    print("OK" if not errores else "FALLÓ")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
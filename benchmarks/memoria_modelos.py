@@ -0,0 +1,133 @@
+"""
+Memoria y tiempo de construcción de los modelos al cargar listados grandes.
+
+Compara la ruta anterior (fila en diccionario + objeto con __dict__) con la
+actual (fila en tupla + Evento/Participante con __slots__ y from_row) sobre
+filas sintéticas, sin necesitar la base de datos. La memoria se mide con
+tracemalloc e incluye las filas y los objetos construidos.
+
+Uso:
+    python benchmarks/memoria_modelos.py --filas 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.event import Evento
+from models.participante import Participante
+
+
+class EventoConDict:
+    """Evento tal como era antes de __slots__"""
+
+    def __init__(self, id_evento=None, nombre="", descripcion="", fecha_inicio=None,
+                 fecha_fin=None, ubicacion="", capacidad_maxima=0, categoria="",
+                 estado="activo", fecha_creacion=None, inscritos=0):
+        self.id_evento = id_evento
+        self.nombre = nombre
+        self.descripcion = descripcion
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_fin
+        self.ubicacion = ubicacion
+        self.capacidad_maxima = capacidad_maxima
+        self.categoria = categoria
+        self.estado = estado
+        self.fecha_creacion = fecha_creacion
+        self.inscritos = inscritos
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class ParticipanteConDict:
+    """Participante tal como era antes de __slots__"""
+
+    def __init__(self, id_participante=None, nombre="", apellido="", email="",
+                 telefono="", fecha_registro=None, total_eventos=0):
+        self.id_participante = id_participante
+        self.nombre = nombre
+        self.apellido = apellido
+        self.email = email
+        self.telefono = telefono
+        self.fecha_registro = fecha_registro
+        self.total_eventos = total_eventos
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+COLUMNAS_EVENTO = ('id_evento', 'nombre', 'descripcion', 'fecha_inicio', 'fecha_fin',
+                   'ubicacion', 'capacidad_maxima', 'categoria', 'estado', 'inscritos')
+COLUMNAS_PARTICIPANTE = ('id_participante', 'nombre', 'apellido', 'email', 'telefono',
+                         'fecha_registro', 'total_eventos')
+
+
+def filas_eventos(cantidad):
+    base = datetime(2024, 1, 1, 9)
+    return [
+        (i, f"Evento {i}", f"Descripción del evento {i}", base + timedelta(hours=i),
+         base + timedelta(hours=i + 2), f"Sala {i % 40}", 100, f"Categoría {i % 12}",
+         'activo', i % 100)
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def filas_participantes(cantidad):
+    base = datetime(2024, 1, 1)
+    return [
+        (i, f"Nombre{i}", f"Apellido{i % 5000}", f"persona{i}@example.com", f"555-{i:07d}",
+         base + timedelta(minutes=i), i % 7)
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def medir(generar_filas, construir):
+    """Bytes y segundos para generar las filas y construir los objetos"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    filas = generar_filas()
+    objetos = [construir(fila) for fila in filas]
+    segundos = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del filas, objetos
+    return memoria, segundos
+
+
+def comparar(nombre, cantidad, tuplas, columnas, anterior, actual):
+    # Las filas en tupla se generan fuera de la medición y se convierten
+    # dentro, para que ambas rutas carguen el mismo conjunto de datos
+    datos = tuplas(cantidad)
+    en_dict = medir(lambda: [dict(zip(columnas, fila)) for fila in datos], anterior.from_dict)
+    en_tupla = medir(lambda: [tuple(fila) for fila in datos], actual.from_row)
+
+    print(f"{nombre} ({cantidad} filas)")
+    for etiqueta, (memoria, segundos) in (("dict + __dict__", en_dict),
+                                          ("tupla + __slots__", en_tupla)):
+        print(f"  {etiqueta:<18} {memoria / cantidad:8.0f} B/fila  "
+              f"{memoria / 2**20:8.1f} MiB  {segundos * 1000:8.1f} ms")
+    print(f"  ahorro: {1 - en_tupla[0] / en_dict[0]:.0%} de memoria, "
+          f"{en_dict[1] / en_tupla[1]:.1f}x más rápido")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara memoria y tiempo de los modelos")
+    parser.add_argument('--filas', type=int, default=100000)
+    args = parser.parse_args()
+
+    comparar("Eventos", args.filas, filas_eventos, COLUMNAS_EVENTO, EventoConDict, Evento)
+    comparar("Participantes", args.filas, filas_participantes, COLUMNAS_PARTICIPANTE,
+             ParticipanteConDict, Participante)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Velocidad de validación de participantes en lote.
+
+Compara la validación anterior (un campo por llamada, patrones como texto
+resueltos por la caché de re en cada llamada) con Validaciones.validar_lote
+sobre registros sintéticos, una parte de ellos inválidos.
+
+Uso:
+    python benchmarks/validaciones.py --registros 100000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.validations import Validaciones
+
+
+def email_anterior(email):
+    if not email or email.strip() == "":
+        return False, "El email es obligatorio"
+    email = email.strip()
+    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        return False, "El formato del email no es válido"
+    if len(email) > 100:
+        return False, "El email no puede exceder 100 caracteres"
+    return True, ""
+
+
+def telefono_anterior(telefono):
+    if not telefono:
+        return True, ""
+    telefono = telefono.strip()
+    if telefono == "":
+        return True, ""
+    telefono_limpio = re.sub(r'[\s\-\(\)\+]', '', telefono)
+    if not telefono_limpio.isdigit():
+        return False, "El teléfono solo puede contener números, espacios, guiones y paréntesis"
+    if len(telefono_limpio) < 8 or len(telefono_limpio) > 15:
+        return False, "El teléfono debe tener entre 8 y 15 dígitos"
+    return True, ""
+
+
+def nombre_anterior(nombre, campo="nombre"):
+    if not nombre or nombre.strip() == "":
+        return False, f"El {campo} es obligatorio"
+    nombre = nombre.strip()
+    if len(nombre) < 2:
+        return False, f"El {campo} debe tener al menos 2 caracteres"
+    if len(nombre) > 100:
+        return False, f"El {campo} no puede exceder 100 caracteres"
+    if not re.match(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s\'\-\.]+$', nombre):
+        return False, f"El {campo} contiene caracteres no válidos"
+    return True, ""
+
+
+def validar_anterior(registros):
+    """Validación registro a registro como la hacía la importación"""
+    invalidos = 0
+    for datos in registros:
+        errores = []
+        for campo in ('nombre', 'apellido'):
+            valido, mensaje = nombre_anterior(datos[campo], campo)
+            if not valido:
+                errores.append(mensaje)
+        valido, mensaje = email_anterior(datos['email'])
+        if not valido:
+            errores.append(mensaje)
+        valido, mensaje = telefono_anterior(datos['telefono'])
+        if not valido:
+            errores.append(mensaje)
+        invalidos += bool(errores)
+    return invalidos
+
+
+def generar(cantidad):
+    registros = []
+    for i in range(cantidad):
+        registro = {'nombre': "María José", 'apellido': "Pérez Núñez",
+                    'email': f"persona.{i}@example.com", 'telefono': f"(555) {i % 10000:04d}-{i % 997:04d}"}
+        # Uno de cada diez con algún error
+        if i % 10 == 3:
+            registro['email'] = f"persona{i}example.com"
+        elif i % 10 == 7:
+            registro['nombre'] = f"X{i}"
+        registros.append(registro)
+    return registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la validación anterior con validar_lote")
+    parser.add_argument('--registros', type=int, default=100000)
+    args = parser.parse_args()
+
+    registros = generar(args.registros)
+
+    inicio = time.perf_counter()
+    invalidos_anterior = validar_anterior(registros)
+    anterior = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    invalidos = len(Validaciones.validar_lote(registros))
+    lote = time.perf_counter() - inicio
+
+    assert invalidos == invalidos_anterior, (invalidos, invalidos_anterior)
+    print(f"{args.registros} registros, {invalidos} inválidos")
+    for etiqueta, segundos in (("por campo (anterior)", anterior), ("validar_lote", lote)):
+        print(f"  {etiqueta:<22} {segundos * 1000:8.1f} ms  "
+              f"{args.registros / segundos:10.0f} registros/s")
+    print(f"  {anterior / lote:.1f}x más rápido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Backend SQLite embebido: la misma interfaz que DatabaseConnection sobre un
+archivo local, para mesas de registro sin servidor y para correr los
+benchmarks sin MySQL.
+
+El SQL de queries.py se escribe para MySQL y se traduce al vuelo (una vez
+por texto de consulta): parámetros %s, FOR UPDATE, NOW(), <=>, TO_DAYS() y
+MATCH ... AGAINST. Las transacciones empiezan con BEGIN IMMEDIATE, que toma
+el lock de escritura de entrada: cumple el papel de los SELECT ... FOR UPDATE
+(las escrituras se ordenan entre sí) mientras WAL deja leer en paralelo.
+
+Los errores de sqlite3 se convierten en los de mysql.connector, así que el
+resto del código los maneja igual con cualquiera de los dos backends.
+"""
+import logging
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
+
+from mysql.connector import errors
+
+from database.connection import DatabaseConnection
+from utils.indice_prefijos import normalizar
+
+logger = logging.getLogger(__name__)
+
+# Hora local con milisegundos, como CURRENT_TIMESTAMP de MySQL (que usa la
+# zona del servidor, no UTC)
+AHORA = "(strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))"
+
+# Equivale a las migraciones 1 a 9 de database/migraciones.py. FULLTEXT no
+# existe en SQLite: la búsqueda usa la función COINCIDE (recorrido completo).
+VERSION_ESQUEMA = 9
+
+
+def _agregar_columna(tabla, columna, definicion):
+    """
+    Paso del esquema que agrega una columna solo si aún no existe: CREATE
+    TABLE IF NOT EXISTS no la agrega a un archivo creado con una versión
+    anterior
+    """
+    def paso(conexion):
+        columnas = {fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla})")}
+        if columna not in columnas:
+            conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}")
+    return paso
+
+
+ESQUEMA = [
+    f"""
+    CREATE TABLE IF NOT EXISTS participantes (
+        id_participante INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre VARCHAR(100) COLLATE NOCASE,
+        apellido VARCHAR(100) COLLATE NOCASE,
+        email VARCHAR(100) COLLATE NOCASE UNIQUE,
+        telefono VARCHAR(20),
+        fecha_registro TIMESTAMP DEFAULT {AHORA},
+        total_inscripciones INTEGER NOT NULL DEFAULT 0,
+        fecha_modificacion TIMESTAMP NOT NULL DEFAULT {AHORA}
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS eventos (
+        id_evento INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre VARCHAR(150),
+        descripcion TEXT,
+        fecha_inicio DATETIME,
+        fecha_fin DATETIME,
+        ubicacion VARCHAR(150),
+        capacidad_maxima INTEGER,
+        categoria VARCHAR(100),
+        estado VARCHAR(50) DEFAULT 'activo',
+        fecha_creacion TIMESTAMP DEFAULT {AHORA},
+        inscritos_confirmados INTEGER NOT NULL DEFAULT 0,
+        fecha_modificacion TIMESTAMP NOT NULL DEFAULT {AHORA}
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS inscripciones (
+        id_inscripcion INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_evento INTEGER REFERENCES eventos(id_evento) ON DELETE CASCADE,
+        id_participante INTEGER REFERENCES participantes(id_participante) ON DELETE CASCADE,
+        fecha_inscripcion TIMESTAMP DEFAULT {AHORA},
+        estado VARCHAR(50) DEFAULT 'confirmado',
+        notas TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        usuario VARCHAR(50) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        rol VARCHAR(20) DEFAULT 'admin'
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS registros_eliminados (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabla VARCHAR(50) NOT NULL,
+        id_registro INTEGER NOT NULL,
+        fecha_eliminacion TIMESTAMP NOT NULL DEFAULT {AHORA}
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS estadisticas (
+        id INTEGER PRIMARY KEY,
+        eventos_activos INTEGER NOT NULL DEFAULT 0,
+        total_participantes INTEGER NOT NULL DEFAULT 0,
+        inscripciones_confirmadas INTEGER NOT NULL DEFAULT 0,
+        eventos_proximos INTEGER NOT NULL DEFAULT 0,
+        actualizado_en TIMESTAMP DEFAULT {AHORA}
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS operaciones_sincronizadas (
+        clave CHAR(36) PRIMARY KEY,
+        tipo VARCHAR(20) NOT NULL,
+        resultado VARCHAR(20) NOT NULL,
+        id_resultado INTEGER NULL,
+        fecha_sincronizacion TIMESTAMP DEFAULT {AHORA}
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        descripcion VARCHAR(200),
+        aplicada_en TIMESTAMP DEFAULT {AHORA}
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_inscripciones_evento_participante ON inscripciones (id_evento, id_participante)",
+    "CREATE INDEX IF NOT EXISTS idx_inscripciones_evento_estado ON inscripciones (id_evento, estado)",
+    "CREATE INDEX IF NOT EXISTS idx_inscripciones_participante ON inscripciones (id_participante, estado)",
+    "CREATE INDEX IF NOT EXISTS idx_eventos_estado_fecha ON eventos (estado, fecha_inicio)",
+    "CREATE INDEX IF NOT EXISTS idx_eventos_fecha_inicio ON eventos (fecha_inicio)",
+    "CREATE INDEX IF NOT EXISTS idx_participantes_apellido_nombre ON participantes (apellido, nombre)",
+    "CREATE INDEX IF NOT EXISTS idx_eventos_modificacion ON eventos (fecha_modificacion)",
+    "CREATE INDEX IF NOT EXISTS idx_participantes_modificacion ON participantes (fecha_modificacion)",
+    "CREATE INDEX IF NOT EXISTS idx_eliminados_tabla_fecha ON registros_eliminados (tabla, fecha_eliminacion)",
+    _agregar_columna("inscripciones", "posicion_espera", "INTEGER NULL"),
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_inscripciones_espera ON inscripciones (id_evento, posicion_espera)",
+    "CREATE INDEX IF NOT EXISTS idx_eventos_ubicacion_fecha ON eventos (ubicacion, fecha_inicio)",
+    # ON UPDATE CURRENT_TIMESTAMP de MySQL
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_eventos_modificacion AFTER UPDATE ON eventos
+    WHEN NEW.fecha_modificacion IS OLD.fecha_modificacion
+    BEGIN
+        UPDATE eventos SET fecha_modificacion = {AHORA} WHERE id_evento = NEW.id_evento;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_participantes_modificacion AFTER UPDATE ON participantes
+    WHEN NEW.fecha_modificacion IS OLD.fecha_modificacion
+    BEGIN
+        UPDATE participantes SET fecha_modificacion = {AHORA} WHERE id_participante = NEW.id_participante;
+    END
+    """,
+    "INSERT OR IGNORE INTO estadisticas (id) VALUES (1)",
+    f"INSERT OR IGNORE INTO schema_version (version, descripcion) VALUES ({VERSION_ESQUEMA}, 'Esquema SQLite')",
+]
+
+# Se aplican en cada conexión; journal_mode=WAL queda guardado en el archivo
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# (patrón, reemplazo) en orden; %s se traduce después de MATCH, que lo usa
+_TRADUCCIONES = [
+    (re.compile(r'\s+FOR\s+UPDATE\b', re.IGNORECASE), ''),
+    (re.compile(r'MATCH\s*\(([^)]*)\)\s*AGAINST\s*\(\s*%s\s+IN\s+BOOLEAN\s+MODE\s*\)', re.IGNORECASE),
+     r'COINCIDE(%s, \1)'),
+    # Las fechas calculadas llegan como texto: [timestamp] las convierte
+    (re.compile(r'\b(NOW\(\d*\))\s+AS\s+(\w+)', re.IGNORECASE), r'\1 AS "\2 [timestamp]"'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\bNOW\(\d*\)|\bCURRENT_TIMESTAMP\b(\(\d*\))?', re.IGNORECASE), lambda m: AHORA),
+    (re.compile(r'<=>'), ' IS '),
+]
+
+_PALABRA = re.compile(r'\w+')
+
+# Límite de espera por el lock de escritura antes de fallar como "lock wait timeout"
+ESPERA_LOCK_S = 5
+
+
+@lru_cache(maxsize=512)
+def traducir(query):
+    """Traduce una consulta escrita para MySQL al dialecto de SQLite"""
+    for patron, reemplazo in _TRADUCCIONES:
+        query = patron.sub(reemplazo, query)
+    return query
+
+
+def _coincide(expresion, *textos):
+    """
+    MATCH ... AGAINST en modo booleano para expresiones de
+    queries.expresion_busqueda ('+ter* +mino*'): 0 si falta algún término,
+    si no la cantidad de palabras que empiezan con alguno
+    """
+    if not expresion:
+        return 0
+    palabras = _PALABRA.findall(normalizar(" ".join(t for t in textos if t)))
+    relevancia = 0
+    for termino in expresion.split():
+        prefijo = normalizar(termino.strip('+*'))
+        coincidencias = sum(1 for palabra in palabras if palabra.startswith(prefijo))
+        if not coincidencias:
+            return 0
+        relevancia += coincidencias
+    return float(relevancia)
+
+
+def _to_days(valor):
+    """TO_DAYS() de MySQL: días desde el año 0"""
+    if valor is None:
+        return None
+    return date.fromisoformat(str(valor)[:10]).toordinal() + 365
+
+
+def _a_datetime(valor):
+    return datetime.fromisoformat(valor.decode())
+
+
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_adapter(date, lambda valor: valor.isoformat())
+sqlite3.register_converter("TIMESTAMP", _a_datetime)
+sqlite3.register_converter("DATETIME", _a_datetime)
+
+
+@contextmanager
+def _errores():
+    """Convierte las excepciones de sqlite3 en las de mysql.connector"""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        # 1062: entrada duplicada; 1452: clave foránea inexistente
+        errno = 1062 if "UNIQUE" in str(e) else 1452
+        raise errors.IntegrityError(msg=str(e), errno=errno) from e
+    except sqlite3.OperationalError as e:
+        if "locked" in str(e) or "busy" in str(e):
+            # 1205: espera de lock agotada; las inscripciones la reintentan
+            raise errors.DatabaseError(msg=str(e), errno=1205) from e
+        raise errors.DatabaseError(msg=str(e)) from e
+    except sqlite3.ProgrammingError as e:
+        raise errors.ProgrammingError(msg=str(e)) from e
+    except sqlite3.Error as e:
+        raise errors.DatabaseError(msg=str(e)) from e
+
+
+class CursorSQLite:
+    """Cursor de sqlite3 con la interfaz que usa DatabaseConnection"""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self.dictionary = dictionary
+
+    def execute(self, query, params=None):
+        with _errores():
+            self._cursor.execute(traducir(query), params or ())
+        return self
+
+    def executemany(self, query, filas):
+        with _errores():
+            self._cursor.executemany(traducir(query), filas)
+        return self
+
+    def _convertir(self, filas):
+        if not self.dictionary or not filas:
+            return filas
+        columnas = [descripcion[0] for descripcion in self._cursor.description]
+        return [dict(zip(columnas, fila)) for fila in filas]
+
+    def fetchall(self):
+        with _errores():
+            return self._convertir(self._cursor.fetchall())
+
+    def fetchmany(self, cantidad):
+        with _errores():
+            return self._convertir(self._cursor.fetchmany(cantidad))
+
+    def fetchone(self):
+        filas = self.fetchmany(1)
+        return filas[0] if filas else None
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSQLite:
+    """Conexión de sqlite3 con la interfaz de una conexión de mysql.connector"""
+
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    def cursor(self, dictionary=False, **opciones):
+        # buffered/prepared no aplican: sqlite3 ya lee por pasos y guarda
+        # sus propias sentencias preparadas
+        return CursorSQLite(self._conexion.cursor(), dictionary)
+
+    def execute(self, query, params=None, dictionary=False):
+        """Igual que StatementCache.execute: ejecuta y retorna el cursor"""
+        return self.cursor(dictionary).execute(query, params)
+
+    @property
+    def in_transaction(self):
+        return self._conexion.in_transaction
+
+    def start_transaction(self):
+        with _errores():
+            self._conexion.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        with _errores():
+            self._conexion.commit()
+
+    def rollback(self):
+        with _errores():
+            self._conexion.rollback()
+
+    def ping(self, reconnect=False):
+        with _errores():
+            self._conexion.execute("SELECT 1")
+
+    def close(self):
+        self._conexion.close()
+
+
+class SQLiteConnection(DatabaseConnection):
+    """
+    Pool de conexiones a un archivo SQLite en modo WAL. Varias conexiones
+    leen en paralelo; las transacciones de escritura se ordenan con el lock
+    del archivo (esperan hasta ESPERA_LOCK_S segundos).
+    """
+
+    dialecto = 'sqlite'
+
+    def __init__(self, ruta='gestor_eventos.db', pool_size=5, pool_timeout=10, idle_check=30):
+        super().__init__(pool_size=pool_size, pool_timeout=pool_timeout, idle_check=idle_check)
+        self.ruta = ruta
+        self.database = ruta
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, timeout=ESPERA_LOCK_S, isolation_level=None,
+                                   check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        for pragma in PRAGMAS:
+            conexion.execute(pragma)
+        conexion.create_function("COINCIDE", -1, _coincide, deterministic=True)
+        conexion.create_function("TO_DAYS", 1, _to_days, deterministic=True)
+        # Minúsculas y sin acentos, como compara la intercalación de MySQL
+        conexion.create_function("NORMALIZAR", 1, normalizar, deterministic=True)
+        return conexion
+
+    def crear_base_datos_si_no_existe(self):
+        """Crea el archivo y el esquema completo si faltan"""
+        try:
+            conexion = self._conectar()
+            try:
+                conexion.execute("PRAGMA journal_mode = WAL")
+                for sentencia in ESQUEMA:
+                    if callable(sentencia):
+                        sentencia(conexion)
+                    else:
+                        conexion.execute(sentencia)
+            finally:
+                conexion.close()
+            logger.info(f"Base de datos SQLite '{self.ruta}' verificada o creada.")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error creando base de datos SQLite: {e}")
+            return False
+
+    def _abrir_conexion(self):
+        self._verificar_base()
+        with _errores():
+            return ConexionSQLite(self._conectar())
+
+    def sentencias(self, connection):
+        # sqlite3 mantiene su propia caché de sentencias por conexión
+        return connection
@@ -0,0 +1,221 @@
+"""
+Cruces de horario: un participante inscrito (confirmado) en dos eventos que
+se solapan, o dos eventos en la misma ubicación a la misma hora.
+
+Las verificaciones al inscribir y al guardar un evento usan un índice de
+intervalos (utils/indice_intervalos.py) por participante y por ubicación,
+que se carga con una consulta al primer uso y se descarta con las
+notificaciones de escritura que lo dejan desactualizado. Cada consulta
+sobre un índice cargado cuesta O(log n + k).
+
+La auditoría recorre toda la base en una pasada por cada tipo de cruce:
+las filas llegan ordenadas por (participante o ubicación, fecha_inicio) y
+un barrido encuentra todos los pares que se solapan.
+
+Los eventos cancelados no ocupan horario.
+
+Uso:
+    python -m database.conflictos    # auditoría completa; sale con 1 si hay cruces
+"""
+import argparse
+import logging
+import sys
+import threading
+from itertools import groupby
+
+from mysql.connector import Error
+
+from database.connection import db
+from database.notificaciones import suscribir
+from utils.indice_intervalos import IndiceIntervalos, solapamientos
+from utils.indice_prefijos import normalizar
+
+logger = logging.getLogger(__name__)
+
+HORARIOS_PARTICIPANTE = """
+SELECT e.id_evento, e.fecha_inicio, e.fecha_fin
+FROM inscripciones i
+JOIN eventos e ON e.id_evento = i.id_evento
+WHERE i.id_participante = %s AND i.estado = 'confirmado' AND e.estado <> 'cancelado'
+"""
+
+HORARIOS_UBICACION = """
+SELECT id_evento, fecha_inicio, fecha_fin
+FROM eventos
+WHERE ubicacion = %s AND estado <> 'cancelado'
+"""
+
+# SQLite compara el texto byte a byte: se compara la ubicación normalizada,
+# como la compara MySQL con su intercalación sin mayúsculas ni acentos
+HORARIOS_UBICACION_SQLITE = """
+SELECT id_evento, fecha_inicio, fecha_fin
+FROM eventos
+WHERE TRIM(NORMALIZAR(ubicacion)) = %s AND estado <> 'cancelado'
+"""
+
+AUDITAR_PARTICIPANTES = """
+SELECT i.id_participante, e.id_evento, e.fecha_inicio, e.fecha_fin
+FROM inscripciones i
+JOIN eventos e ON e.id_evento = i.id_evento
+WHERE i.estado = 'confirmado' AND e.estado <> 'cancelado'
+ORDER BY i.id_participante, e.fecha_inicio
+"""
+
+AUDITAR_UBICACIONES = """
+SELECT ubicacion, id_evento, fecha_inicio, fecha_fin
+FROM eventos
+WHERE estado <> 'cancelado' AND ubicacion IS NOT NULL AND ubicacion <> ''
+ORDER BY ubicacion, fecha_inicio
+"""
+
+AUDITAR_UBICACIONES_SQLITE = """
+SELECT ubicacion, id_evento, fecha_inicio, fecha_fin
+FROM eventos
+WHERE estado <> 'cancelado' AND ubicacion IS NOT NULL AND ubicacion <> ''
+ORDER BY TRIM(NORMALIZAR(ubicacion)), fecha_inicio
+"""
+
+
+class Agenda:
+    """
+    Índices de intervalos por clave (un participante, una ubicación). Cada
+    uno se construye con una consulta la primera vez que se pide y se
+    conserva hasta que una escritura lo invalida. Es seguro entre hilos.
+    """
+
+    def __init__(self, consulta):
+        self._consulta = consulta
+        self._indices = {}
+        self._lock = threading.Lock()
+        # Cambia con cada invalidación: un índice consultado antes de una
+        # escritura no se guarda después de ella
+        self._generacion = 0
+
+    def indice(self, clave):
+        """Índice de la clave; None si no se pudo consultar"""
+        with self._lock:
+            indice = self._indices.get(clave)
+            generacion = self._generacion
+        if indice is not None:
+            return indice
+        filas = db.execute_query(self._consulta, (clave,), dictionary=False)
+        if filas is None:
+            return None
+        indice = IndiceIntervalos(filas)
+        with self._lock:
+            if generacion == self._generacion:
+                self._indices[clave] = indice
+        return indice
+
+    def invalidar(self, clave=None):
+        """Descarta el índice de una clave, o todos si no se indica ninguna"""
+        with self._lock:
+            self._generacion += 1
+            if clave is None:
+                self._indices.clear()
+            else:
+                self._indices.pop(clave, None)
+
+
+participantes = Agenda(HORARIOS_PARTICIPANTE)
+ubicaciones = Agenda(HORARIOS_UBICACION_SQLITE if db.dialecto == 'sqlite' else HORARIOS_UBICACION)
+
+
+def _clave_ubicacion(ubicacion):
+    """'Aula 1', 'aula 1' y 'Áula 1 ' son la misma ubicación"""
+    return normalizar(ubicacion).strip()
+
+
+def conflictos_participante(id_participante, fecha_inicio, fecha_fin, excluir=None):
+    """
+    Ids de los eventos en que el participante está confirmado y que se
+    cruzan con [fecha_inicio, fecha_fin), sin el evento excluir
+    """
+    indice = participantes.indice(id_participante)
+    if indice is None:
+        return []
+    return indice.solapados(fecha_inicio, fecha_fin, excluir)
+
+
+def conflictos_ubicacion(ubicacion, fecha_inicio, fecha_fin, excluir=None):
+    """Ids de los eventos en la ubicación que se cruzan con [fecha_inicio, fecha_fin), sin el evento excluir"""
+    clave = _clave_ubicacion(ubicacion)
+    if not clave:
+        return []
+    indice = ubicaciones.indice(clave)
+    if indice is None:
+        return []
+    return indice.solapados(fecha_inicio, fecha_fin, excluir)
+
+
+def _barrer(filas, agrupar=lambda clave: clave):
+    """(clave, id_evento_a, id_evento_b) de filas (clave, id_evento, inicio, fin) ordenadas por clave e inicio"""
+    for _, grupo in groupby(filas, key=lambda fila: agrupar(fila[0])):
+        grupo = list(grupo)
+        for id_a, id_b in solapamientos(fila[1:] for fila in grupo):
+            yield grupo[0][0], id_a, id_b
+
+
+def auditar():
+    """
+    Todos los cruces de la base: {'participantes': [(id_participante,
+    id_evento_a, id_evento_b)], 'ubicaciones': [(ubicacion, id_evento_a,
+    id_evento_b)]}. Los errores se propagan.
+    """
+    auditar_ubicaciones = AUDITAR_UBICACIONES_SQLITE if db.dialecto == 'sqlite' else AUDITAR_UBICACIONES
+    return {
+        'participantes': list(_barrer(db.iterar_query(AUDITAR_PARTICIPANTES, dictionary=False))),
+        # Las filas llegan ordenadas sin distinguir mayúsculas ni acentos:
+        # 'Aula 1' y 'aula 1' llegan juntas y son la misma ubicación
+        'ubicaciones': list(_barrer(db.iterar_query(auditar_ubicaciones, dictionary=False),
+                                    _clave_ubicacion)),
+    }
+
+
+@suscribir
+def _invalidar_por_escritura(tabla, accion, datos):
+    """Descarta los índices que una escritura confirmada dejó desactualizados"""
+    if tabla == 'inscripciones':
+        # Sin id de participante es un lote: pueden ser muchos
+        participantes.invalidar(datos.get('id_participante'))
+    elif tabla == 'participantes':
+        if accion == 'eliminar':
+            participantes.invalidar(datos.get('id_participante'))
+    elif tabla == 'eventos':
+        # Las notificaciones no traen la ubicación ni las fechas anteriores
+        ubicaciones.invalidar()
+        if accion != 'crear':
+            participantes.invalidar()
+    else:
+        participantes.invalidar()
+        ubicaciones.invalidar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca cruces de horario en toda la base de datos")
+    parser.parse_args(argv)
+
+    try:
+        cruces = auditar()
+        nombres = {fila['id_evento']: fila['nombre']
+                   for fila in db.execute_query("SELECT id_evento, nombre FROM eventos") or []}
+    except Error as e:
+        logger.error(f"Error auditando cruces de horario: {e}")
+        return 2
+
+    for id_participante, id_a, id_b in cruces['participantes']:
+        print(f"Participante #{id_participante}: '{nombres.get(id_a)}' (#{id_a}) y '{nombres.get(id_b)}' (#{id_b})")
+    for ubicacion, id_a, id_b in cruces['ubicaciones']:
+        print(f"Ubicación '{ubicacion}': '{nombres.get(id_a)}' (#{id_a}) y '{nombres.get(id_b)}' (#{id_b})")
+
+    total = len(cruces['participantes']) + len(cruces['ubicaciones'])
+    if total:
+        print(f"{len(cruces['participantes'])} cruces de participantes, "
+              f"{len(cruces['ubicaciones'])} de ubicaciones")
+        return 1
+    print("Sin cruces de horario")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,98 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, InterfaceError, OperationalError
 import logging
 
+from database.statements import StatementCache, estadisticas_globales
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class PoolAgotadoError(Error):
+    """No se obtuvo una conexión libre del pool dentro del tiempo de espera"""
+
+
+class Transaccion:
+    """Ejecuta varias sentencias sobre la misma conexión dentro de una transacción"""
+
+    def __init__(self, db, connection):
+        self.db = db
+        self.connection = connection
+
+    def execute_query(self, query, params=None):
+        cursor = self.db.sentencias(self.connection).execute(query, params, dictionary=True)
+        return cursor.fetchall()
+
+    def execute_update(self, query, params=None):
+        cursor = self.db.sentencias(self.connection).execute(query, params)
+        if query.strip().upper().startswith('INSERT'):
+            return cursor.lastrowid
+        return cursor.rowcount
+
+    def executemany(self, query, filas):
+        """
+        Ejecuta la sentencia para cada fila de parámetros y retorna las filas
+        afectadas. Usa un cursor sin preparar: con él el conector reescribe un
+        INSERT ... VALUES como un solo INSERT de varias filas.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, filas)
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+
 class DatabaseConnection:
-    def __init__(self):
+    """
+    Pool acotado de conexiones MySQL reutilizables.
+
+    No se conecta al crearse: la base de datos se verifica (y se crea si
+    falta) con la primera conexión que se pide, de modo que importar este
+    módulo no abre sockets ni bloquea el arranque.
+
+    Cada hilo toma una conexión con checkout() y la devuelve con checkin(),
+    de modo que el GUI y los trabajos en segundo plano no compiten por un
+    único socket. Las conexiones ociosas solo se verifican (ping) cuando
+    llevan más de idle_check segundos sin usarse.
+
+    Es también la interfaz de los backends: database/conexion_sqlite.py la
+    hereda y solo cambia cómo se abren las conexiones.
+    """
+
+    dialecto = 'mysql'
+
+    def __init__(self, pool_size=5, pool_timeout=10, idle_check=30, statement_cache_size=64,
+                 connect_timeout=5):
         self.host = 'localhost'
         self.user = 'root'
         self.password = ''
         self.port = 3306
         self.database = 'gestor_eventos'
-        self.connection = None
+
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.idle_check = idle_check
+        self.statement_cache_size = statement_cache_size
+        # Un servidor inaccesible debe fallar rápido para pasar al diario local
+        self.connect_timeout = connect_timeout
+
+        # LIFO: la conexión usada más recientemente es la que menos
+        # probabilidades tiene de haber sido cerrada por el servidor
+        self._libres = queue.LifoQueue()
+        self._creadas = 0
+        self._lock = threading.Lock()
+        self._base_verificada = False
+        self._lock_base = threading.Lock()
+        # Sentencias preparadas por conexión (id(conexion) -> StatementCache)
+        self._sentencias = {}
 
     def crear_base_datos_si_no_existe(self):
         try:
@@ -28,51 +107,179 @@ class DatabaseConnection:
             cursor.close()
             temp_conn.close()
             logger.info(f"Base de datos '{self.database}' verificada o creada.")
+            return True
         except Error as e:
             logger.error(f"Error creando base de datos: {e}")
+            return False
+
+    def _verificar_base(self):
+        """Crea la base de datos si falta; se reintenta hasta lograrlo una vez"""
+        if self._base_verificada:
+            return
+        with self._lock_base:
+            if not self._base_verificada:
+                self._base_verificada = self.crear_base_datos_si_no_existe()
+
+    def _abrir_conexion(self):
+        self._verificar_base()
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            autocommit=True,
+            connection_timeout=self.connect_timeout
+        )
 
     def connect(self):
+        """Verifica la base de datos y deja una conexión lista en el pool"""
         try:
-            self.crear_base_datos_si_no_existe()
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                autocommit=True
-            )
-            if self.connection.is_connected():
-                logger.info("Conexión exitosa a MySQL")
-                return True
+            self.checkin(self.checkout())
+            logger.info("Conexión exitosa a MySQL")
+            return True
         except Error as e:
             logger.error(f"Error al conectar a MySQL: {e}")
             return False
 
-    def get_connection(self):
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        return self.connection
+    def _reservar_cupo(self):
+        with self._lock:
+            if self._creadas >= self.pool_size:
+                return False
+            self._creadas += 1
+            return True
 
-    def disconnect(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            logger.info("Conexión cerrada")
+    def _descartar(self, connection):
+        with self._lock:
+            self._creadas -= 1
+        cache = self._sentencias.pop(id(connection), None)
+        if cache:
+            cache.close()
+        try:
+            connection.close()
+        except Error:
+            pass
 
-    def execute_query(self, query, params=None):
-        """Ejecuta una consulta SELECT y retorna los resultados"""
+    def _sigue_viva(self, connection):
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor(dictionary=True)
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
 
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+    def checkout(self, timeout=None):
+        """
+        Toma una conexión del pool, abriendo una nueva si aún hay cupo.
+        Lanza PoolAgotadoError si no se libera ninguna dentro del timeout.
+        """
+        timeout = self.pool_timeout if timeout is None else timeout
+        limite = time.monotonic() + timeout
 
-            result = cursor.fetchall()
-            cursor.close()
-            return result
+        while True:
+            try:
+                connection, ultimo_uso = self._libres.get_nowait()
+            except queue.Empty:
+                if self._reservar_cupo():
+                    try:
+                        return self._abrir_conexion()
+                    except Error:
+                        with self._lock:
+                            self._creadas -= 1
+                        raise
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise PoolAgotadoError(msg=f"Sin conexiones libres tras {timeout}s")
+                try:
+                    connection, ultimo_uso = self._libres.get(timeout=restante)
+                except queue.Empty:
+                    raise PoolAgotadoError(msg=f"Sin conexiones libres tras {timeout}s")
+
+            if time.monotonic() - ultimo_uso < self.idle_check or self._sigue_viva(connection):
+                return connection
+
+            logger.info("Conexión ociosa caída, se reemplaza")
+            self._descartar(connection)
+
+    def checkin(self, connection, descartar=False):
+        """Devuelve una conexión al pool (o la cierra si quedó inservible)"""
+        if descartar:
+            self._descartar(connection)
+            return
+
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Error:
+            self._descartar(connection)
+            return
+
+        self._libres.put((connection, time.monotonic()))
+
+    def sentencias(self, connection):
+        """Retorna la caché de sentencias preparadas de una conexión del pool"""
+        cache = self._sentencias.get(id(connection))
+        if cache is None:
+            cache = StatementCache(connection, self.statement_cache_size)
+            self._sentencias[id(connection)] = cache
+        return cache
+
+    def statement_stats(self):
+        """Aciertos y fallos de la caché de sentencias preparadas"""
+        return estadisticas_globales()
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión del pool durante un bloque with"""
+        connection = self.checkout()
+        try:
+            yield connection
+        except (InterfaceError, OperationalError):
+            self.checkin(connection, descartar=True)
+            raise
+        except BaseException:
+            self.checkin(connection)
+            raise
+        else:
+            self.checkin(connection)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Abre una transacción en una conexión del pool. Confirma al salir del
+        bloque y revierte si se produce cualquier excepción.
+        """
+        with self.conexion() as connection:
+            connection.start_transaction()
+            try:
+                yield Transaccion(self, connection)
+            except BaseException:
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
+                raise
+            connection.commit()
+
+    def disconnect(self):
+        """Cierra todas las conexiones ociosas del pool"""
+        cerradas = 0
+        while True:
+            try:
+                connection, _ = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(connection)
+            cerradas += 1
+        if cerradas:
+            logger.info("Conexión cerrada")
+
+    def execute_query(self, query, params=None, dictionary=True):
+        """Ejecuta una consulta SELECT y retorna los resultados (tuplas con dictionary=False)"""
+        try:
+            with self.conexion() as connection:
+                cursor = self.sentencias(connection).execute(query, params, dictionary=dictionary)
+                return cursor.fetchall()
 
         except Error as e:
             logger.error(f"Error ejecutando consulta: {e}")
@@ -81,27 +288,56 @@ class DatabaseConnection:
     def execute_update(self, query, params=None):
         """Ejecuta consultas INSERT, UPDATE, DELETE"""
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor()
+            with self.conexion() as connection:
+                cursor = self.sentencias(connection).execute(query, params)
 
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-
-            if query.strip().upper().startswith('INSERT'):
-                result = cursor.lastrowid
-            else:
-                result = cursor.rowcount
-
-            cursor.close()
-            return result
+                if query.strip().upper().startswith('INSERT'):
+                    return cursor.lastrowid
+                return cursor.rowcount
 
         except Error as e:
             logger.error(f"Error ejecutando actualización: {e}")
             return None
 
-# Instancia global para usar en queries.py
-db = DatabaseConnection()
-db.connect()
+    def iterar_query(self, query, params=None, tamano_lote=1000, dictionary=True):
+        """
+        Genera las filas (diccionarios, o tuplas con dictionary=False) de un SELECT sin cargarlas todas en
+        memoria: el cursor no usa búfer y las filas se leen del servidor de a
+        tamano_lote. La conexión queda ocupada hasta agotar o cerrar el
+        generador; si se abandona a medias se descarta, porque aún tiene
+        filas sin leer. Los errores se propagan al consumidor.
+        """
+        connection = self.checkout()
+        completo = False
+        try:
+            cursor = connection.cursor(dictionary=dictionary, buffered=False)
+            try:
+                cursor.execute(query, params)
+                while True:
+                    filas = cursor.fetchmany(tamano_lote)
+                    if not filas:
+                        break
+                    yield from filas
+                completo = True
+            finally:
+                if completo:
+                    cursor.close()
+        finally:
+            self.checkin(connection, descartar=not completo)
+
+def crear_conexion():
+    """
+    Crea el backend indicado en la variable de entorno GESTOR_DB_BACKEND:
+    'mysql' (por defecto) o 'sqlite', con el archivo de GESTOR_DB_RUTA
+    """
+    backend = os.environ.get('GESTOR_DB_BACKEND', 'mysql').strip().lower()
+    if backend == 'sqlite':
+        from database.conexion_sqlite import SQLiteConnection
+        return SQLiteConnection(os.environ.get('GESTOR_DB_RUTA', 'gestor_eventos.db'))
+    if backend != 'mysql':
+        raise ValueError(f"Backend de base de datos desconocido: {backend}")
+    return DatabaseConnection()
+
 
+# Instancia global para usar en queries.py; se conecta al primer uso
+db = crear_conexion()
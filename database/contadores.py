@@ -0,0 +1,114 @@
+"""
+Verificación y reconstrucción de los contadores desnormalizados:
+eventos.inscritos_confirmados y participantes.total_inscripciones.
+
+Uso:
+    python -m database.contadores               # solo verifica
+    python -m database.contadores --reconstruir # recalcula desde inscripciones
+"""
+import argparse
+import sys
+
+from mysql.connector import Error
+
+from database.connection import db, logger
+
+CONTEO_EVENTOS = """
+SELECT id_evento, COUNT(*) AS total
+FROM inscripciones
+WHERE estado = 'confirmado'
+GROUP BY id_evento
+"""
+
+CONTEO_PARTICIPANTES = """
+SELECT id_participante, COUNT(*) AS total
+FROM inscripciones
+GROUP BY id_participante
+"""
+
+# Subconsultas correlacionadas en lugar de UPDATE ... JOIN: funcionan igual
+# en MySQL y en SQLite
+RECONSTRUIR_EVENTOS = """
+UPDATE eventos
+SET inscritos_confirmados = (
+    SELECT COUNT(*) FROM inscripciones i
+    WHERE i.id_evento = eventos.id_evento AND i.estado = 'confirmado'
+)
+"""
+
+RECONSTRUIR_PARTICIPANTES = """
+UPDATE participantes
+SET total_inscripciones = (
+    SELECT COUNT(*) FROM inscripciones i
+    WHERE i.id_participante = participantes.id_participante
+)
+"""
+
+
+def verificar_contadores():
+    """
+    Compara los contadores guardados con un conteo completo de inscripciones.
+    Retorna la lista de diferencias (tabla, id, guardado, calculado).
+    """
+    diferencias = []
+
+    filas = db.execute_query(f"""
+        SELECT e.id_evento AS id, e.inscritos_confirmados AS guardado,
+               COALESCE(c.total, 0) AS calculado
+        FROM eventos e
+        LEFT JOIN ({CONTEO_EVENTOS}) c ON c.id_evento = e.id_evento
+        WHERE e.inscritos_confirmados <> COALESCE(c.total, 0)
+    """)
+    if filas is None:
+        raise Error(msg="No se pudieron verificar los contadores de eventos")
+    diferencias += [('eventos', f['id'], f['guardado'], f['calculado']) for f in filas]
+
+    filas = db.execute_query(f"""
+        SELECT p.id_participante AS id, p.total_inscripciones AS guardado,
+               COALESCE(c.total, 0) AS calculado
+        FROM participantes p
+        LEFT JOIN ({CONTEO_PARTICIPANTES}) c ON c.id_participante = p.id_participante
+        WHERE p.total_inscripciones <> COALESCE(c.total, 0)
+    """)
+    if filas is None:
+        raise Error(msg="No se pudieron verificar los contadores de participantes")
+    diferencias += [('participantes', f['id'], f['guardado'], f['calculado']) for f in filas]
+
+    return diferencias
+
+
+def reconstruir_contadores():
+    """Recalcula todos los contadores en una sola transacción"""
+    with db.transaction() as tx:
+        eventos = tx.execute_update(RECONSTRUIR_EVENTOS)
+        participantes = tx.execute_update(RECONSTRUIR_PARTICIPANTES)
+    logger.info(f"Contadores reconstruidos: {eventos} eventos, {participantes} participantes")
+    return eventos, participantes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o reconstruye los contadores de inscripciones")
+    parser.add_argument('--reconstruir', action='store_true',
+                        help="recalcula los contadores desde la tabla inscripciones")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.reconstruir:
+            reconstruir_contadores()
+        diferencias = verificar_contadores()
+    except Error as e:
+        logger.error(f"Error verificando contadores: {e}")
+        return 2
+
+    for tabla, id_fila, guardado, calculado in diferencias:
+        print(f"{tabla} #{id_fila}: guardado={guardado} calculado={calculado}")
+    if diferencias:
+        print(f"{len(diferencias)} contadores desincronizados")
+        return 1
+
+    print("Contadores correctos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Diario local de escrituras pendientes para trabajar sin conexión.
+
+Cuando el servidor no responde, las altas de participantes y las
+inscripciones se agregan a un archivo JSONL de solo anexado (una línea por
+operación, con fsync) en lugar de perderse. Cada operación lleva una clave
+de idempotencia (uuid) y un id provisional negativo, con el que una
+inscripción puede referirse a un participante creado sin conexión.
+database/sincronizacion.py reproduce el diario contra el servidor y anexa
+una línea de cierre por operación con su resultado.
+
+Mientras haya operaciones pendientes las escrituras nuevas también van al
+diario, para que se apliquen en el mismo orden en que se hicieron.
+
+Cuando ya no queda nada pendiente el archivo se reemplaza por una sola
+línea de cabecera con el último id provisional usado, así los ids
+provisionales no se repiten entre sesiones.
+"""
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import date, datetime
+
+from mysql.connector import InterfaceError, OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Errores del cliente MySQL que indican que el servidor no está accesible:
+# no se puede conectar, se perdió la conexión o se agotó la espera
+ERRORES_DE_CONEXION = (2003, 2005, 2006, 2013, 2055)
+
+PARTICIPANTE = 'participante'
+INSCRIPCION = 'inscripcion'
+
+_sin_conexion = threading.Event()
+
+
+def es_error_de_conexion(error):
+    """
+    Indica si el error se debe a que el servidor no está accesible. Un pool
+    sin conexiones libres no lo es: el servidor responde y basta reintentar.
+    """
+    return (isinstance(error, InterfaceError)
+            or (isinstance(error, OperationalError) and error.errno in ERRORES_DE_CONEXION)
+            or getattr(error, 'errno', None) in ERRORES_DE_CONEXION)
+
+
+def sin_conexion():
+    return _sin_conexion.is_set()
+
+
+def marcar_sin_conexion(error):
+    if not _sin_conexion.is_set():
+        logger.warning(f"Servidor no disponible, las escrituras van al diario local: {error}")
+    _sin_conexion.set()
+
+
+def marcar_con_conexion():
+    if _sin_conexion.is_set():
+        logger.info("Conexión recuperada")
+    _sin_conexion.clear()
+
+
+def _serializar(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"No se puede guardar en el diario: {type(valor).__name__}")
+
+
+class Diario:
+    """
+    Archivo JSONL con las operaciones pendientes y sus cierres.
+
+    Una línea de operación: {clave, tipo, id_provisional, datos, creado}.
+    Una línea de cierre: {clave, resultado, id, motivo}. La cabecera:
+    {ultimo_provisional}. Al abrirlo se reconstruyen las pendientes y la
+    correspondencia de ids provisionales a ids reales de las ya
+    sincronizadas.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._cargado = False
+        self._pendientes = {}
+        # id provisional -> id real (o None si la operación no se aplicó)
+        self._ids = {}
+        self._ultimo_provisional = 0
+
+    def _cargar(self):
+        if self._cargado:
+            return
+        self._cargado = True
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, encoding='utf-8') as archivo:
+            for numero, linea in enumerate(archivo, 1):
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    # Una línea cortada por un corte de luz: la operación
+                    # nunca se confirmó al usuario
+                    logger.warning(f"Diario {self.ruta}: línea {numero} incompleta, se ignora")
+                    continue
+                if 'ultimo_provisional' in registro:
+                    self._ultimo_provisional = min(self._ultimo_provisional, registro['ultimo_provisional'])
+                elif 'resultado' in registro:
+                    self._cerrar(registro)
+                else:
+                    self._pendientes[registro['clave']] = registro
+                    self._ultimo_provisional = min(self._ultimo_provisional, registro['id_provisional'])
+
+    def _cerrar(self, cierre):
+        operacion = self._pendientes.pop(cierre['clave'], None)
+        if operacion is not None:
+            self._ids[operacion['id_provisional']] = cierre.get('id')
+
+    def _anexar(self, registros):
+        with open(self.ruta, 'a', encoding='utf-8') as archivo:
+            for registro in registros:
+                archivo.write(json.dumps(registro, default=_serializar, ensure_ascii=False) + "\n")
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+    def agregar(self, tipo, datos):
+        """Anexa una operación y retorna su id provisional (negativo)"""
+        with self._lock:
+            self._cargar()
+            self._ultimo_provisional -= 1
+            operacion = {
+                'clave': str(uuid.uuid4()),
+                'tipo': tipo,
+                'id_provisional': self._ultimo_provisional,
+                'datos': datos,
+                'creado': datetime.now().isoformat(),
+            }
+            self._anexar([operacion])
+            self._pendientes[operacion['clave']] = operacion
+            return operacion['id_provisional']
+
+    def pendientes(self, limite=None):
+        """Operaciones sin cerrar, en el orden en que se hicieron"""
+        with self._lock:
+            self._cargar()
+            operaciones = list(self._pendientes.values())
+        return operaciones if limite is None else operaciones[:limite]
+
+    def hay_pendientes(self):
+        with self._lock:
+            self._cargar()
+            return bool(self._pendientes)
+
+    def id_real(self, id_registro):
+        """Id en el servidor de un id provisional ya sincronizado (None si aún no)"""
+        if id_registro is None or id_registro > 0:
+            return id_registro
+        with self._lock:
+            self._cargar()
+            return self._ids.get(id_registro)
+
+    def cerrar(self, cierres):
+        """
+        Anexa los cierres {clave, resultado, id, motivo} de operaciones ya
+        aplicadas. Si no queda nada pendiente el archivo se vacía.
+        """
+        if not cierres:
+            return
+        with self._lock:
+            self._cargar()
+            self._anexar(cierres)
+            for cierre in cierres:
+                self._cerrar(cierre)
+            if not self._pendientes:
+                self._compactar()
+
+    def _compactar(self):
+        """
+        Reemplaza el archivo por la cabecera con el último id provisional:
+        los objetos que aún tengan uno viejo no deben confundirse con uno
+        nuevo, ni en esta sesión ni en las siguientes
+        """
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(json.dumps({'ultimo_provisional': self._ultimo_provisional}) + "\n")
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.ruta)
+
+
+diario = Diario(os.environ.get('GESTOR_DIARIO', 'diario_sin_conexion.jsonl'))
+
+
+def debe_usar_diario():
+    """Las escrituras van al diario sin conexión o mientras quede algo por sincronizar"""
+    return sin_conexion() or diario.hay_pendientes()
@@ -0,0 +1,191 @@
+"""
+Resumen materializado de las estadísticas del panel principal.
+
+La tabla estadisticas tiene una sola fila (id = 1). Cada escritura
+confirmada le suma o resta su efecto mediante las notificaciones de
+database/notificaciones.py, de modo que leer el panel es una búsqueda por
+clave primaria. Los cambios que no se pueden sumar (editar un evento, o el
+paso del tiempo para eventos_proximos) se corrigen con reconciliar(), que
+recalcula todo con conteos completos; el panel lo ejecuta periódicamente.
+
+Uso:
+    python -m database.estadisticas               # compara el resumen con un conteo completo
+    python -m database.estadisticas --reconciliar # recalcula el resumen
+"""
+import argparse
+import logging
+import sys
+import threading
+from datetime import datetime
+
+from mysql.connector import Error
+
+from database.connection import db
+from database.notificaciones import suscribir
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS = ('eventos_activos', 'total_participantes', 'inscripciones_confirmadas', 'eventos_proximos')
+
+CALCULAR = """
+SELECT
+    (SELECT COUNT(*) FROM eventos WHERE estado = 'activo') AS eventos_activos,
+    (SELECT COUNT(*) FROM participantes) AS total_participantes,
+    (SELECT COUNT(*) FROM inscripciones WHERE estado = 'confirmado') AS inscripciones_confirmadas,
+    (SELECT COUNT(*) FROM eventos WHERE fecha_inicio >= NOW() AND estado = 'activo') AS eventos_proximos
+"""
+
+# REPLACE funciona igual en MySQL y SQLite
+GUARDAR = """
+REPLACE INTO estadisticas (id, eventos_activos, total_participantes, inscripciones_confirmadas, eventos_proximos)
+VALUES (1, %s, %s, %s, %s)
+"""
+
+LEER = """
+SELECT eventos_activos, total_participantes, inscripciones_confirmadas, eventos_proximos
+FROM estadisticas WHERE id = 1
+"""
+
+CREAR_TABLA = """
+CREATE TABLE IF NOT EXISTS estadisticas (
+    id TINYINT PRIMARY KEY,
+    eventos_activos INT NOT NULL DEFAULT 0,
+    total_participantes INT NOT NULL DEFAULT 0,
+    inscripciones_confirmadas INT NOT NULL DEFAULT 0,
+    eventos_proximos INT NOT NULL DEFAULT 0,
+    actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+)
+"""
+
+# Paso de migración: crea la fila inicial a partir de un conteo completo
+INICIALIZAR = f"""
+INSERT INTO estadisticas (id, eventos_activos, total_participantes, inscripciones_confirmadas, eventos_proximos)
+SELECT 1, c.eventos_activos, c.total_participantes, c.inscripciones_confirmadas, c.eventos_proximos
+FROM ({CALCULAR}) c
+ON DUPLICATE KEY UPDATE
+    eventos_activos = c.eventos_activos,
+    total_participantes = c.total_participantes,
+    inscripciones_confirmadas = c.inscripciones_confirmadas,
+    eventos_proximos = c.eventos_proximos
+"""
+
+# Se activa cuando una escritura no se puede aplicar como suma
+_reconciliacion_pendiente = threading.Event()
+# Cambia con cada suma: si cambió mientras se contaba, el conteo guardado
+# pudo haber pisado esa suma
+_generacion = 0
+_generacion_lock = threading.Lock()
+
+
+def leer():
+    """Estadísticas del panel (una fila por clave primaria); None si hay error"""
+    result = db.execute_query(LEER)
+    if result is None:
+        return None
+    if not result:
+        # Aún sin fila: se crea con un conteo completo
+        return reconciliar()
+    return result[0]
+
+
+def calcular():
+    """Estadísticas calculadas con conteos completos (no usa el resumen)"""
+    result = db.execute_query(CALCULAR)
+    return result[0] if result else None
+
+
+def reconciliar():
+    """Recalcula el resumen desde las tablas. Retorna los valores guardados o None"""
+    _reconciliacion_pendiente.clear()
+    with _generacion_lock:
+        generacion = _generacion
+    valores = calcular()
+    if valores is None or db.execute_update(GUARDAR, tuple(valores[c] for c in COLUMNAS)) is None:
+        _reconciliacion_pendiente.set()
+        return None
+    with _generacion_lock:
+        if generacion != _generacion:
+            # Una suma entre el conteo y el REPLACE se perdió: se vuelve a contar
+            _reconciliacion_pendiente.set()
+    return valores
+
+
+def reconciliacion_pendiente():
+    return _reconciliacion_pendiente.is_set()
+
+
+def _sumar(**deltas):
+    deltas = {columna: delta for columna, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    global _generacion
+    with _generacion_lock:
+        _generacion += 1
+    asignaciones = ", ".join(f"{columna} = {columna} + %s" for columna in deltas)
+    filas = db.execute_update(f"UPDATE estadisticas SET {asignaciones} WHERE id = 1", tuple(deltas.values()))
+    if not filas:
+        _reconciliacion_pendiente.set()
+
+
+def _efecto_evento(datos):
+    activo = datos.get('estado', 'activo') == 'activo'
+    fecha_inicio = datos.get('fecha_inicio')
+    proximo = activo and fecha_inicio is not None and fecha_inicio >= datetime.now()
+    return int(activo), int(proximo)
+
+
+@suscribir
+def _aplicar_escritura(tabla, accion, datos):
+    """Suma al resumen el efecto de una escritura confirmada"""
+    cantidad = datos.get('cantidad', 1)
+
+    if tabla == 'participantes':
+        if accion == 'crear':
+            _sumar(total_participantes=cantidad)
+        elif accion == 'eliminar':
+            _sumar(total_participantes=-1, inscripciones_confirmadas=-datos.get('confirmadas', 0))
+    elif tabla == 'inscripciones':
+        if accion == 'crear':
+            _sumar(inscripciones_confirmadas=cantidad)
+        elif accion == 'cancelar':
+            _sumar(inscripciones_confirmadas=-cantidad)
+    elif tabla == 'eventos' and accion in ('crear', 'eliminar'):
+        signo = 1 if accion == 'crear' else -1
+        activos, proximos = _efecto_evento(datos)
+        _sumar(eventos_activos=signo * activos, eventos_proximos=signo * proximos,
+               inscripciones_confirmadas=-datos.get('confirmadas', 0))
+    else:
+        # Editar un evento puede cambiar su estado o su fecha
+        _reconciliacion_pendiente.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o recalcula el resumen de estadísticas")
+    parser.add_argument('--reconciliar', action='store_true', help="recalcula el resumen desde las tablas")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.reconciliar and reconciliar() is None:
+            raise Error(msg="No se pudo recalcular el resumen")
+        guardado = db.execute_query(LEER)
+        calculado = calcular()
+        if guardado is None or calculado is None:
+            raise Error(msg="No se pudieron leer las estadísticas")
+    except Error as e:
+        logger.error(f"Error verificando estadísticas: {e}")
+        return 2
+
+    guardado = guardado[0] if guardado else {}
+    diferencias = [c for c in COLUMNAS if guardado.get(c) != calculado[c]]
+    for columna in COLUMNAS:
+        print(f"{columna}: guardado={guardado.get(columna)} calculado={calculado[columna]}")
+    if diferencias:
+        print(f"{len(diferencias)} valores desincronizados")
+        return 1
+
+    print("Resumen correcto")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
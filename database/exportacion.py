@@ -0,0 +1,127 @@
+"""
+Exportación de eventos, participantes e inscritos a CSV o NDJSON.
+
+Las filas se leen del servidor con un cursor sin búfer y se escriben a
+medida que llegan, así la memoria usada no depende del tamaño del listado.
+
+Uso:
+    python -m database.exportacion eventos eventos.csv
+    python -m database.exportacion participantes participantes.ndjson
+    python -m database.exportacion inscritos inscritos_5.csv --id 5
+    python -m database.exportacion eventos_participante historial.ndjson --id 12
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+from mysql.connector import Error
+
+from database.queries import EventoQueries, ParticipanteQueries, InscripcionQueries
+
+logger = logging.getLogger(__name__)
+
+# tipo: (generador de filas, requiere id)
+LISTADOS = {
+    'eventos': (lambda _: EventoQueries.iterar_todos(), False),
+    'participantes': (lambda _: ParticipanteQueries.iterar_todos(), False),
+    'inscritos': (InscripcionQueries.iterar_participantes_evento, True),
+    'eventos_participante': (InscripcionQueries.iterar_eventos_participante, True),
+}
+
+FORMATOS = ('csv', 'ndjson')
+EXTENSIONES = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.json': 'ndjson'}
+
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return str(valor)
+
+
+def escribir_csv(filas, archivo):
+    """Escribe las filas (diccionarios) en archivo; retorna cuántas escribió"""
+    escritor = None
+    total = 0
+    for fila in filas:
+        if escritor is None:
+            escritor = csv.DictWriter(archivo, fieldnames=list(fila))
+            escritor.writeheader()
+        escritor.writerow(fila)
+        total += 1
+    return total
+
+
+def escribir_ndjson(filas, archivo):
+    """Escribe un objeto JSON por línea; retorna cuántas filas escribió"""
+    total = 0
+    for fila in filas:
+        archivo.write(json.dumps(fila, default=_valor_json, ensure_ascii=False))
+        archivo.write("\n")
+        total += 1
+    return total
+
+
+def formato_de(ruta):
+    """Formato según la extensión del archivo (csv por omisión)"""
+    return EXTENSIONES.get(os.path.splitext(ruta)[1].lower(), 'csv')
+
+
+def exportar(tipo, ruta, formato=None, id_registro=None):
+    """
+    Exporta el listado tipo ('eventos', 'participantes', 'inscritos' o
+    'eventos_participante') a ruta. Los dos últimos requieren id_registro
+    (el evento o el participante). Retorna el número de filas escritas.
+    """
+    if tipo not in LISTADOS:
+        raise ValueError(f"Tipo de exportación desconocido: {tipo}")
+    iterar, requiere_id = LISTADOS[tipo]
+    if requiere_id and id_registro is None:
+        raise ValueError(f"La exportación de {tipo} requiere un id")
+
+    formato = formato or formato_de(ruta)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}")
+    escribir = escribir_csv if formato == 'csv' else escribir_ndjson
+
+    # Se escribe a un archivo temporal para no dejar una exportación a
+    # medias con el nombre final si la consulta falla
+    temporal = f"{ruta}.parcial"
+    try:
+        with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+            total = escribir(iterar(id_registro), archivo)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta listados a CSV o NDJSON")
+    parser.add_argument('tipo', choices=sorted(LISTADOS))
+    parser.add_argument('archivo', help="ruta de salida (.csv, .ndjson o .jsonl)")
+    parser.add_argument('--id', type=int, dest='id_registro',
+                        help="id del evento (inscritos) o del participante (eventos_participante)")
+    parser.add_argument('--formato', choices=FORMATOS, help="por omisión se deduce de la extensión")
+    args = parser.parse_args(argv)
+
+    try:
+        total = exportar(args.tipo, args.archivo, args.formato, args.id_registro)
+    except (Error, OSError, ValueError) as e:
+        logger.error(f"Error exportando {args.tipo}: {e}")
+        return 1
+
+    print(f"{total} filas exportadas a {args.archivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Importación masiva de participantes desde un archivo CSV.
+
+El archivo se lee fila por fila, cada fila se valida con las mismas reglas
+que el formulario (utils.validations.Validaciones) y las válidas se insertan
+por lotes: un INSERT de varias filas por lote, cada lote en su propia
+transacción. Las filas inválidas, con email repetido dentro del archivo o
+ya registrado van a un CSV de rechazos junto con el motivo.
+
+Uso:
+    python -m database.importacion alumnos.csv
+    python -m database.importacion alumnos.csv --rechazos rechazados.csv --lote 2000
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+
+from mysql.connector import Error
+
+from database.connection import db
+from database.notificaciones import notificar
+from utils.validations import Validaciones
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS = ('nombre', 'apellido', 'email', 'telefono')
+COLUMNAS_OBLIGATORIAS = ('nombre', 'apellido', 'email')
+TAMANO_LOTE = 1000
+
+INSERTAR = "INSERT INTO participantes (nombre, apellido, email, telefono) VALUES (%s, %s, %s, %s)"
+
+
+def leer_csv(ruta):
+    """
+    Genera (línea, fila) por cada registro del archivo, sin cargarlo entero.
+    Los encabezados no distinguen mayúsculas y las columnas extra se ignoran.
+    """
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        lector = csv.DictReader(archivo)
+        encabezados = {(nombre or '').strip().lower(): nombre for nombre in lector.fieldnames or []}
+        faltantes = [col for col in COLUMNAS_OBLIGATORIAS if col not in encabezados]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+
+        for registro in lector:
+            fila = {}
+            for col in COLUMNAS:
+                valor = registro.get(encabezados[col]) if col in encabezados else None
+                fila[col] = Validaciones.limpiar_texto(valor)
+            yield lector.line_num, fila
+
+
+def _lotes(filas, tamano):
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _insertar_lote(lote):
+    """
+    Inserta un lote en una transacción. Retorna la lista de (línea, fila,
+    motivo) rechazados por tener un email ya registrado.
+    """
+    emails = [fila['email'] for _, fila in lote]
+    marcadores = ', '.join(['%s'] * len(emails))
+
+    with db.transaction() as tx:
+        existentes = {
+            registro['email'].lower()
+            for registro in tx.execute_query(
+                f"SELECT email FROM participantes WHERE email IN ({marcadores})", emails)
+        }
+        nuevas = [(linea, fila) for linea, fila in lote if fila['email'].lower() not in existentes]
+        if nuevas:
+            tx.executemany(INSERTAR, [
+                (fila['nombre'], fila['apellido'], fila['email'], fila['telefono'])
+                for _, fila in nuevas
+            ])
+
+    return [(linea, fila, "El email ya está registrado")
+            for linea, fila in lote if fila['email'].lower() in existentes]
+
+
+def _ruta_rechazos(ruta):
+    base, _ = os.path.splitext(ruta)
+    return f"{base}_rechazos.csv"
+
+
+def importar_participantes(ruta, ruta_rechazos=None, tamano_lote=TAMANO_LOTE):
+    """
+    Importa los participantes del CSV en ruta. Retorna un resumen con las
+    filas leídas, insertadas y rechazadas y la ruta del archivo de rechazos.
+    """
+    ruta_rechazos = ruta_rechazos or _ruta_rechazos(ruta)
+    resumen = {'leidas': 0, 'insertadas': 0, 'rechazadas': 0, 'rechazos': ruta_rechazos}
+    vistos = set()
+
+    with open(ruta_rechazos, 'w', newline='', encoding='utf-8') as archivo_rechazos:
+        escritor = csv.writer(archivo_rechazos)
+        escritor.writerow(('linea',) + COLUMNAS + ('motivo',))
+
+        def rechazar(linea, fila, motivo):
+            escritor.writerow((linea,) + tuple(fila[col] for col in COLUMNAS) + (motivo,))
+            resumen['rechazadas'] += 1
+
+        def filas_validas():
+            for leidas in _lotes(leer_csv(ruta), tamano_lote):
+                resumen['leidas'] += len(leidas)
+                invalidas = Validaciones.validar_lote([fila for _, fila in leidas])
+                for i, (linea, fila) in enumerate(leidas):
+                    errores = list(invalidas[i].values()) if i in invalidas else None
+                    email = fila['email'].lower()
+                    if not errores and email in vistos:
+                        errores = ["Email repetido en el archivo"]
+                    if errores:
+                        rechazar(linea, fila, "; ".join(errores))
+                        continue
+                    vistos.add(email)
+                    yield linea, fila
+
+        for lote in _lotes(filas_validas(), tamano_lote):
+            try:
+                rechazadas = _insertar_lote(lote)
+            except Error as e:
+                # El lote se revirtió completo: sus filas quedan en los
+                # rechazos para poder reimportarlas
+                logger.error(f"Error importando lote de participantes: {e}")
+                rechazadas = [(linea, fila, f"Error de base de datos: {e}") for linea, fila in lote]
+            for linea, fila, motivo in rechazadas:
+                rechazar(linea, fila, motivo)
+            resumen['insertadas'] += len(lote) - len(rechazadas)
+
+    if resumen['insertadas']:
+        notificar('participantes', 'crear', cantidad=resumen['insertadas'])
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa participantes desde un CSV")
+    parser.add_argument('archivo', help="CSV con columnas nombre, apellido, email y telefono")
+    parser.add_argument('--rechazos', help="CSV donde se escriben las filas rechazadas")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="filas por INSERT")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    try:
+        resumen = importar_participantes(args.archivo, args.rechazos, args.lote)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo importar {args.archivo}: {e}")
+        return 1
+    duracion = time.perf_counter() - inicio
+
+    print(f"Leídas: {resumen['leidas']}  Insertadas: {resumen['insertadas']}  "
+          f"Rechazadas: {resumen['rechazadas']}  ({duracion:.1f}s)")
+    if resumen['rechazadas']:
+        print(f"Rechazos en {resumen['rechazos']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Migraciones versionadas del esquema de la base de datos.
+
+Cada migración se aplica una sola vez y su número queda registrado en la
+tabla schema_version. Los pasos son idempotentes porque en MySQL el DDL no
+es transaccional: si una migración falla a la mitad puede volver a
+ejecutarse sin romper lo que ya se aplicó.
+
+Uso:
+    python -m database.migraciones            # aplica las pendientes
+    python -m database.migraciones --estado   # muestra la versión actual
+"""
+import argparse
+import sys
+
+from mysql.connector import Error
+
+from database.connection import db, logger
+from database.contadores import RECONSTRUIR_EVENTOS, RECONSTRUIR_PARTICIPANTES
+from database import estadisticas, sincronizacion
+
+
+def _existe_columna(cursor, tabla, columna):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (tabla, columna))
+    return cursor.fetchone()[0] > 0
+
+
+def _existe_indice(cursor, tabla, indice):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (tabla, indice))
+    return cursor.fetchone()[0] > 0
+
+
+def agregar_columna(tabla, columna, definicion):
+    """Paso que agrega una columna solo si aún no existe"""
+    def paso(cursor):
+        if not _existe_columna(cursor, tabla, columna):
+            cursor.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}")
+    return paso
+
+
+def crear_indice(tabla, indice, columnas, tipo="INDEX"):
+    """Paso que crea un índice (INDEX, UNIQUE INDEX...) solo si aún no existe"""
+    def paso(cursor):
+        if not _existe_indice(cursor, tabla, indice):
+            cursor.execute(f"CREATE {tipo} {indice} ON {tabla} ({columnas})")
+    return paso
+
+
+ESQUEMA_BASE = [
+    """
+    CREATE TABLE IF NOT EXISTS participantes (
+        id_participante INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(100),
+        apellido VARCHAR(100),
+        email VARCHAR(100) UNIQUE,
+        telefono VARCHAR(20),
+        fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS eventos (
+        id_evento INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(150),
+        descripcion TEXT,
+        fecha_inicio DATETIME,
+        fecha_fin DATETIME,
+        ubicacion VARCHAR(150),
+        capacidad_maxima INT,
+        categoria VARCHAR(100),
+        estado VARCHAR(50) DEFAULT 'activo',
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS inscripciones (
+        id_inscripcion INT AUTO_INCREMENT PRIMARY KEY,
+        id_evento INT,
+        id_participante INT,
+        fecha_inscripcion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        estado VARCHAR(50) DEFAULT 'confirmado',
+        notas TEXT,
+        FOREIGN KEY (id_evento) REFERENCES eventos(id_evento) ON DELETE CASCADE,
+        FOREIGN KEY (id_participante) REFERENCES participantes(id_participante) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        usuario VARCHAR(50) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        rol VARCHAR(20) DEFAULT 'admin'
+    )
+    """,
+]
+
+# Antes de crear la restricción única se conserva una fila por par
+# (evento, participante): la confirmada si la hay, y si no la más antigua
+ELIMINAR_INSCRIPCIONES_DUPLICADAS = """
+DELETE i FROM inscripciones i
+JOIN inscripciones k
+  ON k.id_evento = i.id_evento
+ AND k.id_participante = i.id_participante
+ AND k.id_inscripcion <> i.id_inscripcion
+ AND (
+      (k.estado = 'confirmado' AND i.estado <> 'confirmado')
+   OR ((k.estado = 'confirmado') = (i.estado = 'confirmado') AND k.id_inscripcion < i.id_inscripcion)
+ )
+"""
+
+# (versión, descripción, pasos). Un paso es una sentencia SQL o una
+# función que recibe el cursor. Nunca se modifica una migración ya
+# publicada: los cambios nuevos van en una versión nueva.
+MIGRACIONES = [
+    (1, "Esquema base", ESQUEMA_BASE),
+    (2, "Contadores de inscripciones desnormalizados", [
+        agregar_columna("eventos", "inscritos_confirmados", "INT NOT NULL DEFAULT 0"),
+        agregar_columna("participantes", "total_inscripciones", "INT NOT NULL DEFAULT 0"),
+        RECONSTRUIR_EVENTOS,
+        RECONSTRUIR_PARTICIPANTES,
+    ]),
+    (3, "Índices de consulta y unicidad (evento, participante)", [
+        ELIMINAR_INSCRIPCIONES_DUPLICADAS,
+        # Cubre verificar_inscripcion_existe y la FK de id_evento
+        crear_indice("inscripciones", "uq_inscripciones_evento_participante",
+                     "id_evento, id_participante", tipo="UNIQUE INDEX"),
+        # Conteos y listados por evento filtrando estado
+        crear_indice("inscripciones", "idx_inscripciones_evento_estado", "id_evento, estado"),
+        # obtener_eventos_participante y la FK de id_participante
+        crear_indice("inscripciones", "idx_inscripciones_participante", "id_participante, estado"),
+        # Eventos activos / próximos (obtener_estadisticas)
+        crear_indice("eventos", "idx_eventos_estado_fecha", "estado, fecha_inicio"),
+        # Orden por fecha de inicio en los listados de eventos
+        crear_indice("eventos", "idx_eventos_fecha_inicio", "fecha_inicio"),
+        # Orden por apellido y nombre en los listados de participantes
+        crear_indice("participantes", "idx_participantes_apellido_nombre", "apellido, nombre"),
+        RECONSTRUIR_EVENTOS,
+        RECONSTRUIR_PARTICIPANTES,
+    ]),
+    (4, "Marcas de modificación y registro de eliminaciones para refresco incremental", [
+        agregar_columna("eventos", "fecha_modificacion",
+                        "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+        agregar_columna("participantes", "fecha_modificacion",
+                        "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+        crear_indice("eventos", "idx_eventos_modificacion", "fecha_modificacion"),
+        crear_indice("participantes", "idx_participantes_modificacion", "fecha_modificacion"),
+        """
+        CREATE TABLE IF NOT EXISTS registros_eliminados (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            tabla VARCHAR(50) NOT NULL,
+            id_registro INT NOT NULL,
+            fecha_eliminacion TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_eliminados_tabla_fecha (tabla, fecha_eliminacion)
+        )
+        """,
+    ]),
+    (5, "Índices FULLTEXT para la búsqueda de eventos y participantes", [
+        crear_indice("eventos", "ft_eventos_busqueda",
+                     "nombre, descripcion, ubicacion, categoria", tipo="FULLTEXT INDEX"),
+        crear_indice("participantes", "ft_participantes_busqueda",
+                     "nombre, apellido, email", tipo="FULLTEXT INDEX"),
+    ]),
+    (6, "Resumen materializado de estadísticas", [
+        estadisticas.CREAR_TABLA,
+        estadisticas.INICIALIZAR,
+    ]),
+    (7, "Claves de idempotencia de las operaciones sincronizadas desde el diario local", [
+        sincronizacion.CREAR_TABLA,
+    ]),
+    (8, "Lista de espera de los eventos llenos", [
+        # Solo las inscripciones en espera tienen posición: el índice único
+        # ordena la cola de cada evento y la promoción lee su primera entrada
+        agregar_columna("inscripciones", "posicion_espera", "INT NULL"),
+        crear_indice("inscripciones", "uq_inscripciones_espera",
+                     "id_evento, posicion_espera", tipo="UNIQUE INDEX"),
+    ]),
+    (9, "Índice de horarios por ubicación para detectar cruces", [
+        # Horarios de una ubicación y la auditoría ordenada por (ubicacion, fecha_inicio)
+        crear_indice("eventos", "idx_eventos_ubicacion_fecha", "ubicacion, fecha_inicio"),
+    ]),
+]
+
+
+def _asegurar_tabla_version(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            descripcion VARCHAR(200),
+            aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def version_actual(cursor):
+    """Retorna la versión más alta aplicada (0 si no hay ninguna)"""
+    _asegurar_tabla_version(cursor)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def aplicar_migraciones(hasta=None):
+    """
+    Aplica en orden las migraciones pendientes (hasta la versión indicada).
+    Retorna la lista de versiones aplicadas.
+    """
+    db.crear_base_datos_si_no_existe()
+    if db.dialecto != 'mysql':
+        # El backend SQLite crea el esquema completo al abrir el archivo
+        return []
+    aplicadas = []
+
+    with db.conexion() as connection:
+        cursor = connection.cursor()
+        try:
+            actual = version_actual(cursor)
+            for version, descripcion, pasos in MIGRACIONES:
+                if version <= actual or (hasta is not None and version > hasta):
+                    continue
+
+                logger.info(f"Aplicando migración {version}: {descripcion}")
+                for paso in pasos:
+                    if callable(paso):
+                        paso(cursor)
+                    else:
+                        cursor.execute(paso)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, descripcion) VALUES (%s, %s)",
+                    (version, descripcion))
+                aplicadas.append(version)
+        finally:
+            cursor.close()
+
+    return aplicadas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica las migraciones del esquema")
+    parser.add_argument('--hasta', type=int, help="versión máxima a aplicar")
+    parser.add_argument('--estado', action='store_true', help="solo muestra la versión actual")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.estado:
+            with db.conexion() as connection:
+                cursor = connection.cursor()
+                actual = version_actual(cursor)
+                cursor.close()
+            ultima = MIGRACIONES[-1][0]
+            print(f"Versión actual: {actual} (última disponible: {ultima})")
+            return 0
+
+        aplicadas = aplicar_migraciones(args.hasta)
+    except Error as e:
+        logger.error(f"Error aplicando migraciones: {e}")
+        return 1
+
+    if aplicadas:
+        print(f"Migraciones aplicadas: {', '.join(map(str, aplicadas))}")
+    else:
+        print("El esquema ya está actualizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
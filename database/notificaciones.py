@@ -0,0 +1,42 @@
+"""
+Avisos de escritura: las consultas que modifican datos notifican qué tabla y
+qué registros cambiaron, y otras capas (cachés, estadísticas) se suscriben.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_suscriptores = []
+_lock = threading.Lock()
+
+
+def suscribir(funcion):
+    """Registra funcion(tabla, accion, datos); se llama tras cada escritura confirmada"""
+    with _lock:
+        if funcion not in _suscriptores:
+            _suscriptores.append(funcion)
+    return funcion
+
+
+def cancelar_suscripcion(funcion):
+    with _lock:
+        if funcion in _suscriptores:
+            _suscriptores.remove(funcion)
+
+
+def notificar(tabla, accion, **datos):
+    """
+    Avisa a los suscriptores de una escritura ya confirmada.
+    accion es 'crear', 'actualizar' o 'eliminar'; datos lleva los ids afectados.
+    Un alta que quedó en el diario local se avisa como 'pendiente', con su id
+    provisional.
+    """
+    with _lock:
+        suscriptores = list(_suscriptores)
+    for funcion in suscriptores:
+        try:
+            funcion(tabla, accion, datos)
+        except Exception as e:
+            # Un suscriptor con errores no debe deshacer una escritura ya hecha
+            logger.error(f"Error notificando escritura en {tabla}: {e}")
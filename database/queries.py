@@ -1,25 +1,201 @@
 """
 Módulo con todas las consultas SQL del sistema
 """
+import logging
+import re
+from datetime import timedelta
+
+from mysql.connector import Error
+
+from database import estadisticas
 from database.connection import db
+from database.diario import (diario, debe_usar_diario, es_error_de_conexion, marcar_sin_conexion,
+                             PARTICIPANTE, INSCRIPCION)
+from database.notificaciones import notificar
+
+logger = logging.getLogger(__name__)
+
+# Margen con el que se relee lo modificado desde la última marca: una
+# transacción que confirma tarde conserva la marca de tiempo de su sentencia
+MARGEN_CAMBIOS = timedelta(seconds=2)
+
+# Tiempo que se conservan los registros de eliminaciones. Un cliente cuya
+# última marca es más antigua ya no puede saber qué se eliminó y recarga
+# su listado completo
+RETENCION_ELIMINADOS = timedelta(days=7)
+
+# Tamaños a los que se rellenan las listas IN (...) de las operaciones por
+# lotes: cada cantidad distinta de marcadores sería otra sentencia
+# preparada en la caché de la conexión y desalojaría a las de uso frecuente
+TAMANOS_LISTA_IN = (8, 32, 128, 1000)
+
+
+def lista_in(valores):
+    """
+    (marcadores, valores) para un IN (...) de uno de los TAMANOS_LISTA_IN:
+    la lista se rellena repitiendo su último valor, lo que no cambia el
+    resultado de la sentencia
+    """
+    valores = list(valores)
+    tamano = next((t for t in TAMANOS_LISTA_IN if t >= len(valores)), len(valores))
+    valores += [valores[-1]] * (tamano - len(valores))
+    return ', '.join(['%s'] * tamano), valores
+
+
+def _obtener_cambios(tabla, columnas, desde, dictionary=True):
+    """
+    Filas de `tabla` modificadas y ids eliminados desde la marca `desde`.
+    Retorna {'marca', 'filas', 'eliminados', 'recargar'}; con desde=None solo
+    la marca. recargar es True si `desde` es anterior a RETENCION_ELIMINADOS:
+    las eliminaciones de entonces pueden ya no estar registradas y el
+    cliente debe recargar todo.
+    """
+    result = db.execute_query("SELECT NOW(6) AS marca")
+    if not result:
+        return None
+    cambios = {'marca': result[0]['marca'], 'filas': [], 'eliminados': [], 'recargar': False}
+    if desde is None:
+        return cambios
+    if desde < cambios['marca'] - RETENCION_ELIMINADOS:
+        cambios['recargar'] = True
+        return cambios
+
+    desde = desde - MARGEN_CAMBIOS
+    filas = db.execute_query(columnas + "WHERE fecha_modificacion >= %s", (desde,), dictionary=dictionary)
+    eliminados = db.execute_query("""
+        SELECT id_registro FROM registros_eliminados
+        WHERE tabla = %s AND fecha_eliminacion >= %s
+    """, (tabla, desde))
+    if filas is None or eliminados is None:
+        return None
+    cambios['filas'] = filas
+    cambios['eliminados'] = [fila['id_registro'] for fila in eliminados]
+    return cambios
+
+
+def podar_registros_eliminados():
+    """
+    Borra los registros de eliminaciones más antiguos que
+    RETENCION_ELIMINADOS y retorna cuántos borró; None si hubo un error
+    """
+    result = db.execute_query("SELECT NOW(6) AS marca")
+    if not result:
+        return None
+    return db.execute_update("DELETE FROM registros_eliminados WHERE fecha_eliminacion < %s",
+                             (result[0]['marca'] - RETENCION_ELIMINADOS,))
+
+
+# Largo mínimo de palabra que indexa FULLTEXT en InnoDB (innodb_ft_min_token_size)
+LARGO_MINIMO_TERMINO = 3
+
+
+def expresion_busqueda(criterio):
+    """
+    Convierte el texto escrito por el usuario en una expresión MATCH ... IN
+    BOOLEAN MODE donde cada palabra es obligatoria y puede ser un prefijo
+    ("ana lop" encuentra "Ana López"). Retorna None si no queda ninguna
+    palabra indexable.
+    """
+    terminos = [t for t in re.findall(r"\w+", criterio or "") if len(t) >= LARGO_MINIMO_TERMINO]
+    if not terminos:
+        return None
+    return " ".join(f"+{termino}*" for termino in terminos)
+
+
+def _buscar(columnas, tabla, indice, id_columna, criterio, limite, despues, dictionary=True):
+    """
+    Búsqueda FULLTEXT ordenada por relevancia. Pagina por la clave
+    (relevancia, id) de la última fila ya cargada, igual que los listados.
+    """
+    expresion = expresion_busqueda(criterio)
+    if expresion is None:
+        return []
+
+    coincidencia = f"MATCH({indice}) AGAINST (%s IN BOOLEAN MODE)"
+    query = f"""
+    SELECT {columnas}, {coincidencia} AS relevancia
+    FROM {tabla}
+    WHERE {coincidencia}
+    """
+    params = [expresion, expresion]
+    if despues is not None:
+        relevancia, id_registro = despues
+        query += f"""
+      AND ({coincidencia} < %s
+           OR ({coincidencia} = %s AND {id_columna} < %s))
+        """
+        params += [expresion, relevancia, expresion, relevancia, id_registro]
+    query += f"""
+    ORDER BY relevancia DESC, {id_columna} DESC
+    LIMIT %s
+    """
+    params.append(limite)
+    return db.execute_query(query, params, dictionary=dictionary)
+
 
 class EventoQueries:
     """Consultas relacionadas con eventos"""
 
-    @staticmethod
-    def obtener_todos():
-        query = """
+    COLUMNAS_LISTADO = """
         SELECT id_evento, nombre, descripcion, fecha_inicio, fecha_fin,
                ubicacion, capacidad_maxima, categoria, estado,
-               (SELECT COUNT(*) FROM inscripciones WHERE id_evento = eventos.id_evento AND estado = 'confirmado') AS inscritos
+               inscritos_confirmados AS inscritos
         FROM eventos
-        ORDER BY fecha_inicio DESC
         """
-        return db.execute_query(query)
+    LISTADO_COMPLETO = COLUMNAS_LISTADO + "ORDER BY fecha_inicio DESC"
+
+    @staticmethod
+    def obtener_todos(dictionary=True):
+        return db.execute_query(EventoQueries.LISTADO_COMPLETO, dictionary=dictionary)
+
+    @staticmethod
+    def iterar_todos():
+        """Genera todos los eventos sin cargarlos en memoria (ver db.iterar_query)"""
+        return db.iterar_query(EventoQueries.LISTADO_COMPLETO)
+
+    @staticmethod
+    def obtener_pagina(limite=200, despues=None, dictionary=True):
+        """
+        Obtiene una página de eventos ordenados por (fecha_inicio, id_evento)
+        descendente. despues es la clave (fecha_inicio, id_evento) de la última
+        fila ya cargada; la búsqueda avanza por el índice en lugar de usar OFFSET.
+        """
+        columnas = EventoQueries.COLUMNAS_LISTADO
+        orden = """
+        ORDER BY fecha_inicio DESC, id_evento DESC
+        LIMIT %s
+        """
+        if despues is None:
+            return db.execute_query(columnas + orden, (limite,), dictionary=dictionary)
+
+        fecha_inicio, id_evento = despues
+        query = columnas + """
+        WHERE fecha_inicio < %s OR (fecha_inicio = %s AND id_evento < %s)
+        """ + orden
+        return db.execute_query(query, (fecha_inicio, fecha_inicio, id_evento, limite), dictionary=dictionary)
+
+    @staticmethod
+    def obtener_cambios(desde=None, dictionary=True):
+        """Eventos modificados y eliminados desde la marca de tiempo del servidor `desde`"""
+        return _obtener_cambios('eventos', EventoQueries.COLUMNAS_LISTADO, desde, dictionary)
+
+    @staticmethod
+    def buscar(criterio, limite=50, despues=None, dictionary=True):
+        """
+        Eventos que contienen todas las palabras de criterio (o palabras que
+        empiezan con ellas) en nombre, descripción, ubicación o categoría,
+        de mayor a menor relevancia. despues es la clave (relevancia,
+        id_evento) de la última fila de la página anterior.
+        """
+        columnas = """id_evento, nombre, descripcion, fecha_inicio, fecha_fin,
+               ubicacion, capacidad_maxima, categoria, estado,
+               inscritos_confirmados AS inscritos"""
+        return _buscar(columnas, "eventos", "nombre, descripcion, ubicacion, categoria",
+                       "id_evento", criterio, limite, despues, dictionary)
 
     @staticmethod
     def obtener_por_id(id_evento):
-        query = "SELECT * FROM eventos WHERE id_evento = %s"
+        query = "SELECT *, inscritos_confirmados AS inscritos FROM eventos WHERE id_evento = %s"
         result = db.execute_query(query, (id_evento,))
         return result[0] if result else None
 
@@ -30,10 +206,14 @@ class EventoQueries:
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         params = (nombre, descripcion, fecha_inicio, fecha_fin, ubicacion, capacidad_maxima, categoria)
-        return db.execute_update(query, params)
+        id_evento = db.execute_update(query, params)
+        if id_evento is not None:
+            notificar('eventos', 'crear', id_evento=id_evento, estado='activo', fecha_inicio=fecha_inicio)
+        return id_evento
 
     @staticmethod
     def actualizar(id_evento, nombre, descripcion, fecha_inicio, fecha_fin, ubicacion, capacidad_maxima, categoria, estado):
+        """Actualiza el evento; si ahora tiene cupos libres se confirma a los primeros en espera"""
         query = """
         UPDATE eventos
         SET nombre = %s, descripcion = %s, fecha_inicio = %s, fecha_fin = %s,
@@ -41,40 +221,154 @@ class EventoQueries:
         WHERE id_evento = %s
         """
         params = (nombre, descripcion, fecha_inicio, fecha_fin, ubicacion, capacidad_maxima, categoria, estado, id_evento)
-        return db.execute_update(query, params)
+        try:
+            with db.transaction() as tx:
+                result = tx.execute_update(query, params)
+                promovidos = InscripcionQueries._promover_lista_espera(tx, id_evento)
+        except Error as e:
+            logger.error(f"Error actualizando evento: {e}")
+            return None
+        notificar('eventos', 'actualizar', id_evento=id_evento)
+        InscripcionQueries._notificar_promovidos(id_evento, promovidos)
+        return result
 
     @staticmethod
     def eliminar(id_evento):
-        query = "DELETE FROM eventos WHERE id_evento = %s"
-        return db.execute_update(query, (id_evento,))
+        """Elimina el evento y descuenta sus inscripciones de cada participante"""
+        try:
+            with db.transaction() as tx:
+                evento = tx.execute_query("""
+                SELECT estado, fecha_inicio, inscritos_confirmados FROM eventos
+                WHERE id_evento = %s
+                FOR UPDATE
+                """, (id_evento,))
+                # La restricción única deja a lo sumo una inscripción por participante
+                tx.execute_update("""
+                UPDATE participantes
+                SET total_inscripciones = total_inscripciones - 1
+                WHERE id_participante IN (SELECT id_participante FROM inscripciones WHERE id_evento = %s)
+                """, (id_evento,))
+                eliminados = tx.execute_update("DELETE FROM eventos WHERE id_evento = %s", (id_evento,))
+                # Un id inexistente o ya eliminado no deja registro: el refresco
+                # incremental no debe procesar eliminaciones que no ocurrieron
+                if eliminados:
+                    tx.execute_update(
+                        "INSERT INTO registros_eliminados (tabla, id_registro) VALUES ('eventos', %s)",
+                        (id_evento,))
+        except Error as e:
+            logger.error(f"Error eliminando evento: {e}")
+            return None
+        if eliminados:
+            evento = evento[0]
+            notificar('eventos', 'eliminar', id_evento=id_evento, estado=evento['estado'],
+                      fecha_inicio=evento['fecha_inicio'], confirmadas=evento['inscritos_confirmados'])
+        return eliminados
 
 class ParticipanteQueries:
     """Consultas relacionadas con participantes"""
 
-    @staticmethod
-    def obtener_todos():
-        query = """
+    COLUMNAS_LISTADO = """
         SELECT id_participante, nombre, apellido, email, telefono, fecha_registro,
-               (SELECT COUNT(*) FROM inscripciones WHERE id_participante = participantes.id_participante) AS total_eventos
+               total_inscripciones AS total_eventos
         FROM participantes
-        ORDER BY apellido, nombre
         """
-        return db.execute_query(query)
+    LISTADO_COMPLETO = COLUMNAS_LISTADO + "ORDER BY apellido, nombre"
+
+    @staticmethod
+    def obtener_todos(dictionary=True):
+        return db.execute_query(ParticipanteQueries.LISTADO_COMPLETO, dictionary=dictionary)
+
+    @staticmethod
+    def iterar_todos():
+        """Genera todos los participantes sin cargarlos en memoria (ver db.iterar_query)"""
+        return db.iterar_query(ParticipanteQueries.LISTADO_COMPLETO)
+
+    @staticmethod
+    def obtener_pagina(limite=200, despues=None, dictionary=True):
+        """
+        Obtiene una página de participantes ordenados por
+        (apellido, nombre, id_participante). despues es la clave de la última
+        fila ya cargada.
+        """
+        columnas = ParticipanteQueries.COLUMNAS_LISTADO
+        orden = """
+        ORDER BY apellido, nombre, id_participante
+        LIMIT %s
+        """
+        if despues is None:
+            return db.execute_query(columnas + orden, (limite,), dictionary=dictionary)
+
+        apellido, nombre, id_participante = despues
+        query = columnas + """
+        WHERE apellido > %s
+           OR (apellido = %s AND nombre > %s)
+           OR (apellido = %s AND nombre = %s AND id_participante > %s)
+        """ + orden
+        params = (apellido, apellido, nombre, apellido, nombre, id_participante, limite)
+        return db.execute_query(query, params, dictionary=dictionary)
+
+    @staticmethod
+    def obtener_cambios(desde=None, dictionary=True):
+        """Participantes modificados y eliminados desde la marca de tiempo del servidor `desde`"""
+        return _obtener_cambios('participantes', ParticipanteQueries.COLUMNAS_LISTADO, desde, dictionary)
+
+    @staticmethod
+    def buscar(criterio, limite=50, despues=None, dictionary=True):
+        """
+        Participantes cuyo nombre, apellido o email contienen todas las
+        palabras de criterio, de mayor a menor relevancia. despues es la
+        clave (relevancia, id_participante) de la última fila ya cargada.
+        """
+        columnas = """id_participante, nombre, apellido, email, telefono, fecha_registro,
+               total_inscripciones AS total_eventos"""
+        return _buscar(columnas, "participantes", "nombre, apellido, email",
+                       "id_participante", criterio, limite, despues, dictionary)
 
     @staticmethod
     def obtener_por_id(id_participante):
-        query = "SELECT * FROM participantes WHERE id_participante = %s"
+        query = "SELECT *, total_inscripciones AS total_eventos FROM participantes WHERE id_participante = %s"
         result = db.execute_query(query, (id_participante,))
         return result[0] if result else None
 
     @staticmethod
     def crear(nombre, apellido, email, telefono):
+        """
+        Crea el participante y retorna su id. Si el servidor no está
+        accesible queda en el diario local (database/diario.py) y se retorna
+        un id provisional negativo; None si ocurre otro error.
+        """
+        datos = {'nombre': nombre, 'apellido': apellido, 'email': email, 'telefono': telefono}
+        if debe_usar_diario():
+            return ParticipanteQueries._crear_sin_conexion(datos)
+
         query = """
         INSERT INTO participantes (nombre, apellido, email, telefono)
         VALUES (%s, %s, %s, %s)
         """
         params = (nombre, apellido, email, telefono)
-        return db.execute_update(query, params)
+        try:
+            with db.conexion() as connection:
+                id_participante = db.sentencias(connection).execute(query, params).lastrowid
+        except Error as e:
+            if es_error_de_conexion(e):
+                marcar_sin_conexion(e)
+                return ParticipanteQueries._crear_sin_conexion(datos)
+            logger.error(f"Error creando participante: {e}")
+            return None
+        if id_participante is not None:
+            notificar('participantes', 'crear', id_participante=id_participante,
+                      nombre=nombre, apellido=apellido, email=email)
+        return id_participante
+
+    @staticmethod
+    def _crear_sin_conexion(datos):
+        """Anexa el alta al diario y retorna su id provisional"""
+        id_provisional = diario.agregar(PARTICIPANTE, datos)
+        # 'pendiente' y no 'crear': el índice de búsqueda lo agrega para que se
+        # pueda inscribir antes de sincronizar, pero las estadísticas esperan
+        # al 'crear' de la sincronización
+        notificar('participantes', 'pendiente', id_participante=id_provisional, **datos)
+        return id_provisional
 
     @staticmethod
     def actualizar(id_participante, nombre, apellido, email, telefono):
@@ -84,37 +378,426 @@ class ParticipanteQueries:
         WHERE id_participante = %s
         """
         params = (nombre, apellido, email, telefono, id_participante)
-        return db.execute_update(query, params)
+        result = db.execute_update(query, params)
+        if result is not None:
+            notificar('participantes', 'actualizar', id_participante=id_participante,
+                      nombre=nombre, apellido=apellido, email=email)
+        return result
 
     @staticmethod
     def eliminar(id_participante):
-        query = "DELETE FROM participantes WHERE id_participante = %s"
-        return db.execute_update(query, (id_participante,))
+        """Elimina el participante y libera sus cupos confirmados en cada evento"""
+        try:
+            with db.transaction() as tx:
+                eventos = [fila['id_evento'] for fila in tx.execute_query("""
+                SELECT id_evento FROM inscripciones
+                WHERE id_participante = %s AND estado = 'confirmado'
+                """, (id_participante,))]
+                tx.execute_update("""
+                UPDATE eventos
+                SET inscritos_confirmados = inscritos_confirmados - 1
+                WHERE id_evento IN (SELECT id_evento FROM inscripciones
+                                    WHERE id_participante = %s AND estado = 'confirmado')
+                """, (id_participante,))
+                eliminados = tx.execute_update("DELETE FROM participantes WHERE id_participante = %s", (id_participante,))
+                if eliminados:
+                    tx.execute_update(
+                        "INSERT INTO registros_eliminados (tabla, id_registro) VALUES ('participantes', %s)",
+                        (id_participante,))
+                # Cada cupo liberado pasa al primero en espera de su evento
+                promovidos = {id_evento: InscripcionQueries._promover_lista_espera(tx, id_evento)
+                              for id_evento in eventos}
+        except Error as e:
+            logger.error(f"Error eliminando participante: {e}")
+            return None
+        if eliminados:
+            notificar('participantes', 'eliminar', id_participante=id_participante, confirmadas=len(eventos))
+            for id_evento, ids in promovidos.items():
+                InscripcionQueries._notificar_promovidos(id_evento, ids)
+        return eliminados
 
 class InscripcionQueries:
     """Consultas relacionadas con inscripciones"""
 
+    # Resultados de inscribir()
+    INSCRITO = 'inscrito'
+    # Sin cupo: quedó en la lista de espera (estado 'en_espera')
+    EN_ESPERA = 'en_espera'
+    # Guardada en el diario local, se aplicará al sincronizar
+    PENDIENTE = 'pendiente'
+    LLENO = 'lleno'
+    DUPLICADO = 'duplicado'
+    NO_DISPONIBLE = 'no_disponible'
+    NO_ENCONTRADO = 'no_encontrado'
+
+    # Parámetros por sentencia en las operaciones por lotes
+    TAMANO_LOTE = 1000
+
+    # Un interbloqueo o una espera de lock agotada revierten la transacción
+    # completa, así que es seguro reintentarla
+    ERRORES_REINTENTABLES = (1205, 1213)
+    REINTENTOS = 3
+
     @staticmethod
-    def inscribir_participante(id_evento, id_participante, notas=""):
-        query = """
-        INSERT INTO inscripciones (id_evento, id_participante, notas)
-        VALUES (%s, %s, %s)
+    def inscribir(id_evento, id_participante, notas="", lista_espera=True):
+        """
+        Inscribe al participante verificando cupo y duplicados en una sola
+        transacción. Retorna (resultado, id_inscripcion), donde resultado es
+        INSCRITO, EN_ESPERA (evento lleno: queda al final de la lista de
+        espera), DUPLICADO (también si ya está en espera) o NO_DISPONIBLE
+        (evento inexistente o no activo), NO_ENCONTRADO (sin participante);
+        None si ocurre un error. Con lista_espera=False un evento lleno
+        retorna LLENO.
+
+        Si el servidor no está accesible la inscripción va al diario local y
+        se retorna (PENDIENTE, id provisional negativo); cupo y duplicados se
+        verifican al sincronizar.
+
+        La fila del evento se bloquea con SELECT ... FOR UPDATE: las
+        inscripciones simultáneas al mismo evento se ordenan entre sí, pero
+        las de eventos distintos no se esperan.
         """
-        params = (id_evento, id_participante, notas)
-        return db.execute_update(query, params)
+        if id_participante is None:
+            return InscripcionQueries.NO_ENCONTRADO, None
+        datos = {'id_evento': id_evento, 'id_participante': id_participante, 'notas': notas,
+                 'lista_espera': lista_espera}
+        if debe_usar_diario():
+            return InscripcionQueries.PENDIENTE, diario.agregar(INSCRIPCION, datos)
+        if id_participante < 0:
+            # Participante creado sin conexión y ya sincronizado
+            id_participante = diario.id_real(id_participante)
+            if id_participante is None:
+                return InscripcionQueries.NO_ENCONTRADO, None
+
+        for intento in range(1, InscripcionQueries.REINTENTOS + 1):
+            try:
+                resultado = InscripcionQueries._inscribir(id_evento, id_participante, notas, lista_espera)
+                break
+            except Error as e:
+                if es_error_de_conexion(e):
+                    marcar_sin_conexion(e)
+                    return InscripcionQueries.PENDIENTE, diario.agregar(INSCRIPCION, datos)
+                if e.errno in InscripcionQueries.ERRORES_REINTENTABLES and intento < InscripcionQueries.REINTENTOS:
+                    logger.warning(f"Reintentando inscripción tras conflicto de bloqueo: {e}")
+                    continue
+                logger.error(f"Error inscribiendo participante: {e}")
+                return None
+
+        if resultado[0] == InscripcionQueries.INSCRITO:
+            notificar('inscripciones', 'crear', id_evento=id_evento, id_participante=id_participante)
+        elif resultado[0] == InscripcionQueries.EN_ESPERA:
+            notificar('inscripciones', 'espera', id_evento=id_evento, id_participante=id_participante)
+        return resultado
 
     @staticmethod
-    def cancelar_inscripcion(id_evento, id_participante):
-        query = """
-        UPDATE inscripciones
-        SET estado = 'cancelado'
-        WHERE id_evento = %s AND id_participante = %s
+    def _inscribir(id_evento, id_participante, notas, lista_espera=True):
+        with db.transaction() as tx:
+            evento = tx.execute_query("""
+            SELECT capacidad_maxima, inscritos_confirmados, estado
+            FROM eventos WHERE id_evento = %s
+            FOR UPDATE
+            """, (id_evento,))
+            if not evento or evento[0]['estado'] != 'activo':
+                return InscripcionQueries.NO_DISPONIBLE, None
+            evento = evento[0]
+
+            existente = tx.execute_query("""
+            SELECT id_inscripcion, estado FROM inscripciones
+            WHERE id_evento = %s AND id_participante = %s
+            FOR UPDATE
+            """, (id_evento, id_participante))
+            if existente and existente[0]['estado'] != 'cancelado':
+                return InscripcionQueries.DUPLICADO, existente[0]['id_inscripcion']
+
+            lleno = (evento['capacidad_maxima'] is not None
+                     and evento['inscritos_confirmados'] >= evento['capacidad_maxima'])
+            if lleno and not lista_espera:
+                return InscripcionQueries.LLENO, None
+            estado, posicion = 'confirmado', None
+            if lleno:
+                estado, posicion = 'en_espera', InscripcionQueries._siguiente_posicion(tx, id_evento)
+
+            if existente:
+                # La restricción única (evento, participante) impide una segunda
+                # fila: una inscripción cancelada se reactiva en lugar de duplicarse
+                id_inscripcion = existente[0]['id_inscripcion']
+                tx.execute_update("""
+                UPDATE inscripciones
+                SET estado = %s, posicion_espera = %s, notas = %s, fecha_inscripcion = CURRENT_TIMESTAMP
+                WHERE id_inscripcion = %s
+                """, (estado, posicion, notas, id_inscripcion))
+            else:
+                id_inscripcion = tx.execute_update("""
+                INSERT INTO inscripciones (id_evento, id_participante, estado, posicion_espera, notas)
+                VALUES (%s, %s, %s, %s, %s)
+                """, (id_evento, id_participante, estado, posicion, notas))
+                tx.execute_update(
+                    "UPDATE participantes SET total_inscripciones = total_inscripciones + 1 WHERE id_participante = %s",
+                    (id_participante,))
+
+            if lleno:
+                return InscripcionQueries.EN_ESPERA, id_inscripcion
+            tx.execute_update(
+                "UPDATE eventos SET inscritos_confirmados = inscritos_confirmados + 1 WHERE id_evento = %s",
+                (id_evento,))
+            return InscripcionQueries.INSCRITO, id_inscripcion
+
+    @staticmethod
+    def inscribir_lote(id_evento, ids_participantes, notas="", lista_espera=True):
+        """
+        Inscribe una lista de participantes en un evento en una sola
+        transacción. Retorna {id_participante: resultado} con INSCRITO,
+        EN_ESPERA (LLENO si lista_espera=False), DUPLICADO, NO_ENCONTRADO
+        (participante inexistente) o NO_DISPONIBLE; None si ocurre un error.
+
+        Los cupos se asignan en el orden recibido hasta agotar la capacidad
+        restante del evento, cuya fila queda bloqueada durante la operación;
+        el resto pasa a la lista de espera en ese mismo orden.
         """
-        return db.execute_update(query, (id_evento, id_participante))
+        ids = list(dict.fromkeys(ids_participantes))
+        if not ids:
+            return {}
+        try:
+            with db.transaction() as tx:
+                resultados = InscripcionQueries._inscribir_lote(tx, id_evento, ids, notas, lista_espera)
+        except Error as e:
+            logger.error(f"Error inscribiendo lote de participantes: {e}")
+            return None
+
+        if InscripcionQueries.INSCRITO in resultados.values():
+            # Cambian los contadores de muchos participantes a la vez
+            notificar('inscripciones', 'crear', id_evento=id_evento,
+                      cantidad=list(resultados.values()).count(InscripcionQueries.INSCRITO))
+        if InscripcionQueries.EN_ESPERA in resultados.values():
+            notificar('inscripciones', 'espera', id_evento=id_evento,
+                      cantidad=list(resultados.values()).count(InscripcionQueries.EN_ESPERA))
+        return resultados
 
     @staticmethod
-    def obtener_participantes_evento(id_evento):
+    def _inscribir_lote(tx, id_evento, ids, notas, lista_espera=True):
+        evento = tx.execute_query("""
+        SELECT capacidad_maxima, inscritos_confirmados, estado
+        FROM eventos WHERE id_evento = %s
+        FOR UPDATE
+        """, (id_evento,))
+        if not evento or evento[0]['estado'] != 'activo':
+            return {id_participante: InscripcionQueries.NO_DISPONIBLE for id_participante in ids}
+        evento = evento[0]
+
+        tamano = InscripcionQueries.TAMANO_LOTE
+        lotes = [ids[i:i + tamano] for i in range(0, len(ids), tamano)]
+
+        existentes = set()
+        inscripciones = {}
+        for lote in lotes:
+            marcadores, lote = lista_in(lote)
+            existentes.update(fila['id_participante'] for fila in tx.execute_query(
+                f"SELECT id_participante FROM participantes WHERE id_participante IN ({marcadores})", lote))
+            for fila in tx.execute_query(f"""
+            SELECT id_participante, id_inscripcion, estado FROM inscripciones
+            WHERE id_evento = %s AND id_participante IN ({marcadores})
+            FOR UPDATE
+            """, [id_evento] + lote):
+                inscripciones[fila['id_participante']] = fila
+
+        capacidad = evento['capacidad_maxima']
+        cupos = None if capacidad is None else max(0, capacidad - evento['inscritos_confirmados'])
+
+        resultados = {}
+        reactivar = []
+        insertar = []
+        # (id_inscripcion o id_participante, posición) de los que quedan en espera
+        reactivar_espera = []
+        insertar_espera = []
+        posicion = None
+        for id_participante in ids:
+            inscripcion = inscripciones.get(id_participante)
+            if id_participante not in existentes:
+                resultados[id_participante] = InscripcionQueries.NO_ENCONTRADO
+            elif inscripcion and inscripcion['estado'] != 'cancelado':
+                resultados[id_participante] = InscripcionQueries.DUPLICADO
+            elif cupos == 0 and not lista_espera:
+                resultados[id_participante] = InscripcionQueries.LLENO
+            elif cupos == 0:
+                resultados[id_participante] = InscripcionQueries.EN_ESPERA
+                if posicion is None:
+                    posicion = InscripcionQueries._siguiente_posicion(tx, id_evento)
+                else:
+                    posicion += 1
+                if inscripcion:
+                    reactivar_espera.append((posicion, notas, inscripcion['id_inscripcion']))
+                else:
+                    insertar_espera.append((id_evento, id_participante, posicion, notas))
+            else:
+                resultados[id_participante] = InscripcionQueries.INSCRITO
+                if inscripcion:
+                    reactivar.append(inscripcion['id_inscripcion'])
+                else:
+                    insertar.append(id_participante)
+                if cupos is not None:
+                    cupos -= 1
+
+        for i in range(0, len(reactivar), tamano):
+            marcadores, lote = lista_in(reactivar[i:i + tamano])
+            tx.execute_update(f"""
+            UPDATE inscripciones
+            SET estado = 'confirmado', notas = %s, fecha_inscripcion = CURRENT_TIMESTAMP
+            WHERE id_inscripcion IN ({marcadores})
+            """, [notas] + lote)
+
+        for i in range(0, len(insertar), tamano):
+            lote = insertar[i:i + tamano]
+            tx.executemany(
+                "INSERT INTO inscripciones (id_evento, id_participante, notas) VALUES (%s, %s, %s)",
+                [(id_evento, id_participante, notas) for id_participante in lote])
+            marcadores, lote = lista_in(lote)
+            tx.execute_update(
+                f"UPDATE participantes SET total_inscripciones = total_inscripciones + 1 WHERE id_participante IN ({marcadores})",
+                lote)
+
+        for i in range(0, len(reactivar_espera), tamano):
+            tx.executemany("""
+            UPDATE inscripciones
+            SET estado = 'en_espera', posicion_espera = %s, notas = %s, fecha_inscripcion = CURRENT_TIMESTAMP
+            WHERE id_inscripcion = %s
+            """, reactivar_espera[i:i + tamano])
+
+        for i in range(0, len(insertar_espera), tamano):
+            lote = insertar_espera[i:i + tamano]
+            tx.executemany("""
+            INSERT INTO inscripciones (id_evento, id_participante, estado, posicion_espera, notas)
+            VALUES (%s, %s, 'en_espera', %s, %s)
+            """, lote)
+            marcadores, ids_lote = lista_in([fila[1] for fila in lote])
+            tx.execute_update(
+                f"UPDATE participantes SET total_inscripciones = total_inscripciones + 1 WHERE id_participante IN ({marcadores})",
+                ids_lote)
+
+        if reactivar or insertar:
+            tx.execute_update(
+                "UPDATE eventos SET inscritos_confirmados = inscritos_confirmados + %s WHERE id_evento = %s",
+                (len(reactivar) + len(insertar), id_evento))
+        return resultados
+
+    @staticmethod
+    def _siguiente_posicion(tx, id_evento):
+        """
+        Posición al final de la lista de espera. El llamador tiene bloqueada
+        la fila del evento, así que dos inscripciones no reciben la misma.
+        """
+        ultima = tx.execute_query(
+            "SELECT MAX(posicion_espera) AS ultima FROM inscripciones WHERE id_evento = %s",
+            (id_evento,))[0]['ultima']
+        return (ultima or 0) + 1
+
+    @staticmethod
+    def _promover_lista_espera(tx, id_evento):
+        """
+        Confirma, en orden, a los primeros de la lista de espera mientras el
+        evento tenga cupos libres. Bloquea la fila del evento (el llamador
+        puede tenerla bloqueada ya). Retorna los id_participante promovidos.
+
+        Las posiciones en espera son las únicas no nulas de la columna, así
+        que el índice (id_evento, posicion_espera) entrega al primero sin
+        recorrer la lista.
+        """
+        evento = tx.execute_query("""
+        SELECT capacidad_maxima, inscritos_confirmados, estado
+        FROM eventos WHERE id_evento = %s
+        FOR UPDATE
+        """, (id_evento,))
+        if not evento or evento[0]['estado'] != 'activo':
+            return []
+        evento = evento[0]
+
         query = """
+        SELECT id_inscripcion, id_participante FROM inscripciones
+        WHERE id_evento = %s AND posicion_espera IS NOT NULL
+        ORDER BY posicion_espera
+        """
+        params = [id_evento]
+        if evento['capacidad_maxima'] is not None:
+            cupos = evento['capacidad_maxima'] - evento['inscritos_confirmados']
+            if cupos <= 0:
+                return []
+            query += " LIMIT %s"
+            params.append(cupos)
+        siguientes = tx.execute_query(query + " FOR UPDATE", params)
+        if not siguientes:
+            return []
+
+        ids_inscripciones = [fila['id_inscripcion'] for fila in siguientes]
+        tamano = InscripcionQueries.TAMANO_LOTE
+        for i in range(0, len(ids_inscripciones), tamano):
+            marcadores, lote = lista_in(ids_inscripciones[i:i + tamano])
+            tx.execute_update(f"""
+            UPDATE inscripciones
+            SET estado = 'confirmado', posicion_espera = NULL
+            WHERE id_inscripcion IN ({marcadores})
+            """, lote)
+        tx.execute_update(
+            "UPDATE eventos SET inscritos_confirmados = inscritos_confirmados + %s WHERE id_evento = %s",
+            (len(siguientes), id_evento))
+        return [fila['id_participante'] for fila in siguientes]
+
+    @staticmethod
+    def _notificar_promovidos(id_evento, promovidos):
+        for id_participante in promovidos:
+            notificar('inscripciones', 'crear', id_evento=id_evento, id_participante=id_participante)
+
+    @staticmethod
+    def inscribir_participante(id_evento, id_participante, notas=""):
+        """
+        Inscribe y retorna el id de la inscripción (provisional y negativo si
+        quedó en el diario local); None si no se pudo (ver inscribir()). Un
+        evento lleno no deja al participante en la lista de espera.
+        """
+        resultado = InscripcionQueries.inscribir(id_evento, id_participante, notas, lista_espera=False)
+        if resultado and resultado[0] in (InscripcionQueries.INSCRITO, InscripcionQueries.PENDIENTE):
+            return resultado[1]
+        return None
+
+    @staticmethod
+    def cancelar_inscripcion(id_evento, id_participante):
+        """
+        Cancela la inscripción confirmada o en espera del participante. Un
+        cupo confirmado que se libera pasa, en la misma transacción, al
+        primero de la lista de espera. Retorna la cantidad de inscripciones
+        canceladas (0 o 1); None si ocurre un error.
+        """
+        promovidos = []
+        try:
+            with db.transaction() as tx:
+                # Mismo orden de bloqueo que inscribir(): primero el evento
+                tx.execute_query("SELECT id_evento FROM eventos WHERE id_evento = %s FOR UPDATE", (id_evento,))
+                inscripcion = tx.execute_query("""
+                SELECT id_inscripcion, estado FROM inscripciones
+                WHERE id_evento = %s AND id_participante = %s
+                FOR UPDATE
+                """, (id_evento, id_participante))
+                if not inscripcion or inscripcion[0]['estado'] not in ('confirmado', 'en_espera'):
+                    return 0
+                inscripcion = inscripcion[0]
+                tx.execute_update("""
+                UPDATE inscripciones
+                SET estado = 'cancelado', posicion_espera = NULL
+                WHERE id_inscripcion = %s
+                """, (inscripcion['id_inscripcion'],))
+                confirmada = inscripcion['estado'] == 'confirmado'
+                if confirmada:
+                    tx.execute_update(
+                        "UPDATE eventos SET inscritos_confirmados = inscritos_confirmados - 1 WHERE id_evento = %s",
+                        (id_evento,))
+                    promovidos = InscripcionQueries._promover_lista_espera(tx, id_evento)
+        except Error as e:
+            logger.error(f"Error cancelando inscripción: {e}")
+            return None
+        notificar('inscripciones', 'cancelar', id_evento=id_evento, id_participante=id_participante,
+                  cantidad=int(confirmada))
+        InscripcionQueries._notificar_promovidos(id_evento, promovidos)
+        return 1
+
+    PARTICIPANTES_EVENTO = """
         SELECT p.id_participante, p.nombre, p.apellido, p.email, p.telefono,
                i.fecha_inscripcion, i.estado, i.notas
         FROM participantes p
@@ -122,11 +805,8 @@ class InscripcionQueries:
         WHERE i.id_evento = %s
         ORDER BY i.fecha_inscripcion DESC
         """
-        return db.execute_query(query, (id_evento,))
 
-    @staticmethod
-    def obtener_eventos_participante(id_participante):
-        query = """
+    EVENTOS_PARTICIPANTE = """
         SELECT e.id_evento, e.nombre, e.descripcion, e.fecha_inicio, e.fecha_fin,
                e.ubicacion, e.categoria, i.fecha_inscripcion, i.estado, i.notas
         FROM eventos e
@@ -134,7 +814,56 @@ class InscripcionQueries:
         WHERE i.id_participante = %s
         ORDER BY e.fecha_inicio DESC
         """
-        return db.execute_query(query, (id_participante,))
+
+    @staticmethod
+    def obtener_participantes_evento(id_evento):
+        return db.execute_query(InscripcionQueries.PARTICIPANTES_EVENTO, (id_evento,))
+
+    @staticmethod
+    def iterar_participantes_evento(id_evento):
+        """Genera los inscritos de un evento sin cargarlos en memoria"""
+        return db.iterar_query(InscripcionQueries.PARTICIPANTES_EVENTO, (id_evento,))
+
+    @staticmethod
+    def obtener_eventos_participante(id_participante):
+        return db.execute_query(InscripcionQueries.EVENTOS_PARTICIPANTE, (id_participante,))
+
+    @staticmethod
+    def iterar_eventos_participante(id_participante):
+        """Genera los eventos de un participante sin cargarlos en memoria"""
+        return db.iterar_query(InscripcionQueries.EVENTOS_PARTICIPANTE, (id_participante,))
+
+    @staticmethod
+    def obtener_lista_espera(id_evento):
+        """Participantes en espera de un evento, en el orden en que se promoverán"""
+        return db.execute_query("""
+        SELECT p.id_participante, p.nombre, p.apellido, p.email,
+               i.posicion_espera, i.fecha_inscripcion
+        FROM inscripciones i
+        JOIN participantes p ON p.id_participante = i.id_participante
+        WHERE i.id_evento = %s AND i.posicion_espera IS NOT NULL
+        ORDER BY i.posicion_espera
+        """, (id_evento,))
+
+    @staticmethod
+    def posicion_en_espera(id_evento, id_participante):
+        """
+        Lugar (1 = el siguiente) del participante en la lista de espera;
+        None si no está en espera. Cuenta quienes esperan con una posición
+        guardada hasta la suya: un rango del índice (id_evento,
+        posicion_espera) que no depende de los huecos que dejan quienes salen
+        de la lista.
+        """
+        result = db.execute_query("""
+        SELECT COUNT(*) AS posicion
+        FROM inscripciones
+        WHERE id_evento = %s AND posicion_espera <= (
+            SELECT posicion_espera FROM inscripciones WHERE id_evento = %s AND id_participante = %s
+        )
+        """, (id_evento, id_evento, id_participante))
+        if not result or not result[0]['posicion']:
+            return None
+        return result[0]['posicion']
 
     @staticmethod
     def verificar_inscripcion_existe(id_evento, id_participante):
@@ -148,13 +877,5 @@ class InscripcionQueries:
         return result[0]['count'] > 0 if result else False
     @staticmethod
     def obtener_estadisticas():
-        """Obtiene estadísticas generales del sistema"""
-        query = """
-        SELECT 
-            (SELECT COUNT(*) FROM eventos WHERE estado = 'activo') AS eventos_activos,
-            (SELECT COUNT(*) FROM participantes) AS total_participantes,
-            (SELECT COUNT(*) FROM inscripciones WHERE estado = 'confirmado') AS inscripciones_confirmadas,
-            (SELECT COUNT(*) FROM eventos WHERE fecha_inicio >= NOW() AND estado = 'activo') AS eventos_proximos
-        """
-        result = db.execute_query(query)
-        return result[0] if result else None
+        """Obtiene estadísticas generales del sistema (del resumen materializado)"""
+        return estadisticas.leer()
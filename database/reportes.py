@@ -0,0 +1,225 @@
+"""
+Reportes de ocupación, velocidad de inscripción y cancelaciones.
+
+Los eventos y las inscripciones del período se leen una sola vez y se
+guardan por columnas en arreglos compactos (array del módulo estándar).
+Con NumPy instalado los agregados se calculan de forma vectorizada sobre
+esos mismos buffers sin copiarlos; sin NumPy se recorren los arreglos en
+Python, con el mismo resultado.
+
+Uso:
+    python -m database.reportes --desde 2025-01-01 --hasta 2026-01-01
+"""
+import argparse
+import logging
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+
+from mysql.connector import Error
+
+from database.connection import db
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# TO_DAYS(fecha) de MySQL cuenta días desde el año 0: date.toordinal() + 365
+DESFASE_TO_DAYS = 365
+
+CONSULTA_EVENTOS = """
+SELECT id_evento, categoria, ubicacion, capacidad_maxima, inscritos_confirmados
+FROM eventos
+WHERE fecha_inicio >= %s AND fecha_inicio < %s
+ORDER BY id_evento
+"""
+
+# Sin diccionarios y con la fecha como entero: son millones de filas
+CONSULTA_INSCRIPCIONES = """
+SELECT i.id_evento, TO_DAYS(i.fecha_inscripcion), i.estado <=> 'cancelado'
+FROM inscripciones i
+JOIN eventos e ON e.id_evento = i.id_evento
+WHERE e.fecha_inicio >= %s AND e.fecha_inicio < %s
+"""
+
+
+class Columnas:
+    """Eventos e inscripciones del período guardados por columnas"""
+
+    def __init__(self):
+        self.categorias = []
+        self.ubicaciones = []
+        # Eventos, ordenados por id
+        self.evento_id = array('q')
+        self.evento_categoria = array('q')
+        self.evento_ubicacion = array('q')
+        self.evento_capacidad = array('q')
+        self.evento_inscritos = array('q')
+        # Inscripciones (con la categoría de su evento)
+        self.inscripcion_categoria = array('q')
+        self.inscripcion_dia = array('q')
+        self.inscripcion_cancelada = array('b')
+
+
+def _codigo(valor, valores, indices):
+    valor = valor or "Sin especificar"
+    codigo = indices.get(valor)
+    if codigo is None:
+        codigo = indices[valor] = len(valores)
+        valores.append(valor)
+    return codigo
+
+
+def cargar(desde, hasta):
+    """Lee en una pasada los eventos que inician en [desde, hasta) y sus inscripciones"""
+    columnas = Columnas()
+    categorias, ubicaciones = {}, {}
+
+    for id_evento, categoria, ubicacion, capacidad, inscritos in db.iterar_query(
+            CONSULTA_EVENTOS, (desde, hasta), dictionary=False):
+        columnas.evento_id.append(id_evento)
+        columnas.evento_categoria.append(_codigo(categoria, columnas.categorias, categorias))
+        columnas.evento_ubicacion.append(_codigo(ubicacion, columnas.ubicaciones, ubicaciones))
+        columnas.evento_capacidad.append(capacidad or 0)
+        columnas.evento_inscritos.append(inscritos or 0)
+
+    # Un evento creado entre ambas consultas no tiene categoría cargada:
+    # sus inscripciones se omiten
+    categoria_evento = dict(zip(columnas.evento_id, columnas.evento_categoria))
+    agregar_categoria = columnas.inscripcion_categoria.append
+    agregar_dia = columnas.inscripcion_dia.append
+    agregar_cancelada = columnas.inscripcion_cancelada.append
+    for id_evento, dia, cancelada in db.iterar_query(
+            CONSULTA_INSCRIPCIONES, (desde, hasta), tamano_lote=10000, dictionary=False):
+        categoria = categoria_evento.get(id_evento)
+        if categoria is None or dia is None:
+            continue
+        agregar_categoria(categoria)
+        agregar_dia(dia)
+        agregar_cancelada(cancelada)
+    return columnas
+
+
+# --- Agregados: versión NumPy y versión con arreglos ---------------------
+
+def _sumar_por_grupo(codigos, pesos, grupos):
+    """Suma de pesos por código de grupo (0..grupos-1)"""
+    if np is not None:
+        return np.bincount(np.frombuffer(codigos, dtype=np.int64),
+                           weights=np.frombuffer(pesos, dtype=np.int64),
+                           minlength=grupos).astype(np.int64).tolist()
+    sumas = [0] * grupos
+    for codigo, peso in zip(codigos, pesos):
+        sumas[codigo] += peso
+    return sumas
+
+
+def _contar_por_grupo(codigos, grupos):
+    if np is not None:
+        return np.bincount(np.frombuffer(codigos, dtype=np.int64), minlength=grupos).tolist()
+    conteos = [0] * grupos
+    for codigo in codigos:
+        conteos[codigo] += 1
+    return conteos
+
+
+def _por_dia(dias):
+    """(primer día, conteos diarios consecutivos) de una columna TO_DAYS"""
+    if not dias:
+        return None, []
+    primero = min(dias)
+    if np is not None:
+        conteos = np.bincount(np.frombuffer(dias, dtype=np.int64) - primero).tolist()
+    else:
+        conteos = [0] * (max(dias) - primero + 1)
+        for dia in dias:
+            conteos[dia - primero] += 1
+    return date.fromordinal(primero - DESFASE_TO_DAYS), conteos
+
+
+def _porcentaje(parte, total):
+    return round(parte * 100 / total, 1) if total else 0.0
+
+
+def _ocupacion(columnas, codigos, nombres):
+    grupos = len(nombres)
+    eventos = _contar_por_grupo(codigos, grupos)
+    inscritos = _sumar_por_grupo(codigos, columnas.evento_inscritos, grupos)
+    capacidad = _sumar_por_grupo(codigos, columnas.evento_capacidad, grupos)
+    filas = [(nombres[g], eventos[g], inscritos[g], capacidad[g], _porcentaje(inscritos[g], capacidad[g]))
+             for g in range(grupos)]
+    return sorted(filas, key=lambda fila: fila[4], reverse=True)
+
+
+def generar(desde, hasta):
+    """
+    Reporte de los eventos que inician en [desde, hasta):
+    ocupación por categoría y por ubicación, inscripciones por día y tasa
+    de cancelación por categoría.
+    """
+    columnas = cargar(desde, hasta)
+    total_inscripciones = len(columnas.inscripcion_categoria)
+    categorias = len(columnas.categorias)
+
+    codigos = columnas.inscripcion_categoria
+    totales = _contar_por_grupo(codigos, categorias)
+    canceladas = _sumar_por_grupo(codigos, array('q', columnas.inscripcion_cancelada), categorias)
+    cancelacion = sorted(
+        ((columnas.categorias[g], totales[g], canceladas[g], _porcentaje(canceladas[g], totales[g]))
+         for g in range(categorias) if totales[g]),
+        key=lambda fila: fila[3], reverse=True)
+
+    primer_dia, conteos = _por_dia(columnas.inscripcion_dia)
+    velocidad = [(primer_dia + timedelta(days=i), n) for i, n in enumerate(conteos)]
+    pico = max(velocidad, key=lambda fila: fila[1]) if velocidad else None
+
+    return {
+        'desde': desde,
+        'hasta': hasta,
+        'eventos': len(columnas.evento_id),
+        'inscripciones': total_inscripciones,
+        'ocupacion_categoria': _ocupacion(columnas, columnas.evento_categoria, columnas.categorias),
+        'ocupacion_ubicacion': _ocupacion(columnas, columnas.evento_ubicacion, columnas.ubicaciones),
+        'velocidad_diaria': velocidad,
+        'promedio_diario': round(total_inscripciones / len(velocidad), 1) if velocidad else 0.0,
+        'dia_pico': pico,
+        'cancelacion_categoria': cancelacion,
+        'tasa_cancelacion': _porcentaje(sum(columnas.inscripcion_cancelada), total_inscripciones),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte de ocupación, velocidad de inscripción y cancelaciones")
+    anio = datetime.now().year
+    parser.add_argument('--desde', type=date.fromisoformat, default=date(anio, 1, 1))
+    parser.add_argument('--hasta', type=date.fromisoformat, default=date(anio + 1, 1, 1))
+    args = parser.parse_args(argv)
+
+    try:
+        reporte = generar(args.desde, args.hasta)
+    except Error as e:
+        logger.error(f"Error generando el reporte: {e}")
+        return 1
+
+    print(f"Eventos: {reporte['eventos']}  Inscripciones: {reporte['inscripciones']}  "
+          f"Cancelación: {reporte['tasa_cancelacion']}%")
+    print("\nOcupación por categoría")
+    for categoria, eventos, inscritos, capacidad, porcentaje in reporte['ocupacion_categoria']:
+        print(f"  {categoria}: {inscritos}/{capacidad} ({porcentaje}%) en {eventos} eventos")
+    print("\nOcupación por ubicación")
+    for ubicacion, eventos, inscritos, capacidad, porcentaje in reporte['ocupacion_ubicacion']:
+        print(f"  {ubicacion}: {inscritos}/{capacidad} ({porcentaje}%) en {eventos} eventos")
+    print("\nCancelaciones por categoría")
+    for categoria, total, canceladas, tasa in reporte['cancelacion_categoria']:
+        print(f"  {categoria}: {canceladas}/{total} ({tasa}%)")
+    if reporte['dia_pico']:
+        dia, cantidad = reporte['dia_pico']
+        print(f"\nPromedio diario: {reporte['promedio_diario']}  Día pico: {dia:%d/%m/%Y} ({cantidad})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Sincronización del diario local (database/diario.py) con el servidor.
+
+Las operaciones pendientes se aplican por lotes, cada lote en una
+transacción. La clave de idempotencia de cada operación queda registrada
+en la tabla operaciones_sincronizadas dentro de la misma transacción, así
+que reintentar un lote (por un corte a mitad de la sincronización o desde
+otra mesa con una copia del diario) no duplica nada.
+
+Las operaciones que no se pueden aplicar tal cual son conflictos: el email
+ya estaba registrado (la inscripción se hace sobre el participante
+existente), el evento ya no está activo o el participante ya estaba
+inscrito. Los conflictos se cierran igual que las operaciones aplicadas,
+se informan en el resumen y se anexan a <diario>_conflictos.jsonl.
+
+Una inscripción a un evento que se llenó antes de sincronizar no es un
+conflicto: queda en su lista de espera, igual que si se hubiera hecho con
+conexión.
+
+Uso:
+    python -m database.sincronizacion              # una pasada
+    python -m database.sincronizacion --continuo   # reintenta cada --intervalo segundos
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+from mysql.connector import Error
+
+from database.connection import db, PoolAgotadoError
+from database.diario import (diario, es_error_de_conexion, marcar_con_conexion, marcar_sin_conexion,
+                             PARTICIPANTE, INSCRIPCION)
+from database.notificaciones import notificar
+from database.queries import InscripcionQueries
+
+logger = logging.getLogger(__name__)
+
+TAMANO_LOTE = 200
+
+CREAR_TABLA = """
+CREATE TABLE IF NOT EXISTS operaciones_sincronizadas (
+    clave CHAR(36) PRIMARY KEY,
+    tipo VARCHAR(20) NOT NULL,
+    resultado VARCHAR(20) NOT NULL,
+    id_resultado INT NULL,
+    fecha_sincronizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+APLICADA = 'aplicada'
+# Inscripción aplicada en la lista de espera del evento
+EN_ESPERA = 'en_espera'
+CONFLICTO = 'conflicto'
+
+
+def ruta_conflictos():
+    """Archivo donde se anexan los conflictos de sincronización"""
+    base, _ = os.path.splitext(diario.ruta)
+    return f"{base}_conflictos.jsonl"
+
+
+def _crear_participante(tx, datos):
+    """(resultado, id, motivo) de dar de alta un participante del diario"""
+    existente = tx.execute_query("SELECT id_participante FROM participantes WHERE email = %s", (datos['email'],))
+    if existente:
+        return CONFLICTO, existente[0]['id_participante'], "El email ya estaba registrado"
+    id_participante = tx.execute_update("""
+    INSERT INTO participantes (nombre, apellido, email, telefono)
+    VALUES (%s, %s, %s, %s)
+    """, (datos['nombre'], datos['apellido'], datos['email'], datos['telefono']))
+    return APLICADA, id_participante, None
+
+
+def _inscribir(tx, datos, ids):
+    """(resultado, id_participante, motivo) de una inscripción del diario"""
+    id_participante = datos['id_participante']
+    if id_participante < 0:
+        id_participante = ids.get(id_participante, diario.id_real(id_participante))
+        if id_participante is None:
+            return CONFLICTO, None, "El participante creado sin conexión no se pudo sincronizar"
+
+    resultado = InscripcionQueries._inscribir_lote(
+        tx, datos['id_evento'], [id_participante], datos['notas'],
+        datos.get('lista_espera', True))[id_participante]
+    if resultado == InscripcionQueries.INSCRITO:
+        return APLICADA, id_participante, None
+    if resultado == InscripcionQueries.EN_ESPERA:
+        return EN_ESPERA, id_participante, None
+    motivos = {
+        InscripcionQueries.DUPLICADO: "El participante ya estaba inscrito",
+        InscripcionQueries.LLENO: "El evento se llenó antes de sincronizar",
+        InscripcionQueries.NO_DISPONIBLE: "El evento ya no está disponible",
+        InscripcionQueries.NO_ENCONTRADO: "El participante ya no existe",
+    }
+    return CONFLICTO, id_participante, motivos[resultado]
+
+
+def _aplicar_lote(tx, lote):
+    """Aplica las operaciones del lote y retorna sus cierres"""
+    marcadores = ', '.join(['%s'] * len(lote))
+    ya_aplicadas = {
+        fila['clave']: fila for fila in tx.execute_query(
+            f"SELECT clave, resultado, id_resultado FROM operaciones_sincronizadas WHERE clave IN ({marcadores})",
+            [operacion['clave'] for operacion in lote])
+    }
+
+    # Ids reales de los participantes creados en este mismo lote
+    ids = {}
+    cierres = []
+    for operacion in lote:
+        previa = ya_aplicadas.get(operacion['clave'])
+        if previa:
+            cierre = {'clave': operacion['clave'], 'resultado': previa['resultado'],
+                      'id': previa['id_resultado'], 'motivo': "Ya sincronizada", 'repetida': True}
+        else:
+            if operacion['tipo'] == PARTICIPANTE:
+                resultado, id_registro, motivo = _crear_participante(tx, operacion['datos'])
+            else:
+                resultado, id_registro, motivo = _inscribir(tx, operacion['datos'], ids)
+            tx.execute_update("""
+            INSERT INTO operaciones_sincronizadas (clave, tipo, resultado, id_resultado)
+            VALUES (%s, %s, %s, %s)
+            """, (operacion['clave'], operacion['tipo'], resultado, id_registro))
+            cierre = {'clave': operacion['clave'], 'resultado': resultado, 'id': id_registro, 'motivo': motivo}
+
+        if operacion['tipo'] == PARTICIPANTE:
+            ids[operacion['id_provisional']] = cierre['id']
+        cierres.append(cierre)
+    return cierres
+
+
+def _aplicar_una_por_una(lote):
+    """
+    Reintenta un lote que falló por un error que no es de conexión: cada
+    operación va en su propia transacción y la que vuelve a fallar se
+    cierra como conflicto, para que no bloquee el resto del diario.
+    Retorna (cierres, error o None); con un error de conexión o sin
+    conexiones libres en el pool se detiene y los cierres son los de las
+    operaciones ya aplicadas.
+    """
+    cierres = []
+    for operacion in lote:
+        try:
+            with db.transaction() as tx:
+                cierres += _aplicar_lote(tx, [operacion])
+        except Error as e:
+            if es_error_de_conexion(e) or isinstance(e, PoolAgotadoError):
+                return cierres, e
+            logger.error(f"Error sincronizando la operación {operacion['clave']}: {e}")
+            cierres.append({'clave': operacion['clave'], 'resultado': CONFLICTO, 'id': None,
+                            'motivo': f"Error de base de datos: {e}"})
+        # Se cierran de a una: una caída más adelante no repite las anteriores
+        diario.cerrar(cierres[-1:])
+    return cierres, None
+
+
+def _notificar(lote, cierres):
+    """Notifica las escrituras aplicadas igual que las consultas con conexión"""
+    aplicadas = [(operacion, cierre) for operacion, cierre in zip(lote, cierres)
+                 if not cierre.get('repetida')]
+    participantes = sum(1 for operacion, cierre in aplicadas
+                        if operacion['tipo'] == PARTICIPANTE and cierre['resultado'] == APLICADA)
+    if participantes:
+        notificar('participantes', 'crear', cantidad=participantes)
+    for resultado, accion in ((APLICADA, 'crear'), (EN_ESPERA, 'espera')):
+        por_evento = Counter(operacion['datos']['id_evento'] for operacion, cierre in aplicadas
+                             if operacion['tipo'] == INSCRIPCION and cierre['resultado'] == resultado)
+        for id_evento, cantidad in por_evento.items():
+            notificar('inscripciones', accion, id_evento=id_evento, cantidad=cantidad)
+
+
+def _registrar_conflictos(lote, cierres):
+    conflictos = [dict(operacion, resultado=cierre['resultado'], motivo=cierre['motivo'])
+                  for operacion, cierre in zip(lote, cierres)
+                  if cierre['resultado'] == CONFLICTO and not cierre.get('repetida')]
+    if conflictos:
+        with open(ruta_conflictos(), 'a', encoding='utf-8') as archivo:
+            for conflicto in conflictos:
+                archivo.write(json.dumps(conflicto, ensure_ascii=False) + "\n")
+    return conflictos
+
+
+def sincronizar(tamano_lote=TAMANO_LOTE):
+    """
+    Aplica en el servidor las operaciones pendientes del diario. Retorna
+    {'aplicadas', 'en_espera', 'repetidas', 'conflictos': [...],
+    'pendientes', 'error'}; 'aplicadas' incluye las inscripciones que
+    quedaron en lista de espera. Con un error de conexión, o si el pool no
+    tiene conexiones libres, se detiene y lo pendiente queda para la
+    próxima pasada; solo el error de conexión pasa a trabajar sin conexión.
+    """
+    resumen = {'aplicadas': 0, 'en_espera': 0, 'repetidas': 0, 'conflictos': [], 'pendientes': 0,
+               'error': None}
+    while True:
+        lote = diario.pendientes(tamano_lote)
+        if not lote:
+            break
+        error = None
+        try:
+            with db.transaction() as tx:
+                cierres = _aplicar_lote(tx, lote)
+            diario.cerrar(cierres)
+        except PoolAgotadoError as e:
+            # Un error pasajero: el lote queda pendiente para la próxima pasada
+            cierres, error = [], e
+        except Error as e:
+            if es_error_de_conexion(e):
+                cierres, error = [], e
+            else:
+                logger.warning(f"Lote de sincronización revertido, se aplica operación por operación: {e}")
+                cierres, error = _aplicar_una_por_una(lote)
+
+        # Los cierres son de las primeras operaciones del lote, en orden
+        _notificar(lote, cierres)
+        resumen['conflictos'] += _registrar_conflictos(lote, cierres)
+        nuevas = [cierre for cierre in cierres if not cierre.get('repetida')]
+        resumen['repetidas'] += len(cierres) - len(nuevas)
+        resumen['aplicadas'] += sum(1 for cierre in nuevas if cierre['resultado'] in (APLICADA, EN_ESPERA))
+        resumen['en_espera'] += sum(1 for cierre in nuevas if cierre['resultado'] == EN_ESPERA)
+        if error is not None:
+            if es_error_de_conexion(error):
+                marcar_sin_conexion(error)
+            resumen['error'] = str(error)
+            break
+        marcar_con_conexion()
+
+    resumen['pendientes'] = len(diario.pendientes())
+    if not resumen['pendientes'] and resumen['error'] is None:
+        marcar_con_conexion()
+    return resumen
+
+
+def verificar_conexion():
+    """Intenta una conexión; si responde, sale del modo sin conexión. Retorna si hay conexión"""
+    try:
+        db.checkin(db.checkout(timeout=1))
+    except PoolAgotadoError:
+        # Todas las conexiones están en uso: no dice nada del servidor
+        return False
+    except Error as e:
+        marcar_sin_conexion(e)
+        return False
+    if not diario.hay_pendientes():
+        marcar_con_conexion()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sincroniza el diario local con el servidor")
+    parser.add_argument('--continuo', action='store_true', help="repite hasta interrumpir con Ctrl+C")
+    parser.add_argument('--intervalo', type=float, default=5.0, help="segundos entre pasadas")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE)
+    args = parser.parse_args(argv)
+
+    while True:
+        resumen = sincronizar(args.lote)
+        print(f"Aplicadas: {resumen['aplicadas']} ({resumen['en_espera']} en lista de espera)  "
+              f"Repetidas: {resumen['repetidas']}  "
+              f"Conflictos: {len(resumen['conflictos'])}  Pendientes: {resumen['pendientes']}")
+        for conflicto in resumen['conflictos']:
+            print(f"  {conflicto['tipo']} {conflicto['clave']}: {conflicto['motivo']}")
+        if resumen['error']:
+            print(f"Sin conexión: {resumen['error']}")
+        if not args.continuo:
+            return 1 if resumen['error'] else 0
+        try:
+            time.sleep(args.intervalo)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Caché LRU de sentencias preparadas del lado del servidor
+"""
+import threading
+from collections import OrderedDict
+
+from mysql.connector import Error
+
+_lock_global = threading.Lock()
+_totales = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def _contar(clave):
+    with _lock_global:
+        _totales[clave] += 1
+
+
+def estadisticas_globales():
+    """Retorna hits, misses, evictions y hit_ratio sumados de todas las conexiones"""
+    with _lock_global:
+        datos = dict(_totales)
+    consultas = datos['hits'] + datos['misses']
+    datos['hit_ratio'] = round(datos['hits'] / consultas, 4) if consultas else 0.0
+    return datos
+
+
+class StatementCache:
+    """
+    Sentencias preparadas de una conexión, indexadas por el texto SQL.
+
+    Cada SQL distinto se prepara una sola vez (COM_STMT_PREPARE) y las
+    siguientes ejecuciones solo envían los parámetros. Al superar la
+    capacidad se libera en el servidor la sentencia menos usada.
+    """
+
+    def __init__(self, connection, capacidad=64):
+        self.connection = connection
+        self.capacidad = capacidad
+        self.hits = 0
+        self.misses = 0
+        self._cursores = OrderedDict()
+
+    def execute(self, query, params=None, dictionary=False):
+        """Ejecuta la consulta reutilizando su sentencia preparada y retorna el cursor"""
+        clave = (query, dictionary)
+        entrada = self._cursores.get(clave)
+
+        if entrada is None:
+            self.misses += 1
+            _contar('misses')
+            cursor = self.connection.cursor(prepared=True, dictionary=dictionary)
+            # El cursor preparado compara por identidad el SQL ya preparado,
+            # así que se guarda el mismo objeto str con el que se preparó
+            entrada = (cursor, query)
+            self._cursores[clave] = entrada
+            self._desalojar()
+        else:
+            self.hits += 1
+            _contar('hits')
+            self._cursores.move_to_end(clave)
+
+        cursor, sql = entrada
+        try:
+            cursor.execute(sql, params or ())
+        except Error:
+            self.descartar(clave)
+            raise
+        return cursor
+
+    def descartar(self, clave):
+        entrada = self._cursores.pop(clave, None)
+        if entrada:
+            try:
+                entrada[0].close()
+            except Error:
+                pass
+
+    def _desalojar(self):
+        while len(self._cursores) > self.capacidad:
+            clave = next(iter(self._cursores))
+            self.descartar(clave)
+            _contar('evictions')
+
+    def close(self):
+        """Libera todas las sentencias preparadas de la conexión"""
+        for clave in list(self._cursores):
+            self.descartar(clave)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'preparadas': len(self._cursores)}
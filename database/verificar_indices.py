@@ -0,0 +1,145 @@
+"""
+Verificación con EXPLAIN de las consultas de database/queries.py.
+
+Ejecuta cada consulta de lectura con parámetros de ejemplo, captura el SQL
+que envía y lo pasa por EXPLAIN. Falla (código de salida 1) si alguna tabla
+se lee con un escaneo completo (type = ALL) sobre más filas estimadas que
+--min-filas. Con tablas casi vacías el optimizador prefiere escanear, así
+que la verificación tiene sentido sobre una base con datos representativos.
+
+Uso:
+    python -m database.verificar_indices [--min-filas N]
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+from mysql.connector import Error
+
+from database import conflictos, estadisticas
+from database.connection import db, logger
+from database.queries import EventoQueries, ParticipanteQueries, InscripcionQueries
+
+# (nombre, función, argumentos de ejemplo)
+CONSULTAS = [
+    ("EventoQueries.obtener_todos", EventoQueries.obtener_todos, ()),
+    ("EventoQueries.obtener_pagina", EventoQueries.obtener_pagina, (200,)),
+    ("EventoQueries.obtener_pagina(despues)", EventoQueries.obtener_pagina, (200, (datetime(2025, 1, 1), 1))),
+    ("EventoQueries.obtener_cambios", EventoQueries.obtener_cambios, (datetime(2025, 1, 1),)),
+    ("EventoQueries.obtener_por_id", EventoQueries.obtener_por_id, (1,)),
+    ("EventoQueries.buscar", EventoQueries.buscar, ("congreso",)),
+    ("EventoQueries.buscar(despues)", EventoQueries.buscar, ("congreso", 50, (1.5, 10))),
+    ("ParticipanteQueries.obtener_todos", ParticipanteQueries.obtener_todos, ()),
+    ("ParticipanteQueries.obtener_pagina", ParticipanteQueries.obtener_pagina, (200,)),
+    ("ParticipanteQueries.obtener_pagina(despues)", ParticipanteQueries.obtener_pagina, (200, ("Lopez", "Ana", 1))),
+    ("ParticipanteQueries.obtener_cambios", ParticipanteQueries.obtener_cambios, (datetime(2025, 1, 1),)),
+    ("ParticipanteQueries.obtener_por_id", ParticipanteQueries.obtener_por_id, (1,)),
+    ("ParticipanteQueries.buscar", ParticipanteQueries.buscar, ("lopez",)),
+    ("ParticipanteQueries.buscar(despues)", ParticipanteQueries.buscar, ("lopez", 50, (1.5, 10))),
+    ("InscripcionQueries.obtener_participantes_evento", InscripcionQueries.obtener_participantes_evento, (1,)),
+    ("InscripcionQueries.obtener_eventos_participante", InscripcionQueries.obtener_eventos_participante, (1,)),
+    ("InscripcionQueries.verificar_inscripcion_existe", InscripcionQueries.verificar_inscripcion_existe, (1, 1)),
+    ("InscripcionQueries.obtener_lista_espera", InscripcionQueries.obtener_lista_espera, (1,)),
+    ("InscripcionQueries.posicion_en_espera", InscripcionQueries.posicion_en_espera, (1, 1)),
+    ("InscripcionQueries.obtener_estadisticas", InscripcionQueries.obtener_estadisticas, ()),
+    ("estadisticas.calcular", estadisticas.calcular, ()),
+    ("conflictos.HORARIOS_PARTICIPANTE", lambda id_participante: db.execute_query(
+        conflictos.HORARIOS_PARTICIPANTE, (id_participante,)), (1,)),
+    ("conflictos.HORARIOS_UBICACION", lambda ubicacion: db.execute_query(
+        conflictos.HORARIOS_UBICACION, (ubicacion,)), ("Aula 1",)),
+]
+
+# Listados completos sin filtro: leen toda la tabla por definición
+ESCANEOS_PERMITIDOS = {
+    "EventoQueries.obtener_todos",
+    "ParticipanteQueries.obtener_todos",
+}
+
+
+class _FilaVacia(dict):
+    """Fila ficticia: cualquier columna vale None"""
+
+    def __missing__(self, clave):
+        return None
+
+
+@contextmanager
+def capturar_consultas():
+    """Reemplaza temporalmente db.execute_query para registrar el SQL sin ejecutarlo"""
+    capturadas = []
+
+    def registrar(query, params=None, dictionary=True):
+        capturadas.append((query, params))
+        # Una fila ficticia deja que las funciones con varias consultas sigan
+        return [_FilaVacia()]
+
+    db.execute_query = registrar
+    try:
+        yield capturadas
+    finally:
+        del db.execute_query
+
+
+def explicar(query, params):
+    """Retorna las filas de EXPLAIN para una consulta"""
+    with db.conexion() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("EXPLAIN " + query, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+
+def verificar(min_filas=1000):
+    """
+    Retorna la lista de problemas encontrados como
+    (consulta, tabla, filas_estimadas, es_error).
+    """
+    problemas = []
+    for nombre, funcion, args in CONSULTAS:
+        with capturar_consultas() as capturadas:
+            try:
+                funcion(*args)
+            except Exception:
+                # Solo interesa el SQL capturado, no el resultado
+                pass
+
+        for query, params in capturadas:
+            for fila in explicar(query, params):
+                if fila.get('type') != 'ALL':
+                    continue
+                filas = fila.get('rows') or 0
+                es_error = nombre not in ESCANEOS_PERMITIDOS and filas >= min_filas
+                problemas.append((nombre, fila.get('table'), filas, es_error))
+    return problemas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detecta escaneos completos en las consultas del sistema")
+    parser.add_argument('--min-filas', type=int, default=1000,
+                        help="filas estimadas a partir de las cuales un escaneo completo es un error")
+    args = parser.parse_args(argv)
+
+    try:
+        problemas = verificar(args.min_filas)
+    except Error as e:
+        logger.error(f"Error ejecutando EXPLAIN: {e}")
+        return 2
+
+    errores = 0
+    for nombre, tabla, filas, es_error in problemas:
+        nivel = "ERROR" if es_error else "aviso"
+        print(f"[{nivel}] {nombre}: escaneo completo de '{tabla}' (~{filas} filas)")
+        errores += es_error
+
+    if errores:
+        print(f"{errores} consultas sin índice adecuado")
+        return 1
+    print("Todas las consultas usan índices")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
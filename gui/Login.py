@@ -3,9 +3,9 @@ from tkinter import font, messagebox
 import sys
 import os
 
-# Importa la clase MainWindow desde main.py
+# MainWindow (main.py) se importa recién tras iniciar sesión: arrastra los
+# temas, los modelos y la base de datos, que no hacen falta para el login
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from main import MainWindow
 
 class EventoLogin(tk.Tk):
     def __init__(self):
@@ -120,6 +120,7 @@ class EventoLogin(tk.Tk):
             self.message_label.config(text="")
             messagebox.showinfo("Acceso concedido", f"¡Bienvenido/a, {username.capitalize()}!")
             self.destroy()  # Cierra la ventana de login
+            from main import MainWindow
             main_app = MainWindow()  # Abre la ventana principal
             main_app.root.mainloop()
         else:
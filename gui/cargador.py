@@ -0,0 +1,98 @@
+"""
+Carga de datos en segundo plano para que el mainloop de Tk nunca espere a MySQL
+"""
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class CargadorSegundoPlano:
+    """
+    Ejecuta consultas en un pool de hilos y entrega los resultados al hilo de Tk.
+
+    Cada trabajo pertenece a un canal (por ejemplo "eventos"). Enviar un
+    trabajo nuevo a un canal deja obsoleto al anterior: si aún no empezó se
+    cancela y, si ya estaba en curso, su resultado se descarta al llegar.
+    Los hilos toman sus propias conexiones del pool de DatabaseConnection, y
+    los resultados vuelven a Tk por una cola que se revisa con after().
+    """
+
+    def __init__(self, root, max_hilos=3, intervalo_ms=50, al_cambiar_pendientes=None):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        # Recibe el número de trabajos en curso cada vez que cambia
+        self.al_cambiar_pendientes = al_cambiar_pendientes
+
+        self._executor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="cargador")
+        self._resultados = queue.Queue()
+        self._generacion = {}
+        self._futuros = {}
+        self._sondeando = False
+
+    def enviar(self, canal, funcion, *args, al_terminar=None, al_fallar=None):
+        """Ejecuta funcion(*args) en segundo plano; los callbacks corren en el hilo de Tk"""
+        anterior = self._futuros.get(canal)
+        if anterior is not None:
+            anterior.cancel()
+
+        generacion = self._generacion.get(canal, 0) + 1
+        self._generacion[canal] = generacion
+
+        futuro = self._executor.submit(funcion, *args)
+        self._futuros[canal] = futuro
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((canal, generacion, f, al_terminar, al_fallar)))
+
+        self._notificar_pendientes()
+        if not self._sondeando:
+            self._sondeando = True
+            self.root.after(self.intervalo_ms, self._sondear)
+
+    def cancelar(self, canal):
+        """Descarta cualquier trabajo en curso del canal"""
+        self._generacion[canal] = self._generacion.get(canal, 0) + 1
+        futuro = self._futuros.pop(canal, None)
+        if futuro is not None:
+            futuro.cancel()
+            self._notificar_pendientes()
+
+    def pendientes(self):
+        return len(self._futuros)
+
+    def _sondear(self):
+        while True:
+            try:
+                canal, generacion, futuro, al_terminar, al_fallar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            if generacion != self._generacion.get(canal) or futuro.cancelled():
+                continue
+            self._futuros.pop(canal, None)
+            self._notificar_pendientes()
+
+            error = futuro.exception()
+            if error is not None:
+                logger.error(f"Error en carga '{canal}': {error}")
+                if al_fallar:
+                    al_fallar(error)
+            elif al_terminar:
+                al_terminar(futuro.result())
+
+        if self._futuros:
+            self.root.after(self.intervalo_ms, self._sondear)
+        else:
+            self._sondeando = False
+
+    def _notificar_pendientes(self):
+        if self.al_cambiar_pendientes:
+            self.al_cambiar_pendientes(len(self._futuros))
+
+    def cerrar(self):
+        """Cancela los trabajos pendientes y detiene los hilos"""
+        for futuro in self._futuros.values():
+            futuro.cancel()
+        self._futuros.clear()
+        self._executor.shutdown(wait=False)
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+from database import conflictos
 from models.event import Evento
 from utils.validations import Validaciones
 
@@ -122,6 +123,16 @@ class EventoForm(tk.Toplevel):
         self.evento.categoria = datos["categoria"]
         self.evento.estado = datos["estado"]
 
+        # Otro evento en la misma ubicación y horario: se pide confirmación
+        if self.evento.estado != "cancelado":
+            cruces = conflictos.conflictos_ubicacion(self.evento.ubicacion, self.evento.fecha_inicio,
+                                                     self.evento.fecha_fin, excluir=self.evento.id_evento)
+            nombres = [e.nombre for e in map(Evento.obtener_por_id, cruces) if e]
+            if nombres and not messagebox.askyesno(
+                    "Ubicación ocupada", f"'{self.evento.ubicacion}' ya está reservada en ese horario por:\n\n"
+                    + "\n".join(f"- {nombre}" for nombre in nombres) + "\n\n¿Guardar el evento de todos modos?"):
+                return
+
         # Guardar
         if self.evento.guardar():
             messagebox.showinfo("Éxito", "Evento guardado correctamente.")
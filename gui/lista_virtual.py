@@ -0,0 +1,293 @@
+"""
+Lista virtual basada en ttk.Treeview para conjuntos de resultados grandes
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+def quitar_posiciones(valores, posiciones):
+    """Copia de valores sin las posiciones indicadas (ordenadas de menor a mayor)"""
+    resultado = []
+    anterior = 0
+    for posicion in posiciones:
+        resultado.extend(valores[anterior:posicion])
+        anterior = posicion + 1
+    resultado.extend(valores[anterior:])
+    return resultado
+
+
+def intercalar(valores, inserciones):
+    """
+    Copia de valores con cada (posicion, valor) de inserciones delante de
+    valores[posicion]; las posiciones van ordenadas y se refieren a valores
+    """
+    resultado = []
+    anterior = 0
+    for posicion, valor in inserciones:
+        resultado.extend(valores[anterior:posicion])
+        resultado.append(valor)
+        anterior = posicion
+    resultado.extend(valores[anterior:])
+    return resultado
+
+
+class AlmacenColumnas:
+    """
+    Almacén de filas por columnas: una lista de ids y una lista de textos por
+    columna. Evita mantener una tupla por fila y permite leer cualquier fila
+    por posición sin tocar Tk.
+
+    Las inserciones y eliminaciones se hacen por lotes: cada lote copia las
+    listas una vez, en lugar de desplazarlas y reindexarlas por cada fila.
+    """
+
+    def __init__(self, num_columnas):
+        self.num_columnas = num_columnas
+        self.limpiar()
+
+    def limpiar(self):
+        self.ids = []
+        self.columnas = [[] for _ in range(self.num_columnas)]
+        self._posiciones = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def agregar(self, ids, filas):
+        """Agrega al final filas (tuplas de valores) con sus ids"""
+        if self._posiciones is not None:
+            # Las filas anteriores no se mueven: solo se indexan las nuevas
+            self._posiciones.update((id_fila, i) for i, id_fila in enumerate(ids, len(self.ids)))
+        self.ids.extend(ids)
+        for columna, valores in zip(self.columnas, zip(*filas)):
+            columna.extend(valores)
+
+    def insertar(self, inserciones):
+        """Inserta filas (posicion, id, fila) ordenadas por posición en la lista actual"""
+        self.ids = intercalar(self.ids, [(posicion, id_fila) for posicion, id_fila, _ in inserciones])
+        self.columnas = [intercalar(columna, [(posicion, fila[c]) for posicion, _, fila in inserciones])
+                         for c, columna in enumerate(self.columnas)]
+        self._posiciones = None
+
+    def reemplazar(self, posicion, fila):
+        for columna, valor in zip(self.columnas, fila):
+            columna[posicion] = valor
+
+    def eliminar(self, posiciones):
+        """Quita las filas de las posiciones indicadas (ordenadas de menor a mayor)"""
+        self.ids = quitar_posiciones(self.ids, posiciones)
+        self.columnas = [quitar_posiciones(columna, posiciones) for columna in self.columnas]
+        self._posiciones = None
+
+    def fila(self, posicion):
+        return tuple(columna[posicion] for columna in self.columnas)
+
+    def posicion(self, id_fila):
+        """Posición de una fila por su id (None si no está cargada)"""
+        if self._posiciones is None:
+            self._posiciones = {id_fila: i for i, id_fila in enumerate(self.ids)}
+        return self._posiciones.get(id_fila)
+
+
+class ListaVirtual(ttk.Frame):
+    """
+    Treeview que solo crea ítems Tk para las filas visibles.
+
+    Los datos viven en un AlmacenColumnas; al desplazarse se reutilizan los
+    mismos ítems y solo se reescriben sus valores, de modo que el costo en Tk
+    depende del alto de la ventana y no del número de filas cargadas.
+    """
+
+    def __init__(self, master, columnas, umbral_final=0.9, **kwargs):
+        super().__init__(master, **kwargs)
+        self.columnas_visibles = columnas
+        self.almacen = AlmacenColumnas(len(columnas))
+        self.umbral_final = umbral_final
+        # Se llama cuando la vista se acerca al final de las filas cargadas
+        self.al_acercarse_final = None
+
+        self.inicio = 0
+        self._items = []
+        self._ocultos = set()
+        self._seleccion_id = None
+        self._renderizando = False
+
+        self.tree = ttk.Treeview(self, columns=columnas, show='headings', height=15,
+                                 selectmode='browse')
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor=tk.CENTER)
+
+        self.v_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self._desplazar(-3))
+        self.tree.bind("<Button-5>", lambda e: self._desplazar(3))
+        self.tree.bind("<Up>", lambda e: self._mover_seleccion(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_seleccion(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_seleccion(-self._visibles()))
+        self.tree.bind("<Next>", lambda e: self._mover_seleccion(self._visibles()))
+        self.tree.bind("<Home>", lambda e: self._mover_seleccion(-len(self.almacen)))
+        self.tree.bind("<End>", lambda e: self._mover_seleccion(len(self.almacen)))
+
+    # --- Datos ---------------------------------------------------------
+
+    def limpiar(self):
+        """Elimina todas las filas y vuelve al inicio"""
+        self.almacen.limpiar()
+        self.inicio = 0
+        self._seleccion_id = None
+        self._renderizar()
+
+    def agregar(self, ids, filas):
+        """Agrega filas al final; ids son las claves primarias de cada fila"""
+        self.almacen.agregar(ids, filas)
+        self._renderizar()
+
+    def __len__(self):
+        return len(self.almacen)
+
+    def posicion(self, id_fila):
+        return self.almacen.posicion(id_fila)
+
+    # Cambios puntuales: no redibujan hasta llamar a refrescar(). Conservan la
+    # fila seleccionada y la porción visible aunque cambie lo que hay arriba.
+
+    def insertar_filas(self, inserciones):
+        """(posicion, id, fila) ordenadas por posición en la lista actual"""
+        antes_de_la_vista = sum(1 for posicion, _, _ in inserciones if posicion < self.inicio)
+        self.almacen.insertar(inserciones)
+        self.inicio += antes_de_la_vista
+
+    def reemplazar_fila(self, posicion, fila):
+        self.almacen.reemplazar(posicion, fila)
+
+    def eliminar_filas(self, posiciones):
+        """Posiciones ordenadas de menor a mayor"""
+        if any(self.almacen.ids[posicion] == self._seleccion_id for posicion in posiciones):
+            self._seleccion_id = None
+        self.almacen.eliminar(posiciones)
+        self.inicio -= sum(1 for posicion in posiciones if posicion < self.inicio)
+
+    def refrescar(self):
+        """Redibuja las filas visibles después de cambios puntuales"""
+        self._renderizar()
+
+    def seleccion(self):
+        """Id de la fila seleccionada (None si no hay selección)"""
+        return self._seleccion_id
+
+    def valores(self, id_fila):
+        posicion = self.almacen.posicion(id_fila)
+        return self.almacen.fila(posicion) if posicion is not None else None
+
+    # --- Render --------------------------------------------------------
+
+    def _visibles(self):
+        return max(1, len(self._items))
+
+    def _al_redimensionar(self, event):
+        alto_fila = ttk.Style().lookup('Treeview', 'rowheight') or 20
+        # Una fila de alto corresponde al encabezado
+        filas = max(1, event.height // int(alto_fila) - 1)
+        if filas != len(self._items):
+            self.tree.delete(*self._items)
+            self._items = [self.tree.insert('', 'end') for _ in range(filas)]
+            self._ocultos = set()
+            self._renderizar()
+
+    def _renderizar(self):
+        total = len(self.almacen)
+        visibles = self._visibles()
+        self.inicio = max(0, min(self.inicio, total - visibles))
+
+        self._renderizando = True
+        try:
+            seleccionado = None
+            for k, item in enumerate(self._items):
+                posicion = self.inicio + k
+                if posicion < total:
+                    self.tree.item(item, values=self.almacen.fila(posicion))
+                    if item in self._ocultos:
+                        self.tree.reattach(item, '', k)
+                        self._ocultos.discard(item)
+                    if self.almacen.ids[posicion] == self._seleccion_id:
+                        seleccionado = item
+                elif item not in self._ocultos:
+                    self.tree.detach(item)
+                    self._ocultos.add(item)
+
+            if seleccionado:
+                self.tree.selection_set(seleccionado)
+            elif self.tree.selection():
+                self.tree.selection_remove(*self.tree.selection())
+        finally:
+            self._renderizando = False
+
+        if total:
+            self.v_scrollbar.set(self.inicio / total, min(1.0, (self.inicio + visibles) / total))
+        else:
+            self.v_scrollbar.set(0, 1)
+        if self.al_acercarse_final and self.cerca_del_final():
+            self.al_acercarse_final()
+
+    def cerca_del_final(self):
+        """Indica si la vista llegó a umbral_final de las filas cargadas"""
+        total = len(self.almacen)
+        return total > 0 and (self.inicio + self._visibles()) / total >= self.umbral_final
+
+    # --- Desplazamiento y selección --------------------------------------
+
+    def _yview(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.inicio = int(float(cantidad) * len(self.almacen))
+            self._renderizar()
+        elif accion == 'scroll':
+            paso = self._visibles() if unidad == 'pages' else 1
+            self._desplazar(int(cantidad) * paso)
+
+    def _desplazar(self, filas):
+        self.inicio += filas
+        self._renderizar()
+        return "break"
+
+    def _rueda(self, event):
+        return self._desplazar(-3 if event.delta > 0 else 3)
+
+    def _al_seleccionar(self, event):
+        if self._renderizando:
+            return
+        seleccion = self.tree.selection()
+        if not seleccion:
+            return
+        posicion = self.inicio + self.tree.index(seleccion[0])
+        if posicion < len(self.almacen):
+            self._seleccion_id = self.almacen.ids[posicion]
+
+    def _mover_seleccion(self, delta):
+        total = len(self.almacen)
+        if not total:
+            return "break"
+        actual = self.almacen.posicion(self._seleccion_id)
+        if actual is None:
+            actual = self.inicio - (1 if delta > 0 else 0)
+        nueva = max(0, min(total - 1, actual + delta))
+        self._seleccion_id = self.almacen.ids[nueva]
+
+        visibles = self._visibles()
+        if nueva < self.inicio:
+            self.inicio = nueva
+        elif nueva >= self.inicio + visibles:
+            self.inicio = nueva - visibles + 1
+        self._renderizar()
+        return "break"
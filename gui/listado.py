@@ -0,0 +1,33 @@
+"""
+Ventana de solo lectura con un listado largo y opción de exportarlo
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from gui.lista_virtual import ListaVirtual
+
+
+class VentanaListado(tk.Toplevel):
+    """
+    Muestra filas (tuplas de valores) en una ListaVirtual, de modo que un
+    evento con miles de inscritos se recorre con scroll en lugar de
+    concatenarse en un mensaje. al_exportar se llama desde el botón Exportar.
+    """
+
+    def __init__(self, master, titulo, columnas, filas, al_exportar=None):
+        super().__init__(master)
+        self.title(titulo)
+        self.geometry("900x500")
+
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        controles = ttk.Frame(frame)
+        controles.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(controles, text=f"{len(filas)} registros").pack(side=tk.LEFT)
+        if al_exportar:
+            ttk.Button(controles, text="Exportar...", command=al_exportar).pack(side=tk.RIGHT)
+
+        self.lista = ListaVirtual(frame, columnas)
+        self.lista.pack(fill=tk.BOTH, expand=True)
+        self.lista.agregar(list(range(len(filas))), filas)
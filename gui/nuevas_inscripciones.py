@@ -1,14 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from database.queries import EventoQueries, ParticipanteQueries, InscripcionQueries
+from database import conflictos
+from database.diario import sin_conexion
+from database.queries import InscripcionQueries
+from models.event import Evento
+from models.participante import Participante
 
 class NuevaInscripcionForm(tk.Toplevel):
-    def __init__(self, master=None, callback=None):
+    MAX_SUGERENCIAS = 8
+
+    def __init__(self, master=None, callback=None, cargador=None):
         super().__init__(master)
         self.title("Nueva Inscripción")
-        self.geometry("400x400")
+        self.geometry("400x520")
         self.resizable(False, False)
         self.callback = callback
+        self.cargador = cargador
 
         self.crear_widgets()
 
@@ -22,11 +29,19 @@ class NuevaInscripcionForm(tk.Toplevel):
         self.evento_combo = ttk.Combobox(frame, textvariable=self.evento_var, state="readonly")
         self.evento_combo.pack(fill="x")
 
-        # Combo de Participantes
-        ttk.Label(frame, text="Participante").pack(anchor="w", pady=(10, 0))
+        # Participante: se busca por nombre, apellido o email mientras se escribe
+        ttk.Label(frame, text="Participante (nombre, apellido o email)").pack(anchor="w", pady=(10, 0))
         self.participante_var = tk.StringVar()
-        self.participante_combo = ttk.Combobox(frame, textvariable=self.participante_var, state="readonly")
-        self.participante_combo.pack(fill="x")
+        self.participante_entry = ttk.Entry(frame, textvariable=self.participante_var)
+        self.participante_entry.pack(fill="x")
+        self.participante_lista = tk.Listbox(frame, height=self.MAX_SUGERENCIAS, exportselection=False)
+        self.participante_lista.pack(fill="x")
+        self.participante_lista.bind("<<ListboxSelect>>", self.seleccionar_participante)
+        self.participante_entry.bind("<Down>", lambda e: self.participante_lista.focus_set())
+        self.participante_var.trace_add("write", lambda *args: self.sugerir_participantes())
+        self.id_participante = None
+        self.sugerencias = []
+        self.indice_participantes = None
 
         # Notas
         ttk.Label(frame, text="Notas (opcional)").pack(anchor="w", pady=(10, 0))
@@ -41,39 +56,114 @@ class NuevaInscripcionForm(tk.Toplevel):
         self.cargar_participantes()
 
     def cargar_eventos(self):
-        eventos = EventoQueries.obtener_todos()
-        self.eventos_dict = {f"{e['nombre']} (ID: {e['id_evento']})": e['id_evento'] for e in eventos if e['estado'] == 'activo'}
+        # Los listados vienen de la caché de los modelos: abrir el formulario
+        # varias veces seguidas no vuelve a consultar las tablas completas.
+        # Sin conexión se usa el último listado leído, así se puede inscribir
+        # en el diario sin esperar a que venza la conexión
+        eventos = [] if sin_conexion() else Evento.obtener_todos()
+        if not eventos:
+            eventos = Evento.ultimo_listado()
+        self.eventos = {e.id_evento: e for e in eventos}
+        self.eventos_dict = {f"{e.nombre} (ID: {e.id_evento})": e.id_evento for e in eventos if e.esta_activo()}
         self.evento_combo['values'] = list(self.eventos_dict.keys())
 
     def cargar_participantes(self):
-        participantes = ParticipanteQueries.obtener_todos()
-        self.participantes_dict = {f"{p['nombre']} {p['apellido']} (ID: {p['id_participante']})": p['id_participante'] for p in participantes}
-        self.participante_combo['values'] = list(self.participantes_dict.keys())
+        # El índice se construye una vez y se comparte entre aperturas del
+        # formulario; la primera vez lee toda la tabla, así que se arma en
+        # segundo plano y la búsqueda se habilita al terminar
+        if self.cargador is None:
+            self.indice_listo(Participante.indice_busqueda())
+            return
+        self.participante_entry.state(["disabled"])
+        self.participante_lista.insert(tk.END, "Cargando participantes...")
+        self.cargador.enviar("indice_participantes", Participante.indice_busqueda,
+                             al_terminar=self.indice_listo, al_fallar=self.indice_fallido)
+
+    def indice_listo(self, indice):
+        if not self.winfo_exists():
+            return
+        self.indice_participantes = indice
+        self.participante_lista.delete(0, tk.END)
+        self.participante_entry.state(["!disabled"])
+        self.participante_entry.focus_set()
+        self.sugerir_participantes()
+
+    def indice_fallido(self, error):
+        if not self.winfo_exists():
+            return
+        self.participante_lista.delete(0, tk.END)
+        self.participante_lista.insert(tk.END, "No se pudieron cargar los participantes")
+
+    def sugerir_participantes(self):
+        texto = self.participante_var.get()
+        if self.id_participante is not None and texto == self.etiqueta_participante:
+            return
+        self.id_participante = None
+        if self.indice_participantes is None:
+            return
+        self.sugerencias = self.indice_participantes.buscar(texto, self.MAX_SUGERENCIAS)
+        self.participante_lista.delete(0, tk.END)
+        for _, etiqueta in self.sugerencias:
+            self.participante_lista.insert(tk.END, etiqueta)
+
+    def seleccionar_participante(self, event=None):
+        seleccion = self.participante_lista.curselection()
+        # La lista también muestra avisos ("Cargando participantes...")
+        if not seleccion or seleccion[0] >= len(self.sugerencias):
+            return
+        self.id_participante, self.etiqueta_participante = self.sugerencias[seleccion[0]]
+        self.participante_var.set(self.etiqueta_participante)
 
     def guardar_inscripcion(self):
         evento_key = self.evento_var.get()
-        participante_key = self.participante_var.get()
+        id_participante = self.id_participante
 
-        if not evento_key or not participante_key:
+        if not evento_key or id_participante is None:
             messagebox.showerror("Error", "Debe seleccionar un evento y un participante.")
             return
 
         id_evento = self.eventos_dict[evento_key]
-        id_participante = self.participantes_dict[participante_key]
-
-        # Verificar si ya está inscrito
-        if InscripcionQueries.verificar_inscripcion_existe(id_evento, id_participante):
-            messagebox.showerror("Error", "El participante ya está inscrito en este evento.")
-            return
 
         notas = self.notas_text.get("1.0", tk.END).strip()
 
-        result = InscripcionQueries.inscribir_participante(id_evento, id_participante, notas)
-
-        if result:
-            messagebox.showinfo("Éxito", "Inscripción realizada correctamente.")
+        # Un cruce de horario con otro evento del participante no impide la
+        # inscripción, pero se advierte antes de hacerla. Sin conexión no se
+        # puede consultar: lo encontrará la auditoría (python -m database.conflictos)
+        evento = self.eventos.get(id_evento)
+        if evento and not sin_conexion():
+            cruces = conflictos.conflictos_participante(
+                id_participante, evento.fecha_inicio, evento.fecha_fin, excluir=id_evento)
+            nombres = [e.nombre for e in (self.eventos.get(c) or Evento.obtener_por_id(c) for c in cruces) if e]
+            if nombres and not messagebox.askyesno(
+                    "Cruce de horario", "El participante ya está inscrito en eventos que se cruzan con este:\n\n"
+                    + "\n".join(f"- {nombre}" for nombre in nombres) + "\n\n¿Inscribirlo de todos modos?"):
+                return
+
+        # Cupo y duplicados se verifican dentro de la misma transacción que
+        # inscribe, así dos mesas de registro no pueden sobrepasar el cupo
+        resultado = InscripcionQueries.inscribir(id_evento, id_participante, notas)
+
+        if resultado is None:
+            messagebox.showerror("Error", "No se pudo realizar la inscripción.")
+        elif resultado[0] == InscripcionQueries.DUPLICADO:
+            messagebox.showerror("Error", "El participante ya está inscrito en este evento.")
+        elif resultado[0] == InscripcionQueries.LLENO:
+            messagebox.showerror("Error", "El evento no tiene cupos disponibles.")
+        elif resultado[0] == InscripcionQueries.NO_DISPONIBLE:
+            messagebox.showerror("Error", "El evento ya no está disponible para inscripciones.")
+        elif resultado[0] == InscripcionQueries.NO_ENCONTRADO:
+            messagebox.showerror("Error", "El participante no existe en el servidor.")
+        else:
+            if resultado[0] == InscripcionQueries.EN_ESPERA:
+                posicion = InscripcionQueries.posicion_en_espera(id_evento, id_participante)
+                messagebox.showinfo("Lista de espera", "El evento no tiene cupos disponibles: el participante "
+                                    f"quedó en lista de espera (posición {posicion}). Se confirmará "
+                                    "automáticamente cuando se libere un cupo.")
+            elif resultado[0] == InscripcionQueries.PENDIENTE:
+                messagebox.showinfo("Sin conexión", "No hay conexión con el servidor: la inscripción quedó "
+                                    "guardada en este equipo. El cupo se confirmará al sincronizar.")
+            else:
+                messagebox.showinfo("Éxito", "Inscripción realizada correctamente.")
             if self.callback:
                 self.callback()
             self.destroy()
-        else:
-            messagebox.showerror("Error", "No se pudo realizar la inscripción.")
@@ -0,0 +1,227 @@
+"""
+Carga paginada de una ListaVirtual a medida que el usuario se desplaza
+"""
+from gui.lista_virtual import intercalar, quitar_posiciones
+
+
+class CargadorPaginado:
+    """
+    Llena una ListaVirtual página a página usando paginación por clave (keyset).
+
+    obtener_pagina(limite, despues) debe retornar la lista de objetos de la
+    página siguiente a la clave despues; clave(obj) retorna la clave de orden
+    de un objeto, identificador(obj) su clave primaria y fila(obj) los valores
+    que se muestran. La siguiente página se pide cuando la lista avisa que la
+    vista se acerca al final de las filas cargadas.
+
+    Con un CargadorSegundoPlano las páginas se consultan fuera del hilo de
+    Tk; reiniciar() deja obsoletos las páginas y los refrescos que aún estén
+    en camino.
+
+    Si se da obtener_cambios(desde), refrescar() solo trae lo modificado o
+    eliminado desde la última carga y lo aplica fila por fila, sin vaciar la
+    lista ni perder la selección o el desplazamiento.
+    """
+
+    def __init__(self, lista, obtener_pagina, clave, identificador, fila,
+                 tamano_pagina=200, al_cargar=None, cargador=None, canal=None,
+                 obtener_cambios=None, descendente=False, al_refrescar=None):
+        self.lista = lista
+        self.obtener_pagina = obtener_pagina
+        self.clave = clave
+        self.identificador = identificador
+        self.fila = fila
+        self.tamano_pagina = tamano_pagina
+        self.al_cargar = al_cargar
+        self.cargador = cargador
+        self.canal = canal
+        self.obtener_cambios = obtener_cambios
+        self.descendente = descendente
+        self.al_refrescar = al_refrescar
+
+        self.objetos = []
+        # Claves de orden de las filas cargadas, en el mismo orden que la lista
+        self.claves = []
+        self._marca = None
+        self._ultima_clave = None
+        self._hay_mas = True
+        self._cargando = False
+        self._pendiente = False
+
+        self.lista.al_acercarse_final = self._al_acercarse_final
+
+    def reiniciar(self):
+        """Vacía la lista y vuelve a cargar desde la primera página"""
+        self.lista.limpiar()
+        self.objetos = []
+        self.claves = []
+        self._marca = None
+        self._ultima_clave = None
+        self._hay_mas = True
+        # Una página anterior todavía en camino queda obsoleta, y también un
+        # refresco pedido para la consulta anterior
+        self._cargando = False
+        if self.cargador:
+            self.cargador.cancelar(f"{self.canal}:cambios")
+        self.cargar_siguiente()
+
+    def cambiar_consulta(self, obtener_pagina, clave, obtener_cambios=None, descendente=False):
+        """
+        Cambia el origen de las páginas (por ejemplo, de listado a búsqueda)
+        y recarga desde el principio
+        """
+        self.obtener_pagina = obtener_pagina
+        self.clave = clave
+        self.obtener_cambios = obtener_cambios
+        self.descendente = descendente
+        self.reiniciar()
+
+    def cargar_siguiente(self):
+        """Agrega la siguiente página al final de la lista"""
+        if self._cargando or not self._hay_mas:
+            return
+        self._cargando = True
+
+        if self.cargador:
+            self.cargador.enviar(self.canal, self._consultar_pagina, self._ultima_clave,
+                                 al_terminar=self._recibir_pagina, al_fallar=self._fallo_pagina)
+            return
+
+        try:
+            resultado = self._consultar_pagina(self._ultima_clave)
+        except Exception:
+            self._cargando = False
+            raise
+        self._recibir_pagina(resultado)
+
+    def _consultar_pagina(self, despues):
+        # La marca se toma antes de la primera página para no perder cambios
+        # que ocurran mientras se carga
+        marca = None
+        if despues is None and self.obtener_cambios:
+            cambios = self.obtener_cambios(None)
+            marca = cambios['marca'] if cambios else None
+        return marca, self.obtener_pagina(self.tamano_pagina, despues)
+
+    def _fallo_pagina(self, error):
+        self._cargando = False
+
+    def _recibir_pagina(self, resultado):
+        marca, pagina = resultado
+        try:
+            if marca is not None:
+                self._marca = marca
+
+            self._hay_mas = len(pagina) == self.tamano_pagina
+            if pagina:
+                self._ultima_clave = self.clave(pagina[-1])
+            # Un refresco incremental pudo haber insertado ya alguna de estas filas
+            nuevos = [obj for obj in pagina if self.lista.posicion(self.identificador(obj)) is None]
+            if nuevos:
+                self.objetos.extend(nuevos)
+                self.claves.extend(self.clave(obj) for obj in nuevos)
+                self.lista.agregar([self.identificador(obj) for obj in nuevos],
+                                   [self.fila(obj) for obj in nuevos])
+        finally:
+            self._cargando = False
+
+        if self.al_cargar:
+            self.al_cargar(len(self.objetos), self._hay_mas)
+        # Si la página no alcanzó a llenar la vista se pide la siguiente
+        if self.lista.cerca_del_final():
+            self._al_acercarse_final()
+
+    def refrescar(self):
+        """Aplica solo los cambios ocurridos desde la última carga"""
+        if self.obtener_cambios is None or self._marca is None:
+            self.reiniciar()
+            return
+
+        if self.cargador:
+            self.cargador.enviar(f"{self.canal}:cambios", self.obtener_cambios, self._marca,
+                                 al_terminar=self._aplicar_cambios)
+        else:
+            self._aplicar_cambios(self.obtener_cambios(self._marca))
+
+    def _aplicar_cambios(self, cambios):
+        if not cambios:
+            return
+        if cambios['recargar']:
+            # La última carga es anterior a las eliminaciones que se conservan
+            self.reiniciar()
+            return
+
+        eliminados = set(cambios['eliminados'])
+        actualizados = {self.identificador(obj): obj for obj in cambios['filas']}
+
+        # Las posiciones se resuelven todas antes de modificar la lista: las
+        # filas eliminadas y las que cambiaron de lugar se quitan en un solo
+        # lote y luego se intercalan las nuevas, así el costo no se multiplica
+        # por la cantidad de cambios. Las que conservan su clave de orden se
+        # actualizan en su posición.
+        quitar = []
+        en_su_lugar = set()
+        for id_fila in eliminados | actualizados.keys():
+            posicion = self.lista.posicion(id_fila)
+            if posicion is None:
+                continue
+            obj = actualizados.get(id_fila)
+            if id_fila not in eliminados and self.clave(obj) == self.claves[posicion]:
+                self.objetos[posicion] = obj
+                self.lista.reemplazar_fila(posicion, self.fila(obj))
+                en_su_lugar.add(id_fila)
+                continue
+            quitar.append(posicion)
+        if quitar:
+            quitar.sort()
+            self.objetos = quitar_posiciones(self.objetos, quitar)
+            self.claves = quitar_posiciones(self.claves, quitar)
+            self.lista.eliminar_filas(quitar)
+
+        nuevos = sorted(((self.clave(obj), id_fila, obj) for id_fila, obj in actualizados.items()
+                         if id_fila not in eliminados and id_fila not in en_su_lugar),
+                        key=lambda nuevo: nuevo[0], reverse=self.descendente)
+        inserciones = []
+        for clave, id_fila, obj in nuevos:
+            posicion = self._posicion_orden(clave)
+            # Más allá de lo cargado: llegará con la página que le corresponda
+            if posicion == len(self.claves) and self._hay_mas:
+                continue
+            inserciones.append((posicion, id_fila, obj, clave))
+        if inserciones:
+            self.objetos = intercalar(self.objetos, [(posicion, obj) for posicion, _, obj, _ in inserciones])
+            self.claves = intercalar(self.claves, [(posicion, clave) for posicion, _, _, clave in inserciones])
+            self.lista.insertar_filas([(posicion, id_fila, self.fila(obj))
+                                       for posicion, id_fila, obj, _ in inserciones])
+
+        self._marca = cambios['marca']
+        self.lista.refrescar()
+        if self.al_refrescar:
+            self.al_refrescar(len(actualizados), len(eliminados))
+
+    def _posicion_orden(self, clave):
+        """Posición donde insertar una clave manteniendo el orden de la lista"""
+        inicio, fin = 0, len(self.claves)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            actual = self.claves[medio]
+            antes = actual > clave if self.descendente else actual < clave
+            if antes:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    @property
+    def hay_mas(self):
+        return self._hay_mas
+
+    def _al_acercarse_final(self):
+        if self._hay_mas and not (self._cargando or self._pendiente):
+            # Diferido para no cargar datos dentro del propio evento de scroll
+            self._pendiente = True
+            self.lista.after_idle(self._cargar_pendiente)
+
+    def _cargar_pendiente(self):
+        self._pendiente = False
+        self.cargar_siguiente()
@@ -39,23 +39,9 @@ class ParticipanteForm(tk.Toplevel):
     def guardar_participante(self):
         datos = {k: e.get().strip() for k, e in self.entries.items()}
 
-        errores = []
-
-        for campo in ["nombre", "apellido"]:
-            valido, mensaje = Validaciones.validar_nombre(datos[campo], campo)
-            if not valido:
-                errores.append(mensaje)
-
-        valido, mensaje = Validaciones.validar_email(datos["email"])
-        if not valido:
-            errores.append(mensaje)
-
-        valido, mensaje = Validaciones.validar_telefono(datos["telefono"])
-        if not valido:
-            errores.append(mensaje)
-
+        errores = Validaciones.validar_participante(datos)
         if errores:
-            messagebox.showerror("Errores de validación", "\n".join(errores))
+            messagebox.showerror("Errores de validación", "\n".join(errores.values()))
             return
 
         self.participante.nombre = datos["nombre"]
@@ -64,7 +50,12 @@ class ParticipanteForm(tk.Toplevel):
         self.participante.telefono = datos["telefono"]
 
         if self.participante.guardar():
-            messagebox.showinfo("Éxito", "Participante guardado correctamente.")
+            if self.participante.id_participante < 0:
+                # Quedó en el diario local (ver ParticipanteQueries.crear)
+                messagebox.showinfo("Sin conexión", "No hay conexión con el servidor: el participante "
+                                    "quedó guardado en este equipo y se enviará al reconectar.")
+            else:
+                messagebox.showinfo("Éxito", "Participante guardado correctamente.")
             if self.callback:
                 self.callback()
             self.destroy()
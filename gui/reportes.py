@@ -0,0 +1,91 @@
+"""
+Pestaña de reportes: ocupación, velocidad de inscripción y cancelaciones
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date
+
+from database import reportes
+from gui.lista_virtual import ListaVirtual
+from utils import formato
+
+
+class PestanaReportes(ttk.Frame):
+    """Genera el reporte de un período en segundo plano y lo muestra en tablas"""
+
+    def __init__(self, master, cargador, al_estado=None):
+        super().__init__(master)
+        self.cargador = cargador
+        self.al_estado = al_estado
+
+        controles = ttk.Frame(self)
+        controles.pack(fill=tk.X, padx=10, pady=10)
+
+        anio = date.today().year
+        self.desde_var = tk.StringVar(value=date(anio, 1, 1).isoformat())
+        self.hasta_var = tk.StringVar(value=date(anio + 1, 1, 1).isoformat())
+        ttk.Label(controles, text="Eventos que inician desde").pack(side=tk.LEFT)
+        ttk.Entry(controles, textvariable=self.desde_var, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(controles, text="hasta").pack(side=tk.LEFT)
+        ttk.Entry(controles, textvariable=self.hasta_var, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles, text="Generar", command=self.generar).pack(side=tk.LEFT, padx=5)
+
+        self.resumen = ttk.Label(self, text="Seleccione un período y presione Generar")
+        self.resumen.pack(fill=tk.X, padx=10)
+
+        secciones = ttk.Notebook(self)
+        secciones.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.por_categoria = self._tabla(secciones, "Ocupación por categoría",
+                                         ('Categoría', 'Eventos', 'Inscritos', 'Capacidad', 'Ocupación %'))
+        self.por_ubicacion = self._tabla(secciones, "Ocupación por ubicación",
+                                         ('Ubicación', 'Eventos', 'Inscritos', 'Capacidad', 'Ocupación %'))
+        self.cancelaciones = self._tabla(secciones, "Cancelaciones",
+                                         ('Categoría', 'Inscripciones', 'Canceladas', 'Cancelación %'))
+        self.por_dia = ListaVirtual(secciones, ('Fecha', 'Inscripciones'))
+        secciones.add(self.por_dia, text="Inscripciones por día")
+
+    def _tabla(self, notebook, titulo, columnas):
+        lista = ListaVirtual(notebook, columnas)
+        notebook.add(lista, text=titulo)
+        return lista
+
+    def _estado(self, mensaje):
+        if self.al_estado:
+            self.al_estado(mensaje)
+
+    def generar(self):
+        try:
+            desde = date.fromisoformat(self.desde_var.get().strip())
+            hasta = date.fromisoformat(self.hasta_var.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "Las fechas deben tener el formato AAAA-MM-DD.")
+            return
+        if hasta <= desde:
+            messagebox.showerror("Error", "La fecha final debe ser posterior a la inicial.")
+            return
+
+        self._estado("Generando reporte...")
+        self.cargador.enviar("reportes", reportes.generar, desde, hasta,
+                             al_terminar=self.mostrar,
+                             al_fallar=lambda error: messagebox.showerror(
+                                 "Error", f"No se pudo generar el reporte:\n{error}"))
+
+    def mostrar(self, reporte):
+        texto = (f"{reporte['eventos']} eventos, {reporte['inscripciones']} inscripciones, "
+                 f"cancelación {reporte['tasa_cancelacion']}%, "
+                 f"promedio {reporte['promedio_diario']} inscripciones por día")
+        if reporte['dia_pico']:
+            dia, cantidad = reporte['dia_pico']
+            texto += f", pico el {dia:%d/%m/%Y} ({cantidad})"
+        self.resumen.config(text=texto)
+
+        for lista, filas in ((self.por_categoria, reporte['ocupacion_categoria']),
+                             (self.por_ubicacion, reporte['ocupacion_ubicacion']),
+                             (self.cancelaciones, reporte['cancelacion_categoria'])):
+            lista.limpiar()
+            lista.agregar(list(range(len(filas))), filas)
+
+        dias = formato.formatear_columnas(reporte['velocidad_diaria'], (0,), formato.FECHA)
+        self.por_dia.limpiar()
+        self.por_dia.agregar(list(range(len(dias))), dias)
+        self._estado("Reporte generado")
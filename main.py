@@ -1,54 +1,41 @@
+import logging
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from ttkthemes import ThemedTk
 from datetime import datetime
-from gui.evento_form import EventoForm
 from gui.participante_form import ParticipanteForm
 from models.event import Evento
 from models.participante import Participante
+from models import cache
 from gui.nuevas_inscripciones import NuevaInscripcionForm
+from gui.paginacion import CargadorPaginado
+from gui.lista_virtual import ListaVirtual
+from gui.cargador import CargadorSegundoPlano
 from utils.validations import Validaciones
-from database.queries import InscripcionQueries
-from PyQt5.QtWidgets import QDialog, QMessageBox
-from PyQt5.QtCore import Qt
-
-
-class NuevoParticipanteDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Nuevo Participante")
-        self.setWindowModality(Qt.ApplicationModal)  
-        self.setWindowFlag(Qt.WindowStaysOnTopHint) 
-        self.lift()
-        self.attributes('-topmost', True)
-
-    def guardar(self):
-        nombre = self.nombre_input.text()
-        apellido = self.apellido_input.text()
-        email = self.email_input.text()
-        telefono = self.telefono_input.text()
-
-        if not nombre:
-            QMessageBox.warning(self, "Error", "El nombre es obligatorio.")
-            self.nombre_input.clear()
-            self.nombre_input.setFocus()
-            return
-        if not self.validar_email(email):
-            QMessageBox.warning(self, "Error", "Email inválido.")
-            self.email_input.clear()
-            self.email_input.setFocus()
-            return
-        
+from utils import formato
+from database.queries import InscripcionQueries, expresion_busqueda, LARGO_MINIMO_TERMINO, podar_registros_eliminados
+from database import estadisticas, sincronizacion
+from database.diario import diario, sin_conexion
+from database.importacion import importar_participantes
+from database.exportacion import exportar
+from gui.listado import VentanaListado
+from gui.reportes import PestanaReportes
 
-        # Si todo está bien, guardar participante
-        self.accept()
-
-    def validar_email(self, email):
-        import re
-        return re.match(r"[^@]+@[^@]+\.[^@]+", email)
+logger = logging.getLogger(__name__)
 
 
 class MainWindow:
+    # Espera tras la última tecla antes de lanzar la búsqueda
+    RETARDO_BUSQUEDA_MS = 300
+    # El panel lee el resumen (una fila) cada 30 s y lo reconcilia con
+    # conteos completos cada 10 lecturas o cuando una escritura lo pide
+    INTERVALO_ESTADISTICAS_MS = 30000
+    RECONCILIAR_CADA = 10
+    # Cada cuánto se intenta enviar el diario local cuando no hubo conexión
+    INTERVALO_SINCRONIZACION_MS = 5000
+    # Cada cuánto se borran los registros de eliminaciones ya vencidos
+    INTERVALO_PODA_MS = 3600000
+
     def __init__(self):
         self.root = ThemedTk(theme="equilux")
         self.root.title("Gestor de Eventos Universitario")
@@ -58,10 +45,21 @@ class MainWindow:
         self.eventos_list = []
         self.participantes_list = []
 
+        # Las consultas corren en hilos de trabajo; Tk solo recibe los resultados
+        self.cargador = CargadorSegundoPlano(self.root, al_cambiar_pendientes=self.mostrar_progreso)
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self._busquedas_pendientes = {}
+
         self.crear_interfaz()
         self.cargar_eventos()
         self.cargar_participantes()
         self.actualizar_estadisticas()  # <-- Llamada directa al iniciar
+        self._lecturas_estadisticas = 0
+        self._timer_estadisticas = self.root.after(self.INTERVALO_ESTADISTICAS_MS, self.refrescar_estadisticas_periodico)
+        self._sincronizando = False
+        # Lo que quedó en el diario de una sesión anterior se envía al iniciar
+        self._timer_sincronizacion = self.root.after(0, self.sincronizar_periodico)
+        self._timer_poda = self.root.after(0, self.podar_periodico)
         self.verificar_conexion()
         self.root.mainloop()
 
@@ -80,6 +78,7 @@ class MainWindow:
         self.crear_pestaña_eventos()
         self.crear_pestaña_participantes()
         self.crear_pestaña_inscripciones()
+        self.crear_pestaña_reportes()
 
         self.crear_barra_estado(main_frame)
 
@@ -87,7 +86,55 @@ class MainWindow:
         """
         Actualiza las estadísticas generales en la interfaz
         """
-        datos_estadisticas = InscripcionQueries.obtener_estadisticas()
+        self.cargador.enviar("estadisticas", InscripcionQueries.obtener_estadisticas,
+                             al_terminar=self.mostrar_estadisticas)
+
+    def refrescar_estadisticas_periodico(self):
+        self._lecturas_estadisticas += 1
+        if self._lecturas_estadisticas % self.RECONCILIAR_CADA == 0 or estadisticas.reconciliacion_pendiente():
+            self.cargador.enviar("estadisticas", estadisticas.reconciliar, al_terminar=self.mostrar_estadisticas)
+        else:
+            self.actualizar_estadisticas()
+        self._timer_estadisticas = self.root.after(self.INTERVALO_ESTADISTICAS_MS, self.refrescar_estadisticas_periodico)
+
+    def sincronizar_periodico(self):
+        """Envía al servidor las operaciones guardadas en el diario local sin conexión"""
+        if not self._sincronizando and (diario.hay_pendientes() or sin_conexion()):
+            self._sincronizando = True
+            funcion = sincronizacion.sincronizar if diario.hay_pendientes() else sincronizacion.verificar_conexion
+            self.cargador.enviar("sincronizacion", funcion,
+                                 al_terminar=self.al_sincronizar, al_fallar=self.al_fallar_sincronizacion)
+        self._timer_sincronizacion = self.root.after(self.INTERVALO_SINCRONIZACION_MS, self.sincronizar_periodico)
+
+    def podar_periodico(self):
+        """Borra en segundo plano los registros de eliminaciones más antiguos que la retención"""
+        if not sin_conexion():
+            self.cargador.enviar("poda", podar_registros_eliminados)
+        self._timer_poda = self.root.after(self.INTERVALO_PODA_MS, self.podar_periodico)
+
+    def al_sincronizar(self, resumen):
+        self._sincronizando = False
+        if not isinstance(resumen, dict):
+            # Solo se verificó la conexión
+            if resumen:
+                self.actualizar_status("Conexión con el servidor recuperada")
+            return
+        if resumen['aplicadas'] or resumen['conflictos']:
+            mensaje = f"Sincronizadas {resumen['aplicadas']} operaciones hechas sin conexión"
+            if resumen['en_espera']:
+                mensaje += f" ({resumen['en_espera']} inscripciones en lista de espera)"
+            if resumen['conflictos']:
+                mensaje += f", {len(resumen['conflictos'])} con conflictos (ver {sincronizacion.ruta_conflictos()})"
+            self.actualizar_status(mensaje)
+            self.refrescar_inscripciones()
+        elif resumen['error'] and sin_conexion():
+            self.actualizar_status(f"Sin conexión: {resumen['pendientes']} operaciones esperando sincronizar")
+
+    def al_fallar_sincronizacion(self, error):
+        self._sincronizando = False
+        logger.error(f"Error sincronizando el diario local: {error}")
+
+    def mostrar_estadisticas(self, datos_estadisticas):
         if not datos_estadisticas:
             self.actualizar_status("No se pudieron obtener las estadísticas.")
             return
@@ -135,52 +182,99 @@ class MainWindow:
         controles_frame.pack(fill=tk.X, padx=10, pady=10)
 
         ttk.Button(controles_frame, text="Nuevo Evento", command=self.nuevo_evento).pack(side=tk.LEFT, padx=5)
-        ttk.Button(controles_frame, text="Actualizar", command=self.cargar_eventos).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles_frame, text="Actualizar", command=self.refrescar_eventos).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles_frame, text="Exportar", command=lambda: self.exportar_listado("eventos")).pack(side=tk.LEFT, padx=5)
+        self.busqueda_eventos = self.crear_busqueda(controles_frame, "eventos")
 
         self.crear_treeview_eventos(eventos_frame)
 
     def crear_treeview_eventos(self, parent):
-        tree_frame = ttk.Frame(parent)
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-
         columns = ('ID', 'Nombre','Descripción', 'Fecha Inicio','Fecha Final', 'Ubicación', 'Categoría', 'Inscritos/Capacidad', 'Estado')
-        self.eventos_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
-
-        for col in columns:
-            self.eventos_tree.heading(col, text=col) #
-            self.eventos_tree.column(col, anchor=tk.CENTER)
+        self.eventos_lista = ListaVirtual(parent, columns)
+        self.eventos_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        # Las páginas siguientes se cargan al acercarse al final de la lista
+        self.eventos_paginado = CargadorPaginado(
+            self.eventos_lista,
+            obtener_pagina=Evento.obtener_pagina,
+            clave=Evento.clave_orden,
+            identificador=lambda evento: evento.id_evento,
+            fila=self.fila_evento,
+            al_cargar=self.al_cargar_eventos,
+            cargador=self.cargador,
+            canal="eventos",
+            obtener_cambios=Evento.obtener_cambios,
+            descendente=True,
+            al_refrescar=lambda cambiados, eliminados: self.al_refrescar("eventos", cambiados, eliminados)
+        )
 
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.eventos_tree.yview)
-        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.eventos_tree.xview)
-        self.eventos_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+    def crear_busqueda(self, parent, tabla):
+        busqueda = tk.StringVar()
+        ttk.Entry(parent, textvariable=busqueda, width=30).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(parent, text="Buscar:").pack(side=tk.RIGHT)
+        busqueda.trace_add("write", lambda *args: self.programar_busqueda(tabla))
+        return busqueda
+
+    def programar_busqueda(self, tabla):
+        """Reinicia la espera con cada tecla: solo se consulta al dejar de escribir"""
+        pendiente = self._busquedas_pendientes.pop(tabla, None)
+        if pendiente:
+            self.root.after_cancel(pendiente)
+        self._busquedas_pendientes[tabla] = self.root.after(
+            self.RETARDO_BUSQUEDA_MS, lambda: self.aplicar_busqueda(tabla))
+
+    def aplicar_busqueda(self, tabla):
+        self._busquedas_pendientes.pop(tabla, None)
+        if tabla == "eventos":
+            texto, paginado, modelo = self.busqueda_eventos.get(), self.eventos_paginado, Evento
+        else:
+            texto, paginado, modelo = self.busqueda_participantes.get(), self.participantes_paginado, Participante
+        texto = texto.strip()
+
+        if not texto:
+            # Sin texto se vuelve al listado completo, con refresco incremental
+            paginado.cambiar_consulta(modelo.obtener_pagina, modelo.clave_orden,
+                                      modelo.obtener_cambios, descendente=(tabla == "eventos"))
+            return
+        if expresion_busqueda(texto) is None:
+            self.actualizar_status(f"Escriba al menos {LARGO_MINIMO_TERMINO} letras para buscar")
+            return
 
-        self.eventos_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.actualizar_status(f"Buscando '{texto}' en {tabla}...")
+        paginado.cambiar_consulta(lambda limite, despues: modelo.buscar(texto, limite, despues),
+                                  modelo.clave_busqueda, descendente=True)
+
+    def fila_evento(self, evento):
+        return (
+            evento.id_evento,
+            evento.nombre,
+            evento.descripcion,
+            formato.formatear_fecha(evento.fecha_inicio, formato.FECHA_HORA),
+            formato.formatear_fecha(evento.fecha_fin, formato.FECHA_HORA),
+            evento.ubicacion,
+            evento.categoria,
+            f"{evento.inscritos}/{evento.capacidad_maxima}",
+            evento.estado
+        )
 
     def cargar_eventos(self):
-        for item in self.eventos_tree.get_children():
-            self.eventos_tree.delete(item)
-
-        self.eventos_list = Evento.obtener_todos()
-
-        for evento in self.eventos_list:
-            self.eventos_tree.insert('', 'end', values=(
-                evento.id_evento,
-                evento.nombre,
-                evento.descripcion,
-                evento.fecha_inicio.strftime("%d/%m/%Y %I:%M %p"),
-                evento.fecha_fin.strftime("%d/%m/%Y %I:%M %p"),
-                evento.ubicacion,
-                evento.categoria,
-                f"{evento.inscritos}/{evento.capacidad_maxima}",
-                evento.estado
-            ))
-
-        self.actualizar_status(f"Cargados {len(self.eventos_list)} eventos")
+        self.actualizar_status("Cargando eventos...")
+        self.eventos_paginado.reiniciar()
+
+    def refrescar_eventos(self):
+        """Trae solo los eventos modificados desde la última carga"""
+        self.eventos_paginado.refrescar()
+        self.actualizar_estadisticas()
+
+    def al_cargar_eventos(self, total, hay_mas):
+        self.eventos_list = self.eventos_paginado.objetos
+        mas = " (desplácese para ver más)" if hay_mas else ""
+        self.actualizar_status(f"Cargados {total} eventos{mas}")
 
     def nuevo_evento(self):
-        EventoForm(master=self.root, callback=self.cargar_eventos)
+        # tkcalendar (y babel) solo se cargan cuando se abre el formulario
+        from gui.evento_form import EventoForm
+        EventoForm(master=self.root, callback=self.refrescar_eventos)
 
     def crear_pestaña_participantes(self):
         participantes_frame = ttk.Frame(self.notebook)
@@ -190,51 +284,83 @@ class MainWindow:
         controles_frame.pack(fill=tk.X, padx=10, pady=10)
 
         ttk.Button(controles_frame, text="Nuevo Participante", command=self.nuevo_participante).pack(side=tk.LEFT, padx=5)
-        ttk.Button(controles_frame, text="Actualizar", command=self.cargar_participantes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles_frame, text="Actualizar", command=self.refrescar_participantes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles_frame, text="Importar CSV", command=self.importar_participantes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles_frame, text="Exportar", command=lambda: self.exportar_listado("participantes")).pack(side=tk.LEFT, padx=5)
+        self.busqueda_participantes = self.crear_busqueda(controles_frame, "participantes")
 
         self.crear_treeview_participantes(participantes_frame)
 
     def crear_treeview_participantes(self, parent):
-        tree_frame = ttk.Frame(parent)
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-
         columns = ('ID', 'Nombre', 'Apellido', 'Email', 'Teléfono', 'Fecha Registro', 'Total Eventos')
-        self.participantes_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=15)
-
-        for col in columns:
-            self.participantes_tree.heading(col, text=col)
-            self.participantes_tree.column(col, anchor=tk.CENTER)
-
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.participantes_tree.yview)
-        h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.participantes_tree.xview)
-        self.participantes_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.participantes_lista = ListaVirtual(parent, columns)
+        self.participantes_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.participantes_paginado = CargadorPaginado(
+            self.participantes_lista,
+            obtener_pagina=Participante.obtener_pagina,
+            clave=Participante.clave_orden,
+            identificador=lambda participante: participante.id_participante,
+            fila=self.fila_participante,
+            al_cargar=self.al_cargar_participantes,
+            cargador=self.cargador,
+            canal="participantes",
+            obtener_cambios=Participante.obtener_cambios,
+            al_refrescar=lambda cambiados, eliminados: self.al_refrescar("participantes", cambiados, eliminados)
+        )
 
-        self.participantes_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+    def fila_participante(self, participante):
+        return (
+            participante.id_participante,
+            participante.nombre,
+            participante.apellido,
+            participante.email,
+            participante.telefono,
+            formato.formatear_fecha(participante.fecha_registro),
+            participante.total_eventos
+        )
 
     def cargar_participantes(self):
-        for item in self.participantes_tree.get_children():
-            self.participantes_tree.delete(item)
-
-        self.participantes_list = Participante.obtener_todos()
+        self.actualizar_status("Cargando participantes...")
+        self.participantes_paginado.reiniciar()
 
-        for participante in self.participantes_list:
-            self.participantes_tree.insert('', 'end', values=(
-                participante.id_participante,
-                participante.nombre,
-                participante.apellido,
-                participante.email,
-                participante.telefono,
-                participante.fecha_registro,
-                participante.total_eventos
-            ))
+    def refrescar_participantes(self):
+        """Trae solo los participantes modificados desde la última carga"""
+        self.participantes_paginado.refrescar()
+        self.actualizar_estadisticas()
 
+    def al_refrescar(self, tabla, cambiados, eliminados):
+        self.actualizar_status(f"{tabla.capitalize()}: {cambiados} actualizados, {eliminados} eliminados")
 
-        self.actualizar_status(f"Cargados {len(self.participantes_list)} participantes")
+    def al_cargar_participantes(self, total, hay_mas):
+        self.participantes_list = self.participantes_paginado.objetos
+        mas = " (desplácese para ver más)" if hay_mas else ""
+        self.actualizar_status(f"Cargados {total} participantes{mas}")
 
     def nuevo_participante(self):
-        ParticipanteForm(master=self.root, callback=self.cargar_participantes)
+        ParticipanteForm(master=self.root, callback=self.refrescar_participantes)
+
+    def importar_participantes(self):
+        ruta = filedialog.askopenfilename(
+            parent=self.root, title="Importar participantes",
+            filetypes=[("Archivos CSV", "*.csv"), ("Todos los archivos", "*.*")])
+        if not ruta:
+            return
+
+        self.actualizar_status("Importando participantes...")
+        self.cargador.enviar("importacion", importar_participantes, ruta,
+                             al_terminar=self.al_importar_participantes,
+                             al_fallar=lambda error: messagebox.showerror(
+                                 "Error", f"No se pudo importar el archivo:\n{error}"))
+
+    def al_importar_participantes(self, resumen):
+        mensaje = (f"Filas leídas: {resumen['leidas']}\n"
+                   f"Insertadas: {resumen['insertadas']}\n"
+                   f"Rechazadas: {resumen['rechazadas']}")
+        if resumen['rechazadas']:
+            mensaje += f"\n\nLos motivos de rechazo están en:\n{resumen['rechazos']}"
+        messagebox.showinfo("Importación de participantes", mensaje)
+        self.refrescar_participantes()
 
     def crear_pestaña_inscripciones(self):
         inscripciones_frame = ttk.Frame(self.notebook)
@@ -247,11 +373,18 @@ class MainWindow:
         ttk.Button(controles_frame, text="Ver Participantes del Evento", command=self.ver_participantes_evento).pack(side=tk.LEFT, padx=5)
         ttk.Button(controles_frame, text="Ver Eventos del Participante", command=self.ver_eventos_participante).pack(side=tk.LEFT, padx=5)
 
+    def crear_pestaña_reportes(self):
+        self.reportes = PestanaReportes(self.notebook, self.cargador, al_estado=self.actualizar_status)
+        self.notebook.add(self.reportes, text="Reportes")
+
     def crear_barra_estado(self, parent):
         # Barra de estado (izquierda)
         self.status_bar = ttk.Label(parent, text="Listo", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, pady=(10, 0))
 
+        # Indicador de cargas en curso
+        self.progreso = ttk.Progressbar(parent, mode="indeterminate", length=120)
+
         # Frame para el combobox (derecha)
         tema_frame = ttk.Frame(parent)
         tema_frame.pack(side=tk.RIGHT, pady=(10, 0), padx=(0, 10))
@@ -288,57 +421,100 @@ class MainWindow:
         self.status_bar.config(text=f"{datetime.now().strftime('%H:%M:%S')} - {mensaje}")
         self.root.update_idletasks()
 
+    def mostrar_progreso(self, pendientes):
+        if pendientes:
+            if not self.progreso.winfo_manager():
+                self.progreso.pack(side=tk.LEFT, pady=(10, 0), padx=(10, 0), before=self.status_bar)
+                self.progreso.start(15)
+        elif self.progreso.winfo_manager():
+            self.progreso.stop()
+            self.progreso.pack_forget()
+
+    def cerrar(self):
+        self.root.after_cancel(self._timer_estadisticas)
+        self.root.after_cancel(self._timer_sincronizacion)
+        self.root.after_cancel(self._timer_poda)
+        self.cargador.cerrar()
+        for stats in cache.estadisticas():
+            logger.info(f"Caché {stats['nombre']}: {stats['hits']} hits, {stats['misses']} misses "
+                        f"(hit ratio {stats['hit_ratio']:.0%})")
+        fechas = formato.estadisticas_cache()
+        logger.info(f"Fechas formateadas: {fechas.hits} reutilizadas, {fechas.misses} calculadas")
+        self.root.destroy()
+
     def nueva_inscripcion(self):
-        NuevaInscripcionForm(master=self.root)
+        NuevaInscripcionForm(master=self.root, callback=self.refrescar_inscripciones, cargador=self.cargador)
+
+    def refrescar_inscripciones(self):
+        # Una inscripción cambia los contadores de su evento y su participante
+        self.eventos_paginado.refrescar()
+        self.participantes_paginado.refrescar()
+        self.actualizar_estadisticas()
 
     def ver_participantes_evento(self):
         # Obtener selección actual
-        selected = self.eventos_tree.focus()
-        if not selected:
+        evento_id = self.eventos_lista.seleccion()
+        if evento_id is None:
             messagebox.showwarning("Advertencia", "Debe seleccionar un evento.")
             return
 
-        evento_id = self.eventos_tree.item(selected)['values'][0]
-
         # Obtener participantes inscritos
-        from database.queries import InscripcionQueries
-        participantes = InscripcionQueries.obtener_participantes_evento(evento_id)
+        self.actualizar_status("Cargando participantes del evento...")
+        self.cargador.enviar("detalle", InscripcionQueries.obtener_participantes_evento, evento_id,
+                             al_terminar=lambda participantes: self.mostrar_participantes_evento(evento_id, participantes))
 
+    def mostrar_participantes_evento(self, evento_id, participantes):
+        self.actualizar_status("Participantes del evento cargados")
         if not participantes:
             messagebox.showinfo("Info", "No hay participantes inscritos en este evento.")
             return
 
-        # Construir mensaje
-        mensaje = "Participantes inscritos:\n\n"
-        for p in participantes:
-            mensaje += f"- {p['nombre']} {p['apellido']} ({p['email']}) - Estado: {p['estado']}\n"
-
-        messagebox.showinfo("Participantes del Evento", mensaje)
+        filas = formato.formatear_columnas(
+            ((p['nombre'], p['apellido'], p['email'], p['telefono'], p['fecha_inscripcion'], p['estado'])
+             for p in participantes), (4,))
+        VentanaListado(self.root, "Participantes del Evento",
+                       ('Nombre', 'Apellido', 'Email', 'Teléfono', 'Fecha Inscripción', 'Estado'), filas,
+                       al_exportar=lambda: self.exportar_listado("inscritos", evento_id))
 
 
     def ver_eventos_participante(self):
         # Obtener selección actual
-        selected = self.participantes_tree.focus()
-        if not selected:
+        participante_id = self.participantes_lista.seleccion()
+        if participante_id is None:
             messagebox.showwarning("Advertencia", "Debe seleccionar un participante.")
             return
 
-        participante_id = self.participantes_tree.item(selected)['values'][0]
-
         # Obtener eventos del participante
-        from database.queries import InscripcionQueries
-        eventos = InscripcionQueries.obtener_eventos_participante(participante_id)
+        self.actualizar_status("Cargando eventos del participante...")
+        self.cargador.enviar("detalle", InscripcionQueries.obtener_eventos_participante, participante_id,
+                             al_terminar=lambda eventos: self.mostrar_eventos_participante(participante_id, eventos))
 
+    def mostrar_eventos_participante(self, participante_id, eventos):
+        self.actualizar_status("Eventos del participante cargados")
         if not eventos:
             messagebox.showinfo("Info", "El participante no está inscrito en ningún evento.")
             return
 
-        # Construir mensaje
-        mensaje = "Eventos en los que participa:\n\n"
-        for e in eventos:
-            mensaje += f"- {e['nombre']} ({e['fecha_inicio'].strftime('%d/%m/%Y %H:%M')}) - Estado: {e['estado']}\n"
+        filas = formato.formatear_columnas(
+            ((e['nombre'], e['fecha_inicio'], e['ubicacion'], e['categoria'], e['estado']) for e in eventos), (1,))
+        VentanaListado(self.root, "Eventos del Participante",
+                       ('Evento', 'Fecha Inicio', 'Ubicación', 'Categoría', 'Estado'), filas,
+                       al_exportar=lambda: self.exportar_listado("eventos_participante", participante_id))
+
+    def exportar_listado(self, tipo, id_registro=None):
+        """Pide un archivo y exporta el listado en segundo plano"""
+        nombre = tipo if id_registro is None else f"{tipo}_{id_registro}"
+        ruta = filedialog.asksaveasfilename(
+            parent=self.root, title="Exportar", initialfile=f"{nombre}.csv", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("NDJSON", "*.ndjson"), ("Todos los archivos", "*.*")])
+        if not ruta:
+            return
 
-        messagebox.showinfo("Eventos del Participante", mensaje)
+        self.actualizar_status(f"Exportando {tipo}...")
+        self.cargador.enviar(f"exportacion:{nombre}", exportar, tipo, ruta, None, id_registro,
+                             al_terminar=lambda total: self.actualizar_status(f"{total} filas exportadas a {ruta}"),
+                             al_fallar=lambda error: messagebox.showerror(
+                                 "Error", f"No se pudo exportar:\n{error}"))
 
     def cambiar_tema(self, event):
         tema_seleccionado = self.tema_actual.get()
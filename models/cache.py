@@ -0,0 +1,147 @@
+"""
+Caché en memoria de lectura directa (read-through) para los modelos
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from database.notificaciones import suscribir
+
+logger = logging.getLogger(__name__)
+
+
+class CacheLRU:
+    """
+    Caché con tiempo de vida (TTL) y tamaño acotado con desalojo LRU.
+
+    obtener(clave, cargar) retorna el valor guardado si sigue vigente y, si
+    no, llama a cargar() y guarda su resultado. Los valores None no se
+    guardan, para que un registro inexistente o un error de consulta se
+    vuelva a intentar. Es segura entre hilos porque el cargador en segundo
+    plano consulta los modelos desde su propio pool de hilos.
+    """
+
+    def __init__(self, nombre, capacidad=1000, ttl=60):
+        self.nombre = nombre
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        # Cambia con cada invalidación: un valor consultado antes de una
+        # escritura no se guarda después de ella
+        self._generacion = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+        self.desalojos = 0
+
+    def obtener(self, clave, cargar):
+        """Valor vigente de clave, o el resultado de cargar() si no lo hay"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                valor, vence = entrada
+                if vence > ahora:
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+                self.expirados += 1
+            self.misses += 1
+            generacion = self._generacion
+
+        # La consulta se hace fuera del lock para no bloquear otras claves
+        valor = cargar()
+        if valor is not None:
+            self.guardar(clave, valor, generacion)
+        return valor
+
+    def guardar(self, clave, valor, generacion=None):
+        """
+        Guarda valor en clave. Con la generación leída antes de consultarlo,
+        no se guarda si desde entonces hubo una invalidación
+        """
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return
+            self._datos[clave] = (valor, time.monotonic() + self.ttl)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave=None):
+        """Descarta una clave, o toda la caché si no se indica ninguna"""
+        with self._lock:
+            self._generacion += 1
+            if clave is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(clave, None)
+
+    def __len__(self):
+        return len(self._datos)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'nombre': self.nombre,
+                'entradas': len(self._datos),
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirados': self.expirados,
+                'desalojos': self.desalojos,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+
+# Filas por id (diccionarios tal como los retornan las consultas): cada
+# lectura crea su propio objeto, así un formulario que modifica el modelo
+# no altera lo que ven los demás
+eventos = CacheLRU("eventos", capacidad=2000, ttl=60)
+participantes = CacheLRU("participantes", capacidad=5000, ttl=60)
+# Listados completos usados por los combos de inscripción
+listados = CacheLRU("listados", capacidad=8, ttl=60)
+
+
+def estadisticas():
+    """Hits, misses y hit ratio de cada caché"""
+    return [cache.stats() for cache in (eventos, participantes, listados)]
+
+
+def invalidar_todo():
+    for cache in (eventos, participantes, listados):
+        cache.invalidar()
+
+
+@suscribir
+def _invalidar_por_escritura(tabla, accion, datos):
+    """Descarta lo que una escritura confirmada dejó desactualizado"""
+    id_evento = datos.get('id_evento')
+    id_participante = datos.get('id_participante')
+
+    if tabla == 'eventos':
+        eventos.invalidar(id_evento)
+        listados.invalidar('eventos')
+        if accion == 'eliminar':
+            # Cambia total_inscripciones de todos sus participantes
+            participantes.invalidar()
+            listados.invalidar('participantes')
+    elif tabla == 'participantes':
+        participantes.invalidar(id_participante)
+        listados.invalidar('participantes')
+        if accion == 'eliminar':
+            # Libera cupos en todos los eventos en que estaba inscrito
+            eventos.invalidar()
+            listados.invalidar('eventos')
+    elif tabla == 'inscripciones':
+        # Las inscripciones solo cambian los contadores de ambos extremos
+        eventos.invalidar(id_evento)
+        participantes.invalidar(id_participante)
+        listados.invalidar('eventos')
+        listados.invalidar('participantes')
+    else:
+        invalidar_todo()
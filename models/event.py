@@ -1,12 +1,23 @@
 """
 Modelo para la entidad Evento
 """
-from datetime import datetime
 from database.queries import EventoQueries
+from models import cache
+from utils.formato import formatear_fecha
+
+# Filas del último listado completo que se leyó del servidor: sin conexión
+# los formularios lo usan en lugar de esperar a que venza cada consulta
+_ultimo_listado = []
 
 class Evento:
     """Clase modelo para representar un evento"""
-    
+
+    # Sin __dict__ por instancia: los listados pueden mantener decenas de
+    # miles de eventos en memoria
+    __slots__ = ('id_evento', 'nombre', 'descripcion', 'fecha_inicio', 'fecha_fin',
+                 'ubicacion', 'capacidad_maxima', 'categoria', 'estado',
+                 'fecha_creacion', 'inscritos', 'relevancia')
+
     def __init__(self, id_evento=None, nombre="", descripcion="", fecha_inicio=None, 
                  fecha_fin=None, ubicacion="", capacidad_maxima=50, categoria="General", 
                  estado="activo", fecha_creacion=None, inscritos=0):
@@ -21,7 +32,9 @@ class Evento:
         self.estado = estado
         self.fecha_creacion = fecha_creacion
         self.inscritos = inscritos
-    
+        # Solo en resultados de buscar()
+        self.relevancia = None
+
     @classmethod
     def from_dict(cls, data):
         """Crea una instancia de Evento desde un diccionario"""
@@ -39,6 +52,17 @@ class Evento:
             inscritos=data.get('inscritos', 0)
         )
     
+    @classmethod
+    def from_row(cls, fila):
+        """
+        Crea un Evento desde una fila en tupla con las columnas de
+        EventoQueries.COLUMNAS_LISTADO, sin pasar por un diccionario
+        """
+        (id_evento, nombre, descripcion, fecha_inicio, fecha_fin, ubicacion,
+         capacidad_maxima, categoria, estado, inscritos) = fila[:10]
+        return cls(id_evento, nombre, descripcion, fecha_inicio, fecha_fin, ubicacion,
+                   capacidad_maxima, categoria, estado, None, inscritos)
+
     def to_dict(self):
         """Convierte la instancia a diccionario"""
         return {
@@ -85,27 +109,62 @@ class Evento:
     
     @staticmethod
     def obtener_todos():
-        """Obtiene todos los eventos como objetos Evento"""
-        datos = EventoQueries.obtener_todos()
+        """Obtiene todos los eventos como objetos Evento (el listado se guarda en caché)"""
+        global _ultimo_listado
+        datos = cache.listados.obtener('eventos', lambda: EventoQueries.obtener_todos(dictionary=False))
         if datos:
-            return [Evento.from_dict(evento) for evento in datos]
+            _ultimo_listado = datos
+            return [Evento.from_row(evento) for evento in datos]
         return []
+
+    @staticmethod
+    def ultimo_listado():
+        """Eventos del último listado completo que se pudo leer, sin consultar la base"""
+        return [Evento.from_row(evento) for evento in _ultimo_listado]
     
+    @staticmethod
+    def obtener_pagina(limite=200, despues=None):
+        """Obtiene una página de eventos a partir de la clave de orden de la última fila cargada"""
+        datos = EventoQueries.obtener_pagina(limite, despues, dictionary=False)
+        if datos:
+            return [Evento.from_row(evento) for evento in datos]
+        return []
+
+    @staticmethod
+    def obtener_cambios(desde=None):
+        """Filas modificadas (como objetos) e ids eliminados desde una marca de tiempo del servidor"""
+        cambios = EventoQueries.obtener_cambios(desde, dictionary=False)
+        if cambios:
+            cambios['filas'] = [Evento.from_row(evento) for evento in cambios['filas']]
+        return cambios
+
+    def clave_orden(self):
+        """Clave de paginación (fecha_inicio, id_evento) del listado de eventos"""
+        return (self.fecha_inicio, self.id_evento)
+
     @staticmethod
     def obtener_por_id(id_evento):
         """Obtiene un evento por su ID"""
-        datos = EventoQueries.obtener_por_id(id_evento)
+        datos = cache.eventos.obtener(id_evento, lambda: EventoQueries.obtener_por_id(id_evento))
         if datos:
             return Evento.from_dict(datos)
         return None
     
     @staticmethod
-    def buscar(criterio):
-        """Busca eventos por criterio"""
-        datos = EventoQueries.buscar(criterio)
-        if datos:
-            return [Evento.from_dict(evento) for evento in datos]
-        return []
+    def buscar(criterio, limite=50, despues=None):
+        """Busca eventos por texto (FULLTEXT), de mayor a menor relevancia"""
+        datos = EventoQueries.buscar(criterio, limite, despues, dictionary=False)
+        resultados = []
+        for fila in datos or []:
+            evento = Evento.from_row(fila)
+            # La relevancia viene después de las columnas del listado
+            evento.relevancia = fila[10]
+            resultados.append(evento)
+        return resultados
+
+    def clave_busqueda(self):
+        """Clave de paginación (relevancia, id_evento) de los resultados de buscar()"""
+        return (self.relevancia, self.id_evento)
     
     @staticmethod
     def obtener_proximos():
@@ -156,30 +215,11 @@ class Evento:
     
     def fecha_inicio_str(self):
         """Retorna la fecha de inicio como string formateado"""
-        if self.fecha_inicio:
-            if isinstance(self.fecha_inicio, str):
-                # Si viene como string desde la BD, parsearlo
-                try:
-                    fecha = datetime.strptime(self.fecha_inicio, "%Y-%m-%d %H:%M:%S")
-                    return fecha.strftime("%d/%m/%Y %H:%M")
-                except:
-                    return self.fecha_inicio
-            else:
-                return self.fecha_inicio.strftime("%d/%m/%Y %H:%M")
-        return ""
+        return formatear_fecha(self.fecha_inicio)
     
     def fecha_fin_str(self):
         """Retorna la fecha de fin como string formateado"""
-        if self.fecha_fin:
-            if isinstance(self.fecha_fin, str):
-                try:
-                    fecha = datetime.strptime(self.fecha_fin, "%Y-%m-%d %H:%M:%S")
-                    return fecha.strftime("%d/%m/%Y %H:%M")
-                except:
-                    return self.fecha_fin
-            else:
-                return self.fecha_fin.strftime("%d/%m/%Y %H:%M")
-        return ""
+        return formatear_fecha(self.fecha_fin)
     
     def __str__(self):
         """Representación string del evento"""
@@ -2,13 +2,28 @@
 Modelo para la entidad Participante
 """
 import re
+import threading
 from datetime import datetime
+from database.diario import diario, PARTICIPANTE
+from database.notificaciones import suscribir
 from database.queries import ParticipanteQueries
+from models import cache
+from utils.indice_prefijos import IndicePrefijos
 from utils.validations import Validaciones
 
+# Índice de prefijos compartido por los formularios; se construye al primer
+# uso y luego se mantiene con cada escritura de participantes
+_indice = None
+_indice_lock = threading.Lock()
+
 class Participante:
     """Clase modelo para representar un participante"""
 
+    # Sin __dict__ por instancia: la tabla completa de participantes se
+    # mantiene en memoria para los listados y el índice de búsqueda
+    __slots__ = ('id_participante', 'nombre', 'apellido', 'email', 'telefono',
+                 'fecha_registro', 'total_eventos', 'relevancia')
+
     def __init__(self, id_participante=None, nombre="", apellido="", email="",
                  telefono="", fecha_registro=None, total_eventos=0):
         self.id_participante = id_participante
@@ -18,6 +33,8 @@ class Participante:
         self.telefono = telefono
         self.fecha_registro = fecha_registro
         self.total_eventos = total_eventos
+        # Solo en resultados de buscar()
+        self.relevancia = None
 
     @classmethod
     def from_dict(cls, data):
@@ -32,6 +49,14 @@ class Participante:
             total_eventos=data.get('total_eventos', 0)
         )
 
+    @classmethod
+    def from_row(cls, fila):
+        """
+        Crea un Participante desde una fila en tupla con las columnas de
+        ParticipanteQueries.COLUMNAS_LISTADO, sin pasar por un diccionario
+        """
+        return cls(*fila[:7])
+
     def to_dict(self):
         """Convierte la instancia a diccionario"""
         return {
@@ -73,50 +98,103 @@ class Participante:
 
     @staticmethod
     def obtener_todos():
-        """Obtiene todos los participantes como objetos Participante"""
-        datos = ParticipanteQueries.obtener_todos()
+        """Obtiene todos los participantes como objetos Participante (el listado se guarda en caché)"""
+        datos = cache.listados.obtener('participantes', lambda: ParticipanteQueries.obtener_todos(dictionary=False))
         if datos:
-            return [Participante.from_dict(participante) for participante in datos]
+            return [Participante.from_row(participante) for participante in datos]
         return []
 
+    @staticmethod
+    def obtener_pagina(limite=200, despues=None):
+        """Obtiene una página de participantes a partir de la clave de orden de la última fila cargada"""
+        datos = ParticipanteQueries.obtener_pagina(limite, despues, dictionary=False)
+        if datos:
+            return [Participante.from_row(participante) for participante in datos]
+        return []
+
+    @staticmethod
+    def obtener_cambios(desde=None):
+        """Filas modificadas (como objetos) e ids eliminados desde una marca de tiempo del servidor"""
+        cambios = ParticipanteQueries.obtener_cambios(desde, dictionary=False)
+        if cambios:
+            cambios['filas'] = [Participante.from_row(participante) for participante in cambios['filas']]
+        return cambios
+
+    def clave_orden(self):
+        """Clave de paginación (apellido, nombre, id_participante) del listado de participantes"""
+        return (self.apellido, self.nombre, self.id_participante)
+
     @staticmethod
     def obtener_por_id(id_participante):
         """Obtiene un participante por su ID"""
-        datos = ParticipanteQueries.obtener_por_id(id_participante)
+        datos = cache.participantes.obtener(id_participante, lambda: ParticipanteQueries.obtener_por_id(id_participante))
         if datos:
             return Participante.from_dict(datos)
         return None
 
     @staticmethod
-    def buscar(criterio):
-        """Busca participantes por criterio"""
-        datos = ParticipanteQueries.buscar(criterio)
-        if datos:
-            return [Participante.from_dict(participante) for participante in datos]
-        return []
-
-    def validar(self):
-        """Valida los datos del participante"""
-        errores = []
-
-        # Validar nombre
-        valido, mensaje = Validaciones.validar_nombre(self.nombre, "nombre")
-        if not valido:
-            errores.append(mensaje)
+    def buscar(criterio, limite=50, despues=None):
+        """Busca participantes por texto (FULLTEXT), de mayor a menor relevancia"""
+        datos = ParticipanteQueries.buscar(criterio, limite, despues, dictionary=False)
+        resultados = []
+        for fila in datos or []:
+            participante = Participante.from_row(fila)
+            # La relevancia viene después de las columnas del listado
+            participante.relevancia = fila[7]
+            resultados.append(participante)
+        return resultados
+
+    def clave_busqueda(self):
+        """Clave de paginación (relevancia, id_participante) de los resultados de buscar()"""
+        return (self.relevancia, self.id_participante)
 
-        # Validar apellido
-        valido, mensaje = Validaciones.validar_nombre(self.apellido, "apellido")
-        if not valido:
-            errores.append(mensaje)
-
-        # Validar email
-        valido, mensaje = Validaciones.validar_email(self.email)
-        if not valido:
-            errores.append(mensaje)
+    @staticmethod
+    def _etiqueta(id_participante, nombre, apellido, email):
+        """Texto con que se muestra un participante en los selectores"""
+        return f"{nombre} {apellido} <{email}> (ID: {id_participante})"
 
-        # Validar teléfono
-        valido, mensaje = Validaciones.validar_telefono(self.telefono)
-        if not valido:
-            errores.append(mensaje)
+    @staticmethod
+    def indice_busqueda():
+        """
+        Índice por prefijo (sin acentos ni mayúsculas) sobre nombre, apellido
+        y email de todos los participantes, para selectores con búsqueda
+        mientras se escribe. Incluye con su id provisional a los creados sin
+        conexión que aún no se sincronizaron.
+        """
+        global _indice
+        with _indice_lock:
+            if _indice is None:
+                registros = [(p.id_participante, p.nombre, p.apellido, p.email)
+                             for p in Participante.obtener_todos()]
+                registros.extend((operacion['id_provisional'], operacion['datos']['nombre'],
+                                  operacion['datos']['apellido'], operacion['datos']['email'])
+                                 for operacion in diario.pendientes() if operacion['tipo'] == PARTICIPANTE)
+                indice = IndicePrefijos()
+                indice.construir((id_participante, Participante._etiqueta(id_participante, *campos), campos)
+                                 for id_participante, *campos in registros)
+                _indice = indice
+            return _indice
 
-        return errores
+    def validar(self):
+        """Valida los datos del participante"""
+        datos = {'nombre': self.nombre, 'apellido': self.apellido,
+                 'email': self.email, 'telefono': self.telefono}
+        return list(Validaciones.validar_participante(datos).values())
+
+
+@suscribir
+def _actualizar_indice(tabla, accion, datos):
+    """Aplica al índice de búsqueda cada alta, cambio o baja de participante"""
+    global _indice
+    if tabla != 'participantes' or _indice is None:
+        return
+    id_participante = datos.get('id_participante')
+    if id_participante is None:
+        # Escritura masiva (importación): se reconstruye en el próximo uso
+        with _indice_lock:
+            _indice = None
+    elif accion == 'eliminar':
+        _indice.eliminar(id_participante)
+    else:
+        campos = (datos['nombre'], datos['apellido'], datos['email'])
+        _indice.agregar(id_participante, Participante._etiqueta(id_participante, *campos), campos)
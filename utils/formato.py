@@ -0,0 +1,57 @@
+"""
+Conversión de columnas de fecha a texto para mostrar en listas y tablas
+"""
+from datetime import datetime
+from functools import lru_cache
+
+FECHA_HORA = "%d/%m/%Y %I:%M %p"
+FECHA_HORA_24 = "%d/%m/%Y %H:%M"
+FECHA = "%d/%m/%Y"
+
+# Formato en que llegan las fechas cuando la BD las entrega como texto
+FORMATO_BD = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=4096)
+def _formatear(valor, formato):
+    if isinstance(valor, str):
+        try:
+            valor = datetime.strptime(valor, FORMATO_BD)
+        except ValueError:
+            return valor
+    return valor.strftime(formato)
+
+
+def formatear_fecha(valor, formato=FECHA_HORA_24):
+    """
+    Texto de una fecha (datetime, date o texto de la BD) en el formato dado.
+    Memoriza los resultados: muchos eventos comparten fecha y hora, y las
+    mismas filas se vuelven a formatear en cada refresco.
+    """
+    if not valor:
+        return ""
+    return _formatear(valor, formato)
+
+
+def formatear_columnas(filas, columnas, formato=FECHA_HORA_24):
+    """
+    Retorna las filas (tuplas) con las posiciones de columnas convertidas a
+    texto en una sola pasada; cada valor distinto se formatea una vez.
+    """
+    vistos = {}
+    resultado = []
+    for fila in filas:
+        fila = list(fila)
+        for i in columnas:
+            valor = fila[i]
+            texto = vistos.get(valor)
+            if texto is None:
+                texto = vistos[valor] = formatear_fecha(valor, formato)
+            fila[i] = texto
+        resultado.append(tuple(fila))
+    return resultado
+
+
+def estadisticas_cache():
+    """Aciertos y fallos de la memoria de fechas ya formateadas"""
+    return _formatear.cache_info()
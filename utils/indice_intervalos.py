@@ -0,0 +1,108 @@
+"""
+Índice de intervalos de tiempo para detectar cruces de horario
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+
+
+class _Nodo:
+    """Nodo de un árbol de intervalos centrado"""
+
+    __slots__ = ('centro', 'por_inicio', 'por_fin', 'izquierdo', 'derecho')
+
+    def __init__(self, centro, intervalos, izquierdo, derecho):
+        self.centro = centro
+        # Los intervalos que contienen al centro, ordenados dos veces
+        self.por_inicio = sorted(intervalos, key=lambda i: i[0])
+        self.por_fin = sorted(intervalos, key=lambda i: i[1], reverse=True)
+        self.izquierdo = izquierdo
+        self.derecho = derecho
+
+
+def _construir_arbol(intervalos):
+    if not intervalos:
+        return None
+    # Con la mediana inferior de los extremos ningún lado se queda con todos
+    # los intervalos, así que la recursión siempre avanza
+    extremos = sorted(extremo for inicio, fin, _ in intervalos for extremo in (inicio, fin))
+    centro = extremos[(len(extremos) - 1) // 2]
+    izquierda, aqui, derecha = [], [], []
+    for intervalo in intervalos:
+        if intervalo[1] <= centro:
+            izquierda.append(intervalo)
+        elif intervalo[0] > centro:
+            derecha.append(intervalo)
+        else:
+            aqui.append(intervalo)
+    return _Nodo(centro, aqui, _construir_arbol(izquierda), _construir_arbol(derecha))
+
+
+class IndiceIntervalos:
+    """
+    Intervalos semiabiertos [inicio, fin) con el id de su registro.
+
+    Un intervalo se cruza con [a, b) si contiene a a (inicio <= a < fin) o
+    si empieza dentro de (a, b). Lo primero se responde con un árbol de
+    intervalos centrado y lo segundo con búsqueda binaria sobre los inicios
+    ordenados, así que una consulta cuesta O(log n + k) para k resultados.
+    Los intervalos vacíos (fin <= inicio o sin fin) no se cruzan con nada.
+    El índice es inmutable: un cambio se aplica construyendo uno nuevo.
+    """
+
+    def __init__(self, intervalos=()):
+        intervalos = [(inicio, fin, id_registro) for id_registro, inicio, fin in intervalos
+                      if inicio is not None and fin is not None and fin > inicio]
+        intervalos.sort(key=lambda i: i[0])
+        self._inicios = [inicio for inicio, _, _ in intervalos]
+        self._ordenados = intervalos
+        self._raiz = _construir_arbol(intervalos)
+
+    def __len__(self):
+        return len(self._ordenados)
+
+    def _que_contienen(self, punto, resultados):
+        nodo = self._raiz
+        while nodo is not None:
+            if punto < nodo.centro:
+                # Todos los del nodo terminan después del centro
+                for inicio, _, id_registro in nodo.por_inicio:
+                    if inicio > punto:
+                        break
+                    resultados.append(id_registro)
+                nodo = nodo.izquierdo
+            else:
+                # Todos los del nodo empiezan antes del centro
+                for _, fin, id_registro in nodo.por_fin:
+                    if fin <= punto:
+                        break
+                    resultados.append(id_registro)
+                nodo = nodo.derecho
+
+    def solapados(self, inicio, fin, excluir=None):
+        """Ids de los intervalos que se cruzan con [inicio, fin), sin el id excluir"""
+        if inicio is None or fin is None or fin <= inicio:
+            return []
+        resultados = []
+        self._que_contienen(inicio, resultados)
+        for posicion in range(bisect_right(self._inicios, inicio), bisect_left(self._inicios, fin)):
+            resultados.append(self._ordenados[posicion][2])
+        if excluir is not None:
+            resultados = [id_registro for id_registro in resultados if id_registro != excluir]
+        return resultados
+
+
+def solapamientos(intervalos):
+    """
+    Genera los pares (id_a, id_b) que se cruzan entre intervalos
+    (id, inicio, fin) ya ordenados por inicio, con un barrido que mantiene
+    en un heap los que siguen abiertos: O(n log n + k)
+    """
+    abiertos = []
+    for id_registro, inicio, fin in intervalos:
+        if inicio is None or fin is None or fin <= inicio:
+            continue
+        while abiertos and abiertos[0][0] <= inicio:
+            heapq.heappop(abiertos)
+        for _, id_abierto in abiertos:
+            yield id_abierto, id_registro
+        heapq.heappush(abiertos, (fin, id_registro))
@@ -0,0 +1,127 @@
+"""
+Índice en memoria para buscar registros por prefijo sin distinguir
+mayúsculas ni acentos
+"""
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Pérez' -> 'perez'"""
+    if not texto:
+        return ""
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+class IndicePrefijos:
+    """
+    Arreglo ordenado de términos normalizados con el id de su registro.
+
+    Cada registro aporta las palabras de sus campos y cada campo completo
+    (para prefijos de email como 'ana.lo'). Buscar un prefijo es una
+    búsqueda binaria más un recorrido corto, y agregar o quitar un registro
+    solo inserta o borra sus términos. Es seguro entre hilos: se actualiza
+    desde las notificaciones de escritura y se consulta desde Tk.
+    """
+
+    def __init__(self):
+        self._terminos = []
+        self._ids = []
+        self._registros = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._registros)
+
+    @staticmethod
+    def _terminos_de(campos):
+        terminos = set()
+        for campo in campos:
+            campo = normalizar(campo).strip()
+            if campo:
+                terminos.add(campo)
+                terminos.update(t for t in re.split(r"[\W_]+", campo) if t)
+        return tuple(sorted(terminos))
+
+    def construir(self, registros):
+        """Reemplaza el contenido con registros (id, etiqueta, campos) ordenando una sola vez"""
+        entradas = []
+        datos = {}
+        for id_registro, etiqueta, campos in registros:
+            terminos = self._terminos_de(campos)
+            datos[id_registro] = (etiqueta, terminos)
+            entradas.extend((termino, id_registro) for termino in terminos)
+        entradas.sort()
+
+        with self._lock:
+            self._terminos = [termino for termino, _ in entradas]
+            self._ids = [id_registro for _, id_registro in entradas]
+            self._registros = datos
+
+    def agregar(self, id_registro, etiqueta, campos):
+        """Agrega un registro o reemplaza el que tenga el mismo id"""
+        terminos = self._terminos_de(campos)
+        with self._lock:
+            self._quitar(id_registro)
+            self._registros[id_registro] = (etiqueta, terminos)
+            for termino in terminos:
+                posicion = bisect_right(self._terminos, termino)
+                self._terminos.insert(posicion, termino)
+                self._ids.insert(posicion, id_registro)
+
+    def eliminar(self, id_registro):
+        with self._lock:
+            self._quitar(id_registro)
+
+    def _quitar(self, id_registro):
+        anterior = self._registros.pop(id_registro, None)
+        if anterior is None:
+            return
+        for termino in anterior[1]:
+            posicion = bisect_left(self._terminos, termino)
+            while posicion < len(self._terminos) and self._terminos[posicion] == termino:
+                if self._ids[posicion] == id_registro:
+                    del self._terminos[posicion]
+                    del self._ids[posicion]
+                    break
+                posicion += 1
+
+    def _rango(self, prefijo):
+        """Posiciones [inicio, fin) de los términos que empiezan con prefijo"""
+        return (bisect_left(self._terminos, prefijo),
+                bisect_left(self._terminos, prefijo + "\U0010ffff"))
+
+    def buscar(self, texto, limite=10):
+        """
+        Hasta limite registros (id, etiqueta) en los que cada palabra de
+        texto es prefijo de alguno de sus términos
+        """
+        palabras = normalizar(texto).split()
+        if not palabras:
+            return []
+
+        resultados = []
+        vistos = set()
+        with self._lock:
+            # Se recorre el rango de la palabra más selectiva (con menos
+            # términos que empiezan con ella) y se filtra por las demás
+            rangos = [(self._rango(p), p) for p in palabras]
+            (posicion, fin), guia = min(rangos, key=lambda r: r[0][1] - r[0][0])
+            otras = [p for p in palabras if p is not guia]
+            while posicion < fin:
+                id_registro = self._ids[posicion]
+                posicion += 1
+                if id_registro in vistos:
+                    continue
+                vistos.add(id_registro)
+                etiqueta, terminos = self._registros[id_registro]
+                if all(any(t.startswith(p) for t in terminos) for p in otras):
+                    resultados.append((id_registro, etiqueta))
+                    if len(resultados) >= limite:
+                        break
+        return resultados
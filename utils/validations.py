@@ -4,6 +4,16 @@ Utilidades para validaciones del sistema
 import re
 from datetime import datetime
 
+# Patrones compilados una sola vez al importar el módulo
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PATRON_EMAIL_SIMPLE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+PATRON_NOMBRE = re.compile(r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s\'\-\.]+$')
+PATRON_SEPARADORES_TELEFONO = re.compile(r'[\s\-\(\)\+]')
+PATRON_NO_TELEFONO = re.compile(r'[^\d\+]')
+PATRON_ESPACIOS = re.compile(r'\s+')
+# Quita los separadores comunes de un teléfono sin pasar por re
+SEPARADORES_TELEFONO = str.maketrans('', '', ' \t-()+')
+
 
 class Validaciones:
     """Clase con métodos estáticos para validaciones comunes"""
@@ -14,13 +24,11 @@ class Validaciones:
         Valida el formato de un email
         Returns: (bool, str) - (es_valido, mensaje_error)
         """
-        if not email or email.strip() == "":
+        email = email.strip() if email else ""
+        if not email:
             return False, "El email es obligatorio"
         
-        email = email.strip()
-        patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        if not re.match(patron, email):
+        if not PATRON_EMAIL.match(email):
             return False, "El formato del email no es válido"
         
         if len(email) > 100:
@@ -34,15 +42,12 @@ class Validaciones:
         Valida el formato de un teléfono
         Returns: (bool, str) - (es_valido, mensaje_error)
         """
+        telefono = telefono.strip() if telefono else ""
         if not telefono:
             return True, ""  # El teléfono es opcional
         
-        telefono = telefono.strip()
-        if telefono == "":
-            return True, ""
-        
         # Eliminar espacios, guiones, paréntesis para validar solo números
-        telefono_limpio = re.sub(r'[\s\-\(\)\+]', '', telefono)
+        telefono_limpio = PATRON_SEPARADORES_TELEFONO.sub('', telefono)
         
         if not telefono_limpio.isdigit():
             return False, "El teléfono solo puede contener números, espacios, guiones y paréntesis"
@@ -58,11 +63,10 @@ class Validaciones:
         Valida un nombre o apellido
         Returns: (bool, str) - (es_valido, mensaje_error)
         """
-        if not nombre or nombre.strip() == "":
+        nombre = nombre.strip() if nombre else ""
+        if not nombre:
             return False, f"El {campo} es obligatorio"
         
-        nombre = nombre.strip()
-        
         if len(nombre) < 2:
             return False, f"El {campo} debe tener al menos 2 caracteres"
         
@@ -70,8 +74,7 @@ class Validaciones:
             return False, f"El {campo} no puede exceder 100 caracteres"
         
         # Permitir solo letras, espacios, acentos y algunos caracteres especiales
-        patron = r'^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ\s\'\-\.]+$'
-        if not re.match(patron, nombre):
+        if not PATRON_NOMBRE.match(nombre):
             return False, f"El {campo} contiene caracteres no válidos"
         
         return True, ""
@@ -177,7 +180,7 @@ class Validaciones:
         texto = texto.strip()
         
         # Reemplazar múltiples espacios por uno solo
-        texto = re.sub(r'\s+', ' ', texto)
+        texto = PATRON_ESPACIOS.sub(' ', texto)
         
         return texto
     
@@ -188,7 +191,7 @@ class Validaciones:
             return ""
         
         # Eliminar todos los caracteres no numéricos excepto el +
-        telefono_limpio = re.sub(r'[^\d\+]', '', telefono)
+        telefono_limpio = PATRON_NO_TELEFONO.sub('', telefono)
         
         # Si tiene 8 dígitos, asumir que es local y agregar formato
         if len(telefono_limpio) == 8:
@@ -203,6 +206,55 @@ class Validaciones:
         if not email:
             return False
         
-        patron = r'^[^@]+@[^@]+\.[^@]+$'
-        return re.match(patron, email.strip()) is not None
-        
\ No newline at end of file
+        return PATRON_EMAIL_SIMPLE.match(email.strip()) is not None
+
+    @staticmethod
+    def validar_participante(datos):
+        """
+        Valida los campos de un participante (diccionario con nombre,
+        apellido, email y telefono)
+        Returns: dict - {campo: mensaje_error}, vacío si es válido
+        """
+        errores = {}
+        for campo in ('nombre', 'apellido'):
+            valido, mensaje = Validaciones.validar_nombre(datos.get(campo), campo)
+            if not valido:
+                errores[campo] = mensaje
+
+        valido, mensaje = Validaciones.validar_email(datos.get('email'))
+        if not valido:
+            errores['email'] = mensaje
+
+        valido, mensaje = Validaciones.validar_telefono(datos.get('telefono'))
+        if not valido:
+            errores['telefono'] = mensaje
+        return errores
+
+    @staticmethod
+    def validar_lote(registros):
+        """
+        Valida muchos participantes en una llamada
+        Returns: dict - {posición en registros: {campo: mensaje_error}},
+        solo con los registros inválidos
+        """
+        nombre_ok = PATRON_NOMBRE.match
+        email_ok = PATRON_EMAIL.match
+        errores = {}
+        for i, datos in enumerate(registros):
+            # Camino rápido: casi todos los registros son válidos, así que
+            # solo se arman los mensajes cuando alguna comprobación falla
+            nombre = (datos.get('nombre') or "").strip()
+            apellido = (datos.get('apellido') or "").strip()
+            email = (datos.get('email') or "").strip()
+            telefono = (datos.get('telefono') or "").strip()
+            if telefono:
+                telefono = telefono.translate(SEPARADORES_TELEFONO)
+            if (2 <= len(nombre) <= 100 and nombre_ok(nombre)
+                    and 2 <= len(apellido) <= 100 and nombre_ok(apellido)
+                    and len(email) <= 100 and email_ok(email)
+                    and (not telefono or (telefono.isdigit() and 8 <= len(telefono) <= 15))):
+                continue
+            errores_registro = Validaciones.validar_participante(datos)
+            if errores_registro:
+                errores[i] = errores_registro
+        return errores